@@ -0,0 +1,218 @@
+"""
+LLM Explained - Data generator benchmarks
+Sweeps the numeric helpers of utils/data_generators.py over realistic sizes
+(tokens 8 to 8192, d_model 4 to 4096, vocabularies of 10 to 100k words) and
+records time and peak memory.
+
+To run the suite and save the baseline:
+    python -m benchmarks.bench_data_generators --save
+
+To fail when a case is more than 25% slower than the baseline:
+    python -m benchmarks.bench_data_generators --compare --tolerance 0.25
+
+The largest dense attention cases need about 2 GB of memory; --max-tokens
+caps them. calculate_chunked_attention is swept up to 16k tokens with the
+same d_model as calculate_attention, so the two compare case by case.
+Weight quantization (utils/quantization.py) runs on d_model x d_model matrices.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from benchmarks.harness import BenchmarkCase, add_baseline_arguments, finish, run_cases
+from utils import data_generators as dg
+from utils import quantization
+
+SUITE = "data_generators"
+
+TOKEN_SIZES = [8, 64, 512, 2048, 8192]
+D_MODEL_SIZES = [4, 64, 512, 4096]
+VOCAB_SIZES = [10, 1000, 100_000]
+
+# Fixed size of the dimension that is not swept
+DEFAULT_TOKENS = 512
+DEFAULT_D_MODEL = 64
+
+# Multi-head attention: 8 query heads of 64 dimensions, sharing 8 (MHA), 2 (GQA) or 1 (MQA) K/V heads
+NUM_HEADS = 8
+HEAD_DIM = 64
+KV_HEAD_COUNTS = [8, 2, 1]
+MAX_MULTI_HEAD_TOKENS = 2048
+
+# Chunked attention also runs at lengths the dense path cannot hold in memory
+CHUNKED_TOKEN_SIZES = TOKEN_SIZES + [16384]
+CHUNK_BLOCK_SIZE = 256
+SLIDING_WINDOW = 512
+
+# Quantization schemes: (bits, symmetric, granularity), on square weight matrices
+QUANTIZATION_SCHEMES = [
+    (8, True, "tensor"),
+    (8, True, "channel"),
+    (8, False, "channel"),
+    (4, True, "group"),
+    (4, False, "group"),
+]
+QUANTIZATION_D_MODEL_SIZES = [512, 4096]
+
+
+def _words(count):
+    return [f"w{i}" for i in range(count)]
+
+
+def _qkv(tokens, d_model):
+    return lambda: dg.generate_qkv_matrices(hidden_dim=d_model, num_tokens=tokens)
+
+
+def _multi_head_qkv(tokens, kv_heads):
+    def setup():
+        rng = np.random.default_rng(42)
+        return (
+            rng.standard_normal((1, NUM_HEADS, tokens, HEAD_DIM)),
+            rng.standard_normal((1, kv_heads, tokens, HEAD_DIM)),
+            rng.standard_normal((1, kv_heads, tokens, HEAD_DIM)),
+            None,
+            True,
+        )
+    return setup
+
+
+def _weights(d_model):
+    return (np.random.default_rng(42).standard_normal((d_model, d_model)) * 0.02).astype(np.float32)
+
+
+def build_cases(max_tokens=None, max_d_model=None, max_vocab=None):
+    """
+    Builds the benchmark cases of the suite.
+
+    Args:
+        max_tokens: Largest token count (None keeps every size)
+        max_d_model: Largest model dimension
+        max_vocab: Largest vocabulary
+
+    Returns:
+        List of BenchmarkCase
+    """
+    tokens_sizes = [n for n in TOKEN_SIZES if max_tokens is None or n <= max_tokens]
+    d_model_sizes = [d for d in D_MODEL_SIZES if max_d_model is None or d <= max_d_model]
+    vocab_sizes = [v for v in VOCAB_SIZES if max_vocab is None or v <= max_vocab]
+
+    cases = []
+    for tokens in tokens_sizes:
+        cases.append(BenchmarkCase(
+            "calculate_attention", dg.calculate_attention, _qkv(tokens, DEFAULT_D_MODEL),
+            tokens=tokens, d_model=DEFAULT_D_MODEL,
+        ))
+    for d_model in d_model_sizes:
+        cases.append(BenchmarkCase(
+            "calculate_attention", dg.calculate_attention, _qkv(DEFAULT_TOKENS, d_model),
+            tokens=DEFAULT_TOKENS, d_model=d_model,
+        ))
+
+    for tokens in [n for n in CHUNKED_TOKEN_SIZES if max_tokens is None or n <= max_tokens]:
+        for variant, options in (
+            ("dense", {}),
+            ("causal", {"causal": True}),
+            ("window", {"window": SLIDING_WINDOW}),
+        ):
+            cases.append(BenchmarkCase(
+                "calculate_chunked_attention",
+                lambda Q, K, V, o=options: dg.calculate_chunked_attention(Q, K, V, CHUNK_BLOCK_SIZE, **o),
+                _qkv(tokens, DEFAULT_D_MODEL),
+                tokens=tokens, d_model=DEFAULT_D_MODEL, mask=variant,
+            ))
+
+    for tokens in [n for n in tokens_sizes if n <= MAX_MULTI_HEAD_TOKENS]:
+        for kv_heads in KV_HEAD_COUNTS:
+            cases.append(BenchmarkCase(
+                "calculate_multi_head_attention", dg.calculate_multi_head_attention,
+                _multi_head_qkv(tokens, kv_heads),
+                tokens=tokens, heads=NUM_HEADS, kv_heads=kv_heads,
+            ))
+
+    for tokens in tokens_sizes:
+        cases.append(BenchmarkCase(
+            "generate_qkv_matrices", dg.generate_qkv_matrices, lambda t=tokens: (DEFAULT_D_MODEL, t),
+            tokens=tokens, d_model=DEFAULT_D_MODEL,
+        ))
+        for d_model in d_model_sizes:
+            cases.append(BenchmarkCase(
+                "generate_positional_encoding", dg.generate_positional_encoding,
+                lambda t=tokens, d=d_model: (t, d),
+                tokens=tokens, d_model=d_model,
+            ))
+
+    for tokens in tokens_sizes:
+        for pattern in ("default", "causal", "diagonal"):
+            cases.append(BenchmarkCase(
+                "generate_attention_scores", dg.generate_attention_scores,
+                lambda t=tokens, p=pattern: (_words(t), _words(t), p),
+                tokens=tokens, pattern=pattern,
+            ))
+        for d_model in [d for d in (4, 512) if d in d_model_sizes]:
+            cases.append(BenchmarkCase(
+                "generate_rnn_hidden_states", dg.generate_rnn_hidden_states,
+                lambda t=tokens, d=d_model: (t, d),
+                tokens=tokens, d_model=d_model,
+            ))
+        cases.append(BenchmarkCase(
+            "generate_example_sentence_embedding", dg.generate_example_sentence_embedding,
+            lambda t=tokens: (" ".join(_words(t)), DEFAULT_D_MODEL),
+            tokens=tokens, d_model=DEFAULT_D_MODEL,
+        ))
+
+    for d_model in [d for d in QUANTIZATION_D_MODEL_SIZES if max_d_model is None or d <= max_d_model]:
+        for bits, symmetric, granularity in QUANTIZATION_SCHEMES:
+            params = {"bits": bits, "symmetric": symmetric, "granularity": granularity, "d_model": d_model}
+            cases += [
+                BenchmarkCase("quantize", quantization.quantize,
+                              lambda d=d_model, p=params: (_weights(d), p["bits"], p["symmetric"], p["granularity"]),
+                              **params),
+                BenchmarkCase("dequantize", quantization.QuantizedTensor.dequantize,
+                              lambda d=d_model, p=params: (
+                                  quantization.quantize(_weights(d), p["bits"], p["symmetric"], p["granularity"]),
+                              ),
+                              **params),
+            ]
+
+    for vocab in vocab_sizes:
+        cases += [
+            BenchmarkCase("generate_probability_distribution", dg.generate_probability_distribution,
+                          lambda v=vocab: (_words(v),), vocab=vocab),
+            BenchmarkCase("generate_temperature_distribution", dg.generate_temperature_distribution,
+                          lambda v=vocab: (_words(v), 0.7), vocab=vocab),
+            BenchmarkCase("generate_top_k_example", dg.generate_top_k_example,
+                          lambda v=vocab: (_words(v), 50), vocab=vocab),
+            BenchmarkCase("generate_top_p_example", dg.generate_top_p_example,
+                          lambda v=vocab: (_words(v), 0.9), vocab=vocab),
+            BenchmarkCase("generate_embedding_vectors", dg.generate_embedding_vectors,
+                          lambda v=vocab: (_words(v), DEFAULT_D_MODEL), vocab=vocab, d_model=DEFAULT_D_MODEL),
+        ]
+    return cases
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark utils/data_generators.py.")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Largest token count")
+    parser.add_argument("--max-d-model", type=int, default=None, help="Largest model dimension")
+    parser.add_argument("--max-vocab", type=int, default=None, help="Largest vocabulary")
+    parser.add_argument("-k", "--filter", default=None,
+                        help="Only run cases whose id contains this text")
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak memory measurements")
+    add_baseline_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = build_cases(args.max_tokens, args.max_d_model, args.max_vocab)
+    if args.filter:
+        cases = [case for case in cases if args.filter in case.case_id]
+
+    results = run_cases(cases, measure_memory=not args.no_memory)
+    return finish(SUITE, results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
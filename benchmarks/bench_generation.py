@@ -0,0 +1,273 @@
+"""
+LLM Explained - Generation benchmarks
+Times token generation on the toy models:
+
+- KV-cached greedy decoding against recomputing the whole prefix every step
+- beam search throughput (tokens per second) at widths 1-32
+- the float32 toy transformer's generation throughput
+- speculative decoding against plain sampling of the target model
+- batched temperature/top-k/top-p sampling over large vocabularies
+- alias-table draws from fixed distributions against np.random.choice
+
+To run the suite and save the baseline:
+    python -m benchmarks.bench_generation --save
+
+To fail when a case is more than 25% slower than the baseline:
+    python -m benchmarks.bench_generation --compare
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from benchmarks.harness import BenchmarkCase, add_baseline_arguments, finish, run_cases
+from utils.beam_search import beam_search
+from utils.kv_cache import AttentionDecoder, greedy_decode
+from utils.sampling import AliasTable, sample_decode, sample_tokens, softmax
+from utils.speculative_decoding import compare_speculative, create_draft_model, speculative_decode
+from utils.toy_transformer import ToyTransformer, create_toy_weights
+
+SUITE = "generation"
+
+PROMPT_LENGTHS = [16, 128, 512]
+NEW_TOKENS = 32
+
+BEAM_WIDTHS = [1, 2, 4, 8, 16, 32]
+BEAM_PROMPT_LENGTH = 16
+
+# Toy transformer generation: batch sizes
+TOY_TRANSFORMER_BATCH_SIZES = [1, 8]
+
+# Cases reported in tokens per second, with the parameter counting their sequences
+THROUGHPUT_CASES = {"beam_search": "beams", "toy_transformer": "batch"}
+
+# Speculative decoding: tokens proposed per round, draft layers and sampling temperature
+DRAFT_TOKEN_COUNTS = [2, 4, 8]
+DRAFT_LAYERS = 1
+SPECULATIVE_NEW_TOKENS = 64
+SPECULATIVE_TEMPERATURE = 0.7
+
+# Logits sampled at once: rows x vocabulary
+SAMPLING_ROWS = 1000
+SAMPLING_VOCAB = 100_000
+SAMPLING_SETTINGS = [
+    {"temperature": 1.0},
+    {"temperature": 1.0, "top_k": 50},
+    {"temperature": 1.0, "top_p": 0.9},
+    {"temperature": 0.7, "top_k": 50, "top_p": 0.9},
+]
+
+# Fixed distributions drawn from many times (empirical histogram slides)
+ALIAS_DISTRIBUTIONS = 100
+ALIAS_VOCAB = 1000
+ALIAS_DRAWS = 100_000
+
+
+def create_model():
+    return AttentionDecoder(vocab_size=1000, d_model=128, num_layers=4, num_heads=8, num_kv_heads=2)
+
+
+def _prompt(model, length, batch_size=1):
+    return np.random.default_rng(42).integers(0, model.vocab_size, (batch_size, length))
+
+
+_sampling_logits = {}
+
+
+def _logits(rows, vocab):
+    # Built once: generating 1e8 logits takes longer than sampling them
+    if (rows, vocab) not in _sampling_logits:
+        rng = np.random.default_rng(42)
+        _sampling_logits[(rows, vocab)] = rng.standard_normal((rows, vocab), dtype=np.float32) * 4
+    return _sampling_logits[(rows, vocab)]
+
+
+def _distributions(count, vocab):
+    return softmax(np.random.default_rng(42).standard_normal((count, vocab)) * 2)
+
+
+def choice_draws(probabilities, rng, size):
+    """Draws from every distribution with np.random.choice (rebuilds a CDF per call)."""
+    return np.stack([rng.choice(len(row), size=size, p=row) for row in probabilities])
+
+
+def recompute_decode(model, prompt, max_new_tokens):
+    """
+    Greedy decoding without a KV cache: every step runs the whole prefix.
+
+    Args:
+        model: Model with create_cache() and forward()
+        prompt: Prompt token ids of shape (batch, prompt_length)
+        max_new_tokens: Tokens generated
+
+    Returns:
+        Generated tokens of shape (batch, max_new_tokens)
+    """
+    sequence = np.asarray(prompt)
+    for _ in range(max_new_tokens):
+        logits = model.forward(sequence, model.create_cache(sequence.shape[0], sequence.shape[1]))
+        sequence = np.concatenate([sequence, logits[:, -1:].argmax(axis=-1)], axis=1)
+    return sequence[:, -max_new_tokens:]
+
+
+def build_cases(max_prompt=None):
+    """
+    Builds the benchmark cases of the suite.
+
+    Args:
+        max_prompt: Longest prompt (None keeps every length)
+
+    Returns:
+        List of BenchmarkCase
+    """
+    model = create_model()
+    cases = []
+    for length in [n for n in PROMPT_LENGTHS if max_prompt is None or n <= max_prompt]:
+        cases += [
+            BenchmarkCase("greedy_decode", greedy_decode,
+                          lambda n=length: (model, _prompt(model, n), NEW_TOKENS),
+                          prompt=length, new_tokens=NEW_TOKENS, cache="kv"),
+            BenchmarkCase("greedy_decode", recompute_decode,
+                          lambda n=length: (model, _prompt(model, n), NEW_TOKENS),
+                          prompt=length, new_tokens=NEW_TOKENS, cache="none"),
+        ]
+    for width in BEAM_WIDTHS:
+        cases.append(BenchmarkCase(
+            "beam_search", lambda prompt, w=width: beam_search(model, prompt, NEW_TOKENS, num_beams=w),
+            lambda: (_prompt(model, BEAM_PROMPT_LENGTH),),
+            beams=width, prompt=BEAM_PROMPT_LENGTH, new_tokens=NEW_TOKENS,
+        ))
+    draft = create_draft_model(model, DRAFT_LAYERS)
+
+    def speculative_prompt():
+        return _prompt(model, BEAM_PROMPT_LENGTH), np.random.default_rng(0)
+
+    cases.append(BenchmarkCase(
+        "sample_decode",
+        lambda prompt, rng: sample_decode(model, prompt, SPECULATIVE_NEW_TOKENS, rng, SPECULATIVE_TEMPERATURE),
+        speculative_prompt, new_tokens=SPECULATIVE_NEW_TOKENS, temperature=SPECULATIVE_TEMPERATURE,
+    ))
+    for count in DRAFT_TOKEN_COUNTS:
+        cases.append(BenchmarkCase(
+            "speculative_decode",
+            lambda prompt, rng, k=count: speculative_decode(
+                model, draft, prompt, SPECULATIVE_NEW_TOKENS, rng, k, SPECULATIVE_TEMPERATURE
+            ),
+            speculative_prompt, draft_tokens=count, new_tokens=SPECULATIVE_NEW_TOKENS,
+        ))
+    transformer = ToyTransformer(create_toy_weights())
+    for batch_size in TOY_TRANSFORMER_BATCH_SIZES:
+        cases.append(BenchmarkCase(
+            "toy_transformer", lambda prompt: transformer.generate(prompt, NEW_TOKENS),
+            lambda b=batch_size: (_prompt(transformer, BEAM_PROMPT_LENGTH, b),),
+            batch=batch_size, prompt=BEAM_PROMPT_LENGTH, new_tokens=NEW_TOKENS,
+        ))
+    for settings in SAMPLING_SETTINGS:
+        cases.append(BenchmarkCase(
+            "sample_tokens", lambda logits, rng, s=settings: sample_tokens(logits, rng, **s),
+            lambda: (_logits(SAMPLING_ROWS, SAMPLING_VOCAB), np.random.default_rng(0)),
+            rows=SAMPLING_ROWS, vocab=SAMPLING_VOCAB, **settings,
+        ))
+
+    alias_sizes = {"distributions": ALIAS_DISTRIBUTIONS, "vocab": ALIAS_VOCAB}
+    cases += [
+        BenchmarkCase("alias_table", AliasTable,
+                      lambda: (_distributions(ALIAS_DISTRIBUTIONS, ALIAS_VOCAB),), **alias_sizes),
+        BenchmarkCase("draws", lambda table, rng: table.sample(rng, ALIAS_DRAWS),
+                      lambda: (AliasTable(_distributions(ALIAS_DISTRIBUTIONS, ALIAS_VOCAB)),
+                               np.random.default_rng(0)),
+                      method="alias", draws=ALIAS_DRAWS, **alias_sizes),
+        BenchmarkCase("draws", choice_draws,
+                      lambda: (_distributions(ALIAS_DISTRIBUTIONS, ALIAS_VOCAB), np.random.default_rng(0),
+                               ALIAS_DRAWS),
+                      method="choice", draws=ALIAS_DRAWS, **alias_sizes),
+    ]
+    return cases
+
+
+def format_throughput(cases, results):
+    """
+    Formats the generated tokens per second of the beam search and toy
+    transformer cases (every beam or batch row counts as one sequence).
+
+    Args:
+        cases: Benchmark cases run
+        results: Dictionary returned by run_cases
+
+    Returns:
+        Report string, empty without such cases
+    """
+    lines = []
+    for case in cases:
+        if case.name not in THROUGHPUT_CASES or case.case_id not in results:
+            continue
+        rows_param = THROUGHPUT_CASES[case.name]
+        tokens = case.params[rows_param] * case.params["new_tokens"]
+        seconds = results[case.case_id]["median_seconds"]
+        lines.append(f"{case.name} {rows_param}={case.params[rows_param]:<3} {tokens / seconds:>10.0f} tokens/s "
+                     f"{case.params['new_tokens'] / seconds:>8.0f} steps/s")
+    return "\n".join(lines)
+
+
+def format_speculative(cases, results):
+    """
+    Formats the acceptance rate, target calls per token and speedup over
+    sample_decode of the speculative decoding cases, from one
+    compare_speculative() run each (timing does not keep the statistics).
+
+    The layer-skipping draft runs one of the target's four layers, but toy
+    steps are dominated by per-call overhead rather than layer compute, so
+    a proposal costs a large share of a target step and the speedup can be
+    below 1.
+
+    Args:
+        cases: Benchmark cases run
+        results: Dictionary returned by run_cases
+
+    Returns:
+        Report string, empty without speculative decoding cases
+    """
+    cases = [case for case in cases if case.name == "speculative_decode" and case.case_id in results]
+    if not cases:
+        return ""
+    model = create_model()
+    draft = create_draft_model(model, DRAFT_LAYERS)
+    prompt = _prompt(model, BEAM_PROMPT_LENGTH)
+    lines = []
+    for case in cases:
+        comparison = compare_speculative(model, draft, prompt, SPECULATIVE_NEW_TOKENS,
+                                         num_draft_tokens=case.params["draft_tokens"],
+                                         temperature=SPECULATIVE_TEMPERATURE)
+        lines.append(f"draft_tokens={case.params['draft_tokens']:<3} "
+                     f"acceptance {comparison['acceptance_rate']:>6.1%} "
+                     f"target calls/token {comparison['target_calls_per_token']:>5.2f} "
+                     f"speedup {comparison['speedup']:>5.2f}x")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark token generation on the toy models.")
+    parser.add_argument("--max-prompt", type=int, default=None, help="Longest prompt")
+    parser.add_argument("-k", "--filter", default=None,
+                        help="Only run cases whose id contains this text")
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak memory measurements")
+    add_baseline_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = build_cases(args.max_prompt)
+    if args.filter:
+        cases = [case for case in cases if args.filter in case.case_id]
+
+    results = run_cases(cases, measure_memory=not args.no_memory)
+    for report in (format_throughput(cases, results), format_speculative(cases, results)):
+        if report:
+            print(f"\n{report}")
+    return finish(SUITE, results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+LLM Explained - Scene construction benchmarks
+Measures the pure Python cost of building every slide (Text, MathTex, Code,
+VGroup.arrange, ...) by running each scene of slides.ALL_SCENES through the
+dry run N times, without rasterizing or encoding. Reports median and p95
+construction time and peak traced allocations per scene.
+
+To run the suite and save the baseline:
+    python -m benchmarks.bench_scenes --save
+
+To catch a slow helper change before it slows every render:
+    python -m benchmarks.bench_scenes --compare --repeat 5
+"""
+
+import argparse
+import sys
+
+from benchmarks.harness import BenchmarkCase, add_baseline_arguments, finish, run_cases
+from tools.dry_run import dry_run_scene
+
+SUITE = "scenes"
+
+DEFAULT_REPEAT = 5
+
+
+def construct_scene(scene_name):
+    """
+    Builds a scene through the dry run.
+
+    Args:
+        scene_name: Scene class name
+    """
+    result = dry_run_scene(scene_name)
+    if result["error"]:
+        raise RuntimeError(f"{scene_name} failed to build:\n{result['error']}")
+
+
+def build_cases(scene_names):
+    """
+    Builds one benchmark case per scene.
+
+    Args:
+        scene_names: Scene class names
+
+    Returns:
+        List of BenchmarkCase
+    """
+    return [
+        BenchmarkCase(name, construct_scene, lambda name=name: (name,))
+        for name in scene_names
+    ]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the construction of every scene.")
+    parser.add_argument("scenes", nargs="*", help="Scene names (default: every scene in slides.ALL_SCENES)")
+    parser.add_argument("-n", "--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Timed runs per scene (default: %(default)s)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip allocation measurements")
+    add_baseline_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.scenes:
+        scene_names = args.scenes
+    else:
+        from slides import SCENE_NAMES
+        scene_names = SCENE_NAMES
+
+    # The first run fills the Text and LaTeX caches, later runs measure steady state
+    results = run_cases(
+        build_cases(scene_names),
+        measure_memory=not args.no_memory,
+        min_runs=args.repeat,
+        max_runs=args.repeat,
+        warmup=True,
+    )
+    return finish(SUITE, results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
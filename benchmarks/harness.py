@@ -0,0 +1,326 @@
+"""
+Benchmark harness for LLM Explained presentation.
+Times benchmark cases, measures their peak memory with tracemalloc, stores
+results as JSON baselines and compares new runs against them.
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from utils.metrics_store import record_metrics
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# Relative slowdown (0.25 = 25%) above which a case counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Differences below this many seconds are timer noise, never regressions
+DEFAULT_NOISE_FLOOR = 1e-4
+
+
+class BenchmarkCase:
+    """
+    One benchmarked call.
+
+    setup() builds the arguments outside the timed region; func(*args) is
+    the timed call.
+    """
+
+    def __init__(self, name, func, setup=None, **params):
+        self.name = name
+        self.func = func
+        self.setup = setup or (lambda: ())
+        self.params = params
+
+    @property
+    def case_id(self):
+        if not self.params:
+            return self.name
+        params = ",".join(f"{key}={value}" for key, value in self.params.items())
+        return f"{self.name}[{params}]"
+
+
+def time_case(case, min_runs=3, max_runs=50, min_total_seconds=0.2, warmup=False):
+    """
+    Times a case, repeating it until enough runs or time were collected.
+
+    Args:
+        case: BenchmarkCase
+        min_runs: Minimum number of timed runs
+        max_runs: Maximum number of timed runs
+        min_total_seconds: Keep repeating until this much time was measured
+        warmup: Whether to run the case once untimed first (fills caches)
+
+    Returns:
+        List of run times in seconds
+    """
+    if warmup:
+        case.func(*case.setup())
+    times = []
+    while len(times) < max_runs and (len(times) < min_runs or sum(times) < min_total_seconds):
+        args = case.setup()
+        start = time.perf_counter()
+        case.func(*args)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def peak_memory(case):
+    """
+    Measures the peak memory allocated by one call of a case.
+
+    Args:
+        case: BenchmarkCase
+
+    Returns:
+        Peak traced allocation in bytes, excluding the arguments
+    """
+    args = case.setup()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        case.func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - baseline)
+
+
+def summarize(times, peak_bytes=None):
+    """
+    Summarizes run times.
+
+    Args:
+        times: List of run times in seconds
+        peak_bytes: Peak memory in bytes, if measured
+
+    Returns:
+        Dictionary with median, p95, min and run count
+    """
+    ordered = sorted(times)
+    return {
+        "median_seconds": statistics.median(ordered),
+        "p95_seconds": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "min_seconds": ordered[0],
+        "runs": len(ordered),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def run_cases(cases, measure_memory=True, progress=True, **timing):
+    """
+    Runs benchmark cases.
+
+    Args:
+        cases: List of BenchmarkCase
+        measure_memory: Whether to measure peak memory (one extra call per case)
+        progress: Whether to print each result as it completes
+        timing: Options passed to time_case (min_runs, max_runs, warmup, ...)
+
+    Returns:
+        Dictionary mapping case ids to summaries
+    """
+    results = {}
+    for case in cases:
+        times = time_case(case, **timing)
+        peak = peak_memory(case) if measure_memory else None
+        results[case.case_id] = summarize(times, peak)
+        if progress:
+            print(format_result(case.case_id, results[case.case_id]), flush=True)
+    return results
+
+
+def format_bytes(size):
+    if size is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+
+
+def format_result(case_id, result):
+    return (
+        f"{case_id:<60} {result['median_seconds'] * 1000:>10.3f}ms "
+        f"p95 {result['p95_seconds'] * 1000:>10.3f}ms {format_bytes(result['peak_bytes']):>9}"
+    )
+
+
+def machine_info():
+    """Returns the environment a baseline was recorded in."""
+    import numpy as np
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def baseline_path(suite):
+    return os.path.join(BASELINE_DIR, f"{suite}.json")
+
+
+def save_baseline(suite, results, path=None):
+    """
+    Saves benchmark results as the baseline of a suite.
+
+    Args:
+        suite: Suite name
+        results: Dictionary returned by run_cases
+        path: Baseline path (default: benchmarks/baselines/<suite>.json)
+    """
+    path = path or baseline_path(suite)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as baseline_file:
+        json.dump({"suite": suite, "environment": machine_info(), "results": results}, baseline_file, indent=2)
+        baseline_file.write("\n")
+
+
+def load_baseline(suite, path=None):
+    """
+    Loads the baseline of a suite.
+
+    Args:
+        suite: Suite name
+        path: Baseline path (default: benchmarks/baselines/<suite>.json)
+
+    Returns:
+        Dictionary mapping case ids to summaries, or None if there is no baseline
+    """
+    path = path or baseline_path(suite)
+    if not os.path.exists(path):
+        return None
+    with open(path) as baseline_file:
+        return json.load(baseline_file)["results"]
+
+
+def compare_results(baseline, results, tolerance=DEFAULT_TOLERANCE,
+                    memory_tolerance=None, noise_floor=DEFAULT_NOISE_FLOOR, metric="median_seconds"):
+    """
+    Compares results against a baseline.
+
+    Args:
+        baseline: Baseline dictionary mapping case ids to summaries
+        results: Current results
+        tolerance: Allowed relative slowdown
+        memory_tolerance: Allowed relative peak memory growth (default: same as tolerance)
+        noise_floor: Absolute slowdown in seconds always tolerated
+        metric: Timing statistic compared
+
+    Returns:
+        List of regression dictionaries (case, kind, baseline, current, ratio)
+    """
+    if memory_tolerance is None:
+        memory_tolerance = tolerance
+
+    regressions = []
+    for case_id, current in results.items():
+        previous = baseline.get(case_id)
+        if previous is None:
+            continue
+
+        before, after = previous[metric], current[metric]
+        if after - before > noise_floor and after > before * (1 + tolerance):
+            regressions.append({
+                "case": case_id, "kind": "time",
+                "baseline": before, "current": after, "ratio": after / before,
+            })
+
+        before, after = previous.get("peak_bytes"), current.get("peak_bytes")
+        if before and after and after > before * (1 + memory_tolerance):
+            regressions.append({
+                "case": case_id, "kind": "memory",
+                "baseline": before, "current": after, "ratio": after / before,
+            })
+    return regressions
+
+
+def format_regressions(regressions):
+    lines = []
+    for regression in regressions:
+        if regression["kind"] == "time":
+            before = f"{regression['baseline'] * 1000:.3f}ms"
+            after = f"{regression['current'] * 1000:.3f}ms"
+        else:
+            before = format_bytes(regression["baseline"])
+            after = format_bytes(regression["current"])
+        lines.append(
+            f"REGRESSION {regression['kind']:<6} {regression['case']}: "
+            f"{before} -> {after} ({regression['ratio']:.2f}x)"
+        )
+    return "\n".join(lines)
+
+
+def add_baseline_arguments(parser):
+    """Adds the baseline options shared by every benchmark suite."""
+    parser.add_argument("--save", action="store_true",
+                        help="Save the results as the new baseline")
+    parser.add_argument("--compare", action="store_true",
+                        help="Fail when a case regresses beyond the tolerance")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="Baseline file (default: benchmarks/baselines/<suite>.json)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown (default: %(default)s)")
+    parser.add_argument("--memory-tolerance", type=float, default=None,
+                        help="Allowed relative peak memory growth (default: --tolerance)")
+    parser.add_argument("--noise-floor", type=float, default=DEFAULT_NOISE_FLOOR,
+                        help="Slowdowns below this many seconds are ignored (default: %(default)s)")
+    parser.add_argument("--no-metrics", action="store_true",
+                        help="Do not append the results to the metrics history")
+
+
+def finish(suite, results, args):
+    """
+    Records results in the metrics history, then saves or compares them as
+    requested on the command line.
+
+    Args:
+        suite: Suite name
+        results: Current results
+        args: Parsed arguments (see add_baseline_arguments)
+
+    Returns:
+        Process exit code
+    """
+    if not args.no_metrics:
+        record_metrics(f"benchmark:{suite}", [
+            {
+                "scene": case_id,
+                "wall_seconds": result["median_seconds"],
+                "peak_memory_bytes": result["peak_bytes"],
+                "extra": {"p95_seconds": result["p95_seconds"], "runs": result["runs"]},
+            }
+            for case_id, result in results.items()
+        ])
+
+    if args.save:
+        save_baseline(suite, results, args.baseline)
+        print(f"Saved baseline of {len(results)} case(s)")
+
+    if not args.compare:
+        return 0
+
+    baseline = load_baseline(suite, args.baseline)
+    if baseline is None:
+        # Baselines are per machine and not committed, so a fresh checkout has nothing to compare
+        print(f"Warning: no baseline for '{suite}', skipping the comparison (run with --save first)",
+              file=sys.stderr)
+        return 0
+
+    regressions = compare_results(
+        baseline, results, args.tolerance, args.memory_tolerance, args.noise_floor
+    )
+    if regressions:
+        print(format_regressions(regressions))
+    print(f"Compared {len(results)} case(s) against the baseline: {len(regressions)} regression(s)")
+    return 1 if regressions else 0
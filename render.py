@@ -0,0 +1,293 @@
+"""
+LLM Explained - Render entry point
+Renders presentation scenes with the streaming encoder pipeline.
+
+To render every slide for publishing:
+    python render.py -qh --encoder publish
+
+To render a quick preview of some scenes, two scenes at a time:
+    python render.py -ql --encoder preview --jobs 2 Slide1_TitleIntroduction Slide2_CommunicationRules
+
+To split the frames of long animations across four worker processes:
+    python render.py -qh --frame-jobs 4 Slide1_TitleIntroduction
+
+To profile peak memory per scene, then keep heavy scenes apart within a 12 GB budget:
+    python render.py -qk --memory-profile
+    python render.py -qk --jobs 4 --memory-budget 12
+
+Every build appends per-scene timings to media/metrics.sqlite; to query them:
+    python -m tools.metrics slowest
+
+To profile a slow scene (pstats, collapsed stacks for a flame graph, hotspot table):
+    python render.py -ql --profile Slide29_MultiHeadAttention
+
+To record a Chrome trace of the whole build (open in chrome://tracing or Perfetto):
+    python render.py -ql --jobs 4 --trace trace.json
+
+Slides are written to the same folders as `manim slides.py`, so
+`manim-slides convert` and `manim-slides present` work unchanged.
+"""
+
+import argparse
+import importlib
+import os
+import pkgutil
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+from utils.encoding import DEFAULT_ENCODER_PROFILE, ENCODER_PROFILES
+from utils.memory_profile import format_memory_report, load_memory_estimates, write_memory_report
+from utils.metrics_store import load_peak_memory_estimates, load_time_estimates, record_metrics
+from utils.profiling import format_hotspots, merge_profiles
+from utils.render_report import format_report, write_report
+from utils.render_settings import apply_settings
+from utils.scheduler import SceneScheduler, run_scheduled
+from utils.tracing import merge_traces
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+DEFAULT_MEMORY_REPORT = os.path.join("media", "memory_report.json")
+
+DEFAULT_PROFILE_DIR = os.path.join("media", "profiles")
+
+SCENE_CLASS_PATTERN = re.compile(r"^class (\w+)\(", re.MULTILINE)
+
+
+_scene_modules = None
+
+
+def scene_modules():
+    """
+    Maps scene class names to the scenes module defining them.
+
+    The module sources are scanned rather than imported, so finding one
+    scene only imports its own module instead of all of slides.py.
+
+    Returns:
+        Dictionary mapping scene names to module names
+    """
+    global _scene_modules
+    if _scene_modules is None:
+        scenes_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenes")
+        _scene_modules = {}
+        for module_info in pkgutil.iter_modules([scenes_dir]):
+            with open(os.path.join(scenes_dir, f"{module_info.name}.py"), encoding="utf-8") as source:
+                for scene_name in SCENE_CLASS_PATTERN.findall(source.read()):
+                    _scene_modules.setdefault(scene_name, f"scenes.{module_info.name}")
+    return _scene_modules
+
+
+def find_scene_class(scene_name):
+    """
+    Finds a scene class by name in the scenes package or in slides.py.
+
+    Args:
+        scene_name: Scene class name
+
+    Returns:
+        Scene class
+    """
+    module_name = scene_modules().get(scene_name)
+    if module_name is not None:
+        scene_class = getattr(importlib.import_module(module_name), scene_name, None)
+        if scene_class is not None:
+            return scene_class
+
+    import slides
+
+    scene_class = getattr(slides, scene_name, None)
+    if scene_class is not None:
+        return scene_class
+
+    raise ValueError(f"Unknown scene '{scene_name}'")
+
+
+def render_scene(scene_name, quality, settings, show_progress=True):
+    """
+    Renders a single scene.
+
+    Args:
+        scene_name: Scene class name
+        quality: Quality flag letter (l, m, h, p, k)
+        settings: Render settings applied before the scene is built
+        show_progress: Whether manim shows progress bars
+
+    Returns:
+        Dictionary of render statistics (see SceneRenderStats)
+    """
+    apply_settings(settings)
+
+    from manim import tempconfig
+
+    scene_class = find_scene_class(scene_name)
+    manim_config = {"quality": QUALITIES[quality]}
+    if not show_progress:
+        manim_config["progress_bar"] = "none"
+
+    with tempconfig(manim_config):
+        scene = scene_class()
+        scene.render()
+
+    return scene.instrumentation.report()
+
+
+def metrics_row(result):
+    """
+    Converts render statistics to a metrics history row.
+
+    Args:
+        result: Dictionary returned by render_scene
+
+    Returns:
+        Row dictionary for MetricsStore.record_many
+    """
+    memory = result.get("memory")
+    return {
+        "scene": result["scene"],
+        "wall_seconds": result["wall_seconds"],
+        "frames": result["frames"],
+        "output_bytes": result["output_bytes"],
+        # A peak of 0: RSS unavailable on this platform
+        "peak_memory_bytes": (memory["peak_rss_bytes"] or None) if memory else None,
+        "cache_hits": result["cache_hits"],
+        "extra": {
+            "encoding_profile": result["encoding_profile"],
+            "encode_seconds": result["encode_seconds"],
+            "motion_ratio": result["motion_ratio"],
+        },
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render LLM Explained slides.")
+    parser.add_argument("scenes", nargs="*", help="Scene names (default: every scene in slides.ALL_SCENES)")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="h",
+                        help="Render quality: l, m, h, p or k (default: h)")
+    parser.add_argument("--encoder", choices=sorted(ENCODER_PROFILES), default=DEFAULT_ENCODER_PROFILE,
+                        help="Encoder profile (default: %(default)s)")
+    parser.add_argument("--encode-jobs", type=int, default=0,
+                        help="Concurrent segment encoders per scene (default: CPU count)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Scenes rendered in parallel (default: 1)")
+    parser.add_argument("--frame-jobs", type=int, default=1,
+                        help="Worker processes sharing the frames of a long animation (default: 1)")
+    parser.add_argument("--dirty-regions", action="store_true",
+                        help="Only redraw the area touched by each animation frame")
+    parser.add_argument("--report", metavar="PATH",
+                        help="Write per-scene render statistics as JSON")
+    parser.add_argument("--memory-profile", action="store_true",
+                        help="Record peak memory and top allocators of every scene")
+    parser.add_argument("--memory-report", metavar="PATH", default=DEFAULT_MEMORY_REPORT,
+                        help="Memory report written by --memory-profile (default: %(default)s)")
+    parser.add_argument("--memory-budget", type=float, metavar="GB",
+                        help="Never run scenes together whose profiled peaks exceed this many GB")
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_DIR, metavar="DIR",
+                        help="Save cProfile stats and collapsed stacks of every scene (default: %(const)s)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Write a Chrome trace of every play and render phase")
+    parser.add_argument("--no-metrics", action="store_true",
+                        help="Do not append this build to the metrics history (media/metrics.sqlite)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.scenes:
+        scene_names = args.scenes
+    else:
+        from slides import SCENE_NAMES
+        scene_names = SCENE_NAMES
+
+    settings = {
+        "encoder": args.encoder,
+        "encode_jobs": args.encode_jobs or None,
+        "frame_jobs": args.frame_jobs if args.frame_jobs > 1 else None,
+        "dirty_regions": args.dirty_regions,
+        "memory_profile": args.memory_profile,
+        "profile_dir": os.path.abspath(args.profile) if args.profile else None,
+    }
+    trace_dir = None
+    if args.trace:
+        # Every process writes its own trace file, merged once the build is done
+        trace_dir = tempfile.mkdtemp(prefix="llm-slides-trace-")
+        settings["trace_dir"] = trace_dir
+
+    try:
+        return _render_scenes(args, scene_names, settings)
+    finally:
+        if trace_dir is not None:
+            events = merge_traces(trace_dir, args.trace)
+            shutil.rmtree(trace_dir, ignore_errors=True)
+            print(f"Wrote {events} trace events to {args.trace}")
+
+
+def _render_scenes(args, scene_names, settings):
+    """Renders scenes sequentially or in worker processes and prints the report."""
+    start = time.perf_counter()
+    results = []
+    failed = []
+    if args.jobs <= 1:
+        for scene_name in scene_names:
+            result = render_scene(scene_name, args.quality, settings)
+            results.append(result)
+            print(f"{result['scene']}: {result['wall_seconds']:.1f}s")
+    else:
+        def on_result(scene_name, result):
+            results.append(result)
+            print(f"{scene_name}: {result['wall_seconds']:.1f}s")
+
+        def on_error(scene_name, error):
+            failed.append(scene_name)
+            print(f"{scene_name}: FAILED ({error})", file=sys.stderr)
+
+        quality = QUALITIES[args.quality]
+        budget = args.memory_budget * 1e9 if args.memory_budget else None
+        # A fresh memory report wins over peaks recorded in the metrics history
+        memory_estimates = load_peak_memory_estimates(quality)
+        memory_estimates.update(load_memory_estimates(args.memory_report, quality))
+        scheduler = SceneScheduler(memory_estimates, budget, load_time_estimates(quality))
+        run_scheduled(
+            render_scene, scene_names, (args.quality, settings, False), args.jobs,
+            scheduler, on_result, on_error,
+        )
+
+    # Scenes that did render are still recorded and reported when others failed
+    if not args.no_metrics:
+        record_metrics("render", [metrics_row(result) for result in results], QUALITIES[args.quality])
+    print()
+    print(format_report(results))
+    if args.report:
+        write_report(results, args.report)
+    if args.memory_profile:
+        reports = [result["memory"] for result in results if result["memory"]]
+        print()
+        print(format_memory_report(reports))
+        write_memory_report(reports, args.memory_report, QUALITIES[args.quality])
+    if args.profile:
+        stats = merge_profiles([result["profile"] for result in results if result["profile"]], args.profile)
+        if stats is not None:
+            hotspots = format_hotspots(stats)
+            with open(os.path.join(args.profile, "hotspots.txt"), "w") as hotspots_file:
+                hotspots_file.write(hotspots + "\n")
+            print()
+            print(hotspots)
+            print(f"Saved profiles to {args.profile} (deck.pstats, deck.collapsed, <scene>.pstats/.collapsed)")
+    if failed:
+        print(f"{len(failed)} scene(s) failed: {' '.join(failed)}", file=sys.stderr)
+        return 1
+    print(f"Rendered {len(scene_names)} scene(s) in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
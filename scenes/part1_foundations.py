@@ -4,16 +4,13 @@ Slides 1-11: Introduction, communication rules, prompt engineering basics
 """
 
 from manim import *
-from manim_slides import Slide
-import sys
-import os
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from utils.custom_scenes import *
-from utils.animations import *
-from assets.styles.theme_config import *
+from assets.styles.theme_config import (
+    ACCENT_CYAN, ACCENT_GREEN, ACCENT_ORANGE, ACCENT_PURPLE, ACCENT_TURQUOISE, ACCENT_YELLOW,
+    BODY_FONT_SIZE, DARK_BLUE, DARK_GRAY, HEADING_FONT_SIZE, LIGHT_GRAY, PAUSE_TIME, PRIMARY_BLUE,
+    SMALL_FONT_SIZE, SUBTITLE_FONT_SIZE, TINY_FONT_SIZE, TITLE_FONT_SIZE, create_numbered_box,
+)
+from utils.custom_scenes import LLMSlide, TitleSlide
 
 
 class Slide1_TitleIntroduction(TitleSlide):
@@ -22,6 +19,8 @@ class Slide1_TitleIntroduction(TitleSlide):
     Main introduction to the LLM presentation
     """
 
+    encoding_profile = "motion"
+
     def construct(self):
         # Gradient background
         self.add_gradient_background(DARK_BLUE, ACCENT_CYAN, opacity=0.3)
@@ -516,14 +515,7 @@ class Slide10_PartTransition(TitleSlide):
 
     def construct(self):
         # Background color transition
-        bg = Rectangle(
-            width=config.frame_width,
-            height=config.frame_height,
-            fill_opacity=1,
-            fill_color=DARK_BLUE,
-            stroke_width=0
-        )
-        self.add(bg)
+        self.add_background_layer(DARK_BLUE)
 
         # Transition title
         transition_text = Text(
@@ -4,16 +4,13 @@ Slides 12-20: LLM history, definitions, and RNN architecture
 """
 
 from manim import *
-from manim_slides import Slide
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from utils.custom_scenes import *
-from utils.animations import *
-from utils.data_generators import *
-from assets.styles.theme_config import *
+from assets.styles.theme_config import (
+    ACCENT_CYAN, ACCENT_GREEN, ACCENT_ORANGE, ACCENT_YELLOW, BODY_FONT_SIZE, DARK_BLUE,
+    HEADING_FONT_SIZE, LIGHT_GRAY, PAUSE_TIME, PRIMARY_BLUE, SMALL_FONT_SIZE, TINY_FONT_SIZE,
+    TITLE_FONT_SIZE,
+)
+from utils.custom_scenes import FormulaSlide, LLMSlide, TitleSlide
 
 
 class Slide12_LLMDefinition(LLMSlide):
@@ -304,14 +301,7 @@ class Slide18_ToolsArchitectureTitle(TitleSlide):
     """Slide 18: Tools and Architecture Section Title"""
 
     def construct(self):
-        bg = Rectangle(
-            width=config.frame_width,
-            height=config.frame_height,
-            fill_opacity=1,
-            fill_color=DARK_BLUE,
-            stroke_width=0
-        )
-        self.add(bg)
+        self.add_background_layer(DARK_BLUE)
 
         title = Text(
             "Tools and Architecture",
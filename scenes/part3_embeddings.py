@@ -4,16 +4,12 @@ Slides 21-28: Tokens, embeddings, Word2Vec, and modern approaches
 """
 
 from manim import *
-from manim_slides import Slide
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from utils.custom_scenes import *
-from utils.animations import *
-from utils.data_generators import *
-from assets.styles.theme_config import *
+from assets.styles.theme_config import (
+    ACCENT_CYAN, ACCENT_GREEN, ACCENT_ORANGE, ACCENT_RED, ACCENT_YELLOW, BODY_FONT_SIZE,
+    HEADING_FONT_SIZE, PAUSE_TIME, PRIMARY_BLUE, SMALL_FONT_SIZE, TINY_FONT_SIZE, create_box,
+)
+from utils.custom_scenes import LLMSlide
 
 
 class Slide21_TokensDefinition(LLMSlide):
@@ -74,6 +70,8 @@ class Slide21_TokensDefinition(LLMSlide):
 class Slide22_EmbeddingsDefinition(LLMSlide):
     """Slide 22: Embeddings Concept"""
 
+    encoding_profile = "motion"
+
     def construct(self):
         title = self.add_title("Converting text to vectors: embeddings")
         self.play(Write(title), run_time=0.5)
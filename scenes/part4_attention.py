@@ -4,16 +4,12 @@ Slides 29-31: Multi-head attention and Grouped Query Attention
 """
 
 from manim import *
-from manim_slides import Slide
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from utils.custom_scenes import *
-from utils.animations import *
-from utils.data_generators import *
-from assets.styles.theme_config import *
+from assets.styles.theme_config import (
+    ACCENT_CYAN, ACCENT_GREEN, ACCENT_ORANGE, ACCENT_PURPLE, ACCENT_YELLOW, BODY_FONT_SIZE,
+    HEADING_FONT_SIZE, PAUSE_TIME, SMALL_FONT_SIZE,
+)
+from utils.custom_scenes import LLMSlide
 
 
 class Slide29_MultiHeadAttention(LLMSlide):
@@ -4,30 +4,20 @@ Slides 32-41: Complete text generation pipeline
 """
 
 from manim import *
-from manim_slides import Slide
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from utils.custom_scenes import *
-from utils.animations import *
-from utils.data_generators import *
-from assets.styles.theme_config import *
+from assets.styles.theme_config import (
+    ACCENT_CYAN, ACCENT_GREEN, ACCENT_ORANGE, ACCENT_PURPLE, ACCENT_YELLOW, BODY_FONT_SIZE,
+    DARK_BLUE, HEADING_FONT_SIZE, LIGHT_GRAY, PAUSE_TIME, PRIMARY_BLUE, SMALL_FONT_SIZE,
+    TINY_FONT_SIZE, TITLE_FONT_SIZE,
+)
+from utils.custom_scenes import FormulaSlide, LLMSlide, TitleSlide
 
 
 class Slide32_TextGenerationTitle(TitleSlide):
     """Slide 32: Text Generation Title"""
 
     def construct(self):
-        bg = Rectangle(
-            width=config.frame_width,
-            height=config.frame_height,
-            fill_opacity=1,
-            fill_color=DARK_BLUE,
-            stroke_width=0
-        )
-        self.add(bg)
+        self.add_background_layer(DARK_BLUE)
 
         title = Text("Text Generation", font_size=TITLE_FONT_SIZE, color=ACCENT_CYAN, weight=BOLD)
         self.play(FadeIn(title, scale=1.2), run_time=1)
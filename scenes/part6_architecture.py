@@ -4,15 +4,12 @@ Slides 42-43: Transformer architecture visualization
 """
 
 from manim import *
-from manim_slides import Slide
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from utils.custom_scenes import *
-from utils.animations import *
-from assets.styles.theme_config import *
+from assets.styles.theme_config import (
+    ACCENT_CYAN, ACCENT_GREEN, ACCENT_ORANGE, ACCENT_PURPLE, ACCENT_YELLOW, BODY_FONT_SIZE,
+    PAUSE_TIME, SMALL_FONT_SIZE, TINY_FONT_SIZE,
+)
+from utils.custom_scenes import LLMSlide
 
 
 class Slide42_TransformerArchitecture(LLMSlide):
@@ -4,30 +4,19 @@ Slides 44-55: Challenges, quantization, costs, RLHF
 """
 
 from manim import *
-from manim_slides import Slide
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from utils.custom_scenes import *
-from utils.animations import *
-from utils.data_generators import *
-from assets.styles.theme_config import *
+from assets.styles.theme_config import (
+    ACCENT_CYAN, ACCENT_GREEN, ACCENT_ORANGE, ACCENT_PURPLE, ACCENT_RED, BODY_FONT_SIZE, DARK_BLUE,
+    HEADING_FONT_SIZE, PAUSE_TIME, SMALL_FONT_SIZE, TITLE_FONT_SIZE,
+)
+from utils.custom_scenes import LLMSlide, TitleSlide
 
 
 class Slide44_ChallengesTitle(TitleSlide):
     """Slide 44: The Challenges Title"""
 
     def construct(self):
-        bg = Rectangle(
-            width=config.frame_width,
-            height=config.frame_height,
-            fill_opacity=1,
-            fill_color=DARK_BLUE,
-            stroke_width=0
-        )
-        self.add(bg)
+        self.add_background_layer(DARK_BLUE)
 
         title = Text("The Challenges of an LLM", font_size=TITLE_FONT_SIZE, color=ACCENT_ORANGE, weight=BOLD)
         self.play(FadeIn(title, scale=1.2), run_time=1)
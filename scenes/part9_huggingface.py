@@ -4,15 +4,12 @@ Slides 61-65: Demo, conclusion, next steps
 """
 
 from manim import *
-from manim_slides import Slide
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from utils.custom_scenes import *
-from utils.animations import *
-from assets.styles.theme_config import *
+from assets.styles.theme_config import (
+    ACCENT_CYAN, ACCENT_ORANGE, ACCENT_YELLOW, BODY_FONT_SIZE, DARK_BLUE, HEADING_FONT_SIZE,
+    LIGHT_GRAY, PAUSE_TIME, TITLE_FONT_SIZE,
+)
+from utils.custom_scenes import LLMSlide, TitleSlide
 
 
 class Slide61_DemoPlaceholder(LLMSlide):
@@ -55,14 +52,7 @@ class Slide62_ConclusionTitle(TitleSlide):
     """Slide 62: Conclusion Title"""
 
     def construct(self):
-        bg = Rectangle(
-            width=config.frame_width,
-            height=config.frame_height,
-            fill_opacity=1,
-            fill_color=DARK_BLUE,
-            stroke_width=0
-        )
-        self.add(bg)
+        self.add_background_layer(DARK_BLUE)
 
         title = Text("CONCLUSION", font_size=TITLE_FONT_SIZE, color=ACCENT_CYAN, weight=BOLD)
         self.play(FadeIn(title, scale=1.2), run_time=1)
@@ -0,0 +1,119 @@
+"""
+Tests of the attention helpers in utils/data_generators.py.
+"""
+
+import numpy as np
+
+from utils.data_generators import (
+    calculate_chunked_attention,
+    calculate_multi_head_attention,
+    generate_attention_mask,
+)
+
+
+def dense_attention(Q, K, V, mask=None):
+    # Reference: one (seq_q, seq_k) softmax per head, K/V already at Q's head count
+    scores = Q @ K.swapaxes(-1, -2) / np.sqrt(Q.shape[-1])
+    if mask is not None:
+        scores = np.where(mask, scores, -np.inf)
+    weights = np.exp(scores - scores.max(axis=-1, keepdims=True))
+    weights /= weights.sum(axis=-1, keepdims=True)
+    return weights @ V
+
+
+def random_qkv(batch, heads, kv_heads, seq_q, seq_k, d, seed=0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.standard_normal((batch, heads, seq_q, d)),
+        rng.standard_normal((batch, kv_heads, seq_k, d)),
+        rng.standard_normal((batch, kv_heads, seq_k, d)),
+    )
+
+
+def test_grouped_query_attention_matches_repeated_heads():
+    for kv_heads in (1, 2, 4, 8):
+        Q, K, V = random_qkv(2, 8, kv_heads, 5, 7, 16)
+        group = 8 // kv_heads
+        expected = dense_attention(Q, np.repeat(K, group, axis=1), np.repeat(V, group, axis=1))
+        np.testing.assert_allclose(calculate_multi_head_attention(Q, K, V), expected, rtol=1e-10, atol=1e-12)
+
+
+def test_grouped_query_attention_causal_matches_repeated_heads():
+    Q, K, V = random_qkv(1, 6, 2, 4, 9, 8)
+    mask = generate_attention_mask(4, 9)
+    expected = dense_attention(Q, np.repeat(K, 3, axis=1), np.repeat(V, 3, axis=1), mask)
+    output, weights = calculate_multi_head_attention(Q, K, V, causal=True, return_weights=True)
+    np.testing.assert_allclose(output, expected, rtol=1e-10, atol=1e-12)
+    assert (weights[..., ~mask] == 0).all()
+    np.testing.assert_allclose(weights.sum(axis=-1), 1)
+
+
+def test_per_head_mask_matches_repeated_heads():
+    Q, K, V = random_qkv(1, 4, 2, 3, 3, 8)
+    mask = np.ones((1, 4, 3, 3), dtype=bool)
+    mask[0, 1, :, 0] = False
+    expected = dense_attention(Q, np.repeat(K, 2, axis=1), np.repeat(V, 2, axis=1), mask)
+    np.testing.assert_allclose(calculate_multi_head_attention(Q, K, V, mask=mask), expected, rtol=1e-10)
+
+
+def test_integer_inputs_are_scaled_in_floating_point():
+    rng = np.random.default_rng(0)
+    Q, K, V = (rng.integers(-3, 4, (1, 2, 4, 4)) for _ in range(3))
+    expected = dense_attention(Q.astype(np.float64), K.astype(np.float64), V.astype(np.float64))
+    np.testing.assert_allclose(calculate_multi_head_attention(Q, K, V), expected, rtol=1e-10)
+
+
+def test_float32_inputs_stay_float32():
+    Q, K, V = (X.astype(np.float32) for X in random_qkv(2, 4, 2, 5, 7, 16))
+    output, weights = calculate_multi_head_attention(Q, K, V, causal=True, return_weights=True)
+    assert output.dtype == np.float32 and weights.dtype == np.float32
+    expected = dense_attention(*(X.astype(np.float64) for X in (Q, np.repeat(K, 2, axis=1), np.repeat(V, 2, axis=1))),
+                               generate_attention_mask(5, 7))
+    np.testing.assert_allclose(output, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_integer_inputs_without_scaling():
+    rng = np.random.default_rng(4)
+    Q, K, V = (rng.integers(-2, 3, (1, 2, 3, 4)) for _ in range(3))
+    scores = (Q @ K.swapaxes(-1, -2)).astype(np.float64)
+    weights = np.exp(scores - scores.max(axis=-1, keepdims=True))
+    expected = weights / weights.sum(axis=-1, keepdims=True) @ V
+    np.testing.assert_allclose(calculate_multi_head_attention(Q, K, V, scale=False), expected, rtol=1e-10)
+
+
+def test_chunked_attention_matches_dense():
+    rng = np.random.default_rng(1)
+    Q, K, V = rng.standard_normal((37, 8)), rng.standard_normal((37, 8)), rng.standard_normal((37, 5))
+    for block_size in (1, 4, 16, 64):
+        np.testing.assert_allclose(calculate_chunked_attention(Q, K, V, block_size), dense_attention(Q, K, V),
+                                   rtol=1e-10, atol=1e-12)
+
+
+def test_chunked_attention_causal_and_window_match_dense():
+    rng = np.random.default_rng(2)
+    for seq_q, seq_k in ((37, 37), (5, 37), (1, 20)):
+        Q = rng.standard_normal((2, 3, seq_q, 8))
+        K, V = rng.standard_normal((2, 3, seq_k, 8)), rng.standard_normal((2, 3, seq_k, 8))
+        for window in (None, 1, 6):
+            expected = dense_attention(Q, K, V, generate_attention_mask(seq_q, seq_k, window=window))
+            for block_size in (3, 16):
+                output = calculate_chunked_attention(Q, K, V, block_size, causal=True, window=window)
+                np.testing.assert_allclose(output, expected, rtol=1e-10, atol=1e-12)
+
+
+def test_chunked_attention_non_causal_with_fewer_queries():
+    rng = np.random.default_rng(3)
+    Q, K, V = rng.standard_normal((7, 4)), rng.standard_normal((30, 4)), rng.standard_normal((30, 4))
+    np.testing.assert_allclose(calculate_chunked_attention(Q, K, V, block_size=8), dense_attention(Q, K, V),
+                               rtol=1e-10, atol=1e-12)
+
+
+def test_chunked_attention_integer_and_float32_inputs():
+    rng = np.random.default_rng(5)
+    Q, K, V = (rng.integers(-3, 4, (2, 19, 4)) for _ in range(3))
+    expected = dense_attention(*(X.astype(np.float64) for X in (Q, K, V)), generate_attention_mask(19, 19))
+    np.testing.assert_allclose(calculate_chunked_attention(Q, K, V, block_size=4, causal=True), expected, rtol=1e-10)
+
+    output = calculate_chunked_attention(*(X.astype(np.float32) for X in (Q, K, V)), block_size=4, causal=True)
+    assert output.dtype == np.float32
+    np.testing.assert_allclose(output, expected, rtol=1e-5, atol=1e-5)
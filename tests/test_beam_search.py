@@ -0,0 +1,54 @@
+"""
+Tests of beam search in utils/beam_search.py.
+"""
+
+import numpy as np
+
+from utils.beam_search import beam_search, normalize_score
+from utils.kv_cache import AttentionDecoder, greedy_decode
+from utils.sampling import logsumexp
+
+
+def create_model():
+    return AttentionDecoder(vocab_size=40, d_model=32, num_layers=2, num_heads=4, dtype=np.float64)
+
+
+def sequence_log_probability(model, prompt, tokens):
+    sequence = np.concatenate([prompt, tokens])[np.newaxis]
+    logits = model.forward(sequence, model.create_cache())[0, len(prompt) - 1:-1]
+    log_probabilities = logits - logsumexp(logits)[:, np.newaxis]
+    return log_probabilities[np.arange(len(tokens)), tokens].sum()
+
+
+def test_single_beam_is_greedy():
+    model = create_model()
+    prompt = np.array([3, 1, 4, 1, 5])
+    result = beam_search(model, prompt, 10, num_beams=1)
+    np.testing.assert_array_equal(result["tokens"], greedy_decode(model, prompt[np.newaxis], 10)["tokens"][0])
+
+
+def test_scores_are_normalized_sequence_log_probabilities():
+    model = create_model()
+    prompt = np.array([2, 7, 1])
+    result = beam_search(model, prompt, 6, num_beams=4, length_penalty=0.5)
+    assert len(result["sequences"]) == 4
+    assert (np.diff(result["scores"]) <= 0).all()
+    for tokens, score in zip(result["sequences"], result["scores"]):
+        expected = normalize_score(sequence_log_probability(model, prompt, tokens), len(tokens), 0.5)
+        assert np.isclose(score, expected)
+
+
+def test_eos_finishes_hypotheses():
+    model = create_model()
+    prompt = np.array([1, 2, 3])
+    eos = int(greedy_decode(model, prompt[np.newaxis], 3)["tokens"][0, 2])
+    result = beam_search(model, prompt, 8, num_beams=3, eos_token_id=eos)
+    for tokens in result["sequences"]:
+        assert eos not in tokens[:-1]
+        assert len(tokens) == 8 or tokens[-1] == eos
+
+
+def test_no_new_tokens_returns_an_empty_continuation():
+    result = beam_search(create_model(), [1, 2, 3], 0, num_beams=4)
+    assert result["tokens"].shape == (0,)
+    assert result["step_seconds"] == []
@@ -0,0 +1,66 @@
+"""
+Tests of the KV cache and the toy attention decoder in utils/kv_cache.py.
+"""
+
+import numpy as np
+
+from utils.kv_cache import AttentionDecoder, KVCache, greedy_decode
+
+
+def create_model(**kwargs):
+    return AttentionDecoder(vocab_size=50, d_model=32, num_layers=2, num_heads=4, dtype=np.float64, **kwargs)
+
+
+def test_incremental_decoding_matches_full_forward():
+    for num_kv_heads in (None, 2, 1):
+        model = create_model(num_kv_heads=num_kv_heads)
+        tokens = np.random.default_rng(0).integers(0, model.vocab_size, (2, 12))
+        full = model.forward(tokens, model.create_cache(2))
+
+        # Prefill 5 tokens, then one token per step, starting from a cache that must grow
+        cache = model.create_cache(2, capacity=1)
+        steps = [model.forward(tokens[:, :5], cache)]
+        steps += [model.forward(tokens[:, i:i + 1], cache) for i in range(5, 12)]
+        np.testing.assert_allclose(np.concatenate(steps, axis=1), full, rtol=1e-10, atol=1e-10)
+        assert cache.length == 12
+
+
+def test_greedy_decode_matches_recomputing_the_prefix():
+    model = create_model()
+    prompt = np.random.default_rng(1).integers(0, model.vocab_size, (2, 4))
+    tokens = greedy_decode(model, prompt, 6)["tokens"]
+
+    sequence = prompt
+    for step in range(6):
+        logits = model.forward(sequence, model.create_cache(2))
+        np.testing.assert_array_equal(tokens[:, step], logits[:, -1].argmax(axis=-1))
+        sequence = np.concatenate([sequence, tokens[:, step:step + 1]], axis=1)
+
+
+def test_zero_capacity_cache_grows():
+    cache = KVCache(1, 1, 2, 4, capacity=0)
+    keys = np.ones((1, 2, 3, 4), dtype=np.float32)
+    K, V = cache.append(0, keys, 2 * keys)
+    assert cache.capacity >= 3
+    np.testing.assert_array_equal(K, keys)
+    np.testing.assert_array_equal(V, 2 * keys)
+
+
+def test_reorder_and_truncate():
+    cache = KVCache(1, 3, 1, 2, capacity=4)
+    keys = np.arange(3 * 4 * 2, dtype=np.float32).reshape(3, 1, 4, 2)
+    cache.append(0, keys, keys)
+    cache.reorder([2, 2, 0])
+    cache.truncate(3)
+    K, _ = cache.layer(0)
+    np.testing.assert_array_equal(K, keys[[2, 2, 0], :, :3])
+
+
+def test_forward_keeps_the_model_dtype():
+    for dtype in (np.float32, np.float64):
+        model = AttentionDecoder(vocab_size=50, d_model=32, num_layers=2, num_heads=4, num_kv_heads=2, dtype=dtype)
+        cache = model.create_cache(2, capacity=1)
+        tokens = np.random.default_rng(3).integers(0, model.vocab_size, (2, 5))
+        assert model.forward(tokens, cache).dtype == dtype
+        assert model.forward(tokens[:, :1], cache).dtype == dtype
+        assert all(buffer.dtype == dtype for buffer in cache.keys + cache.values)
@@ -0,0 +1,75 @@
+"""
+Tests of the logit processors in utils/logit_processors.py.
+"""
+
+import numpy as np
+
+from utils.kv_cache import AttentionDecoder
+from utils.logit_processors import (
+    FrequencyPenalty,
+    LogitBias,
+    PresencePenalty,
+    RepetitionPenalty,
+    TokenCounts,
+    create_logit_processors,
+)
+from utils.sampling import sample_decode
+
+
+def test_token_counts_update_add_and_reorder():
+    counts = TokenCounts.from_tokens([[1, 1, 2], [0, 3, 3]], vocab_size=5)
+    np.testing.assert_array_equal(counts.counts, [[0, 2, 1, 0, 0], [1, 0, 0, 2, 0]])
+
+    counts.update(np.array([4, 3]))
+    counts.add(np.array([[2, 2], [0, 1]]))
+    np.testing.assert_array_equal(counts.counts, [[0, 2, 3, 0, 1], [2, 1, 0, 3, 0]])
+
+    counts.reorder([1, 1])
+    np.testing.assert_array_equal(counts.counts, [[2, 1, 0, 3, 0], [2, 1, 0, 3, 0]])
+    np.testing.assert_array_equal(counts.presence()[0], [True, True, False, True, False])
+
+
+def test_repetition_penalty_divides_positive_and_multiplies_negative_logits():
+    logits = np.array([[2.0, -2.0, 2.0, -2.0]])
+    counts = TokenCounts.from_tokens([[0, 1, 1]], vocab_size=4)
+    RepetitionPenalty(2.0)(logits, counts)
+    np.testing.assert_array_equal(logits, [[1.0, -4.0, 2.0, -2.0]])
+
+
+def test_frequency_and_presence_penalties():
+    counts = TokenCounts.from_tokens([[0, 1, 1, 1]], vocab_size=3)
+
+    logits = np.zeros((1, 3), dtype=np.float32)
+    FrequencyPenalty(0.5)(logits, counts)
+    np.testing.assert_array_equal(logits, [[-0.5, -1.5, 0.0]])
+    assert logits.dtype == np.float32
+
+    logits = np.zeros((1, 3))
+    PresencePenalty(0.5)(logits, counts)
+    np.testing.assert_array_equal(logits, [[-0.5, -0.5, 0.0]])
+
+
+def test_logit_bias_and_processor_chain():
+    logits = np.zeros((2, 4))
+    LogitBias({1: 3.0, 3: -100.0})(logits)
+    np.testing.assert_array_equal(logits, [[0, 3, 0, -100]] * 2)
+
+    processors = create_logit_processors(repetition_penalty=1.0, frequency_penalty=0, presence_penalty=1.0,
+                                         logit_bias={2: 1.0})
+    assert [type(processor) for processor in processors] == [PresencePenalty, LogitBias]
+    logits = np.zeros((1, 4))
+    processors(logits, TokenCounts.from_tokens([[2]], vocab_size=4))
+    np.testing.assert_array_equal(logits, [[0, 0, 0, 0]])
+
+
+def test_sample_decode_never_emits_a_banned_token():
+    model = AttentionDecoder(vocab_size=8, d_model=16, num_layers=1, num_heads=2)
+    prompt = np.zeros((4, 3), dtype=np.int64)
+    free = sample_decode(model, prompt, 30, np.random.default_rng(0), temperature=2.0)
+    assert (free["tokens"] == 5).any()
+
+    processors = create_logit_processors(logit_bias={5: -1e9})
+    banned = sample_decode(model, prompt, 30, np.random.default_rng(0), temperature=2.0, processors=processors)
+    assert not (banned["tokens"] == 5).any()
+    # The counts follow the prompt and every generated token
+    assert banned["token_counts"].counts.sum() == 4 * (3 + 30)
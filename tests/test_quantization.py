@@ -0,0 +1,67 @@
+"""
+Tests of weight quantization in utils/quantization.py.
+"""
+
+import itertools
+
+import numpy as np
+
+from utils.quantization import pack_int4, quantization_range, quantize, unpack_int4
+
+GROUP_SIZE = 64
+
+
+def block_scales(quantized):
+    # Scale of every weight of a (rows, columns) matrix quantized along axis 0
+    rows, columns = quantized.shape
+    if quantized.granularity == "tensor":
+        return np.full(quantized.shape, quantized.scales[0])
+    if quantized.granularity == "channel":
+        return np.repeat(quantized.scales[:, np.newaxis], columns, axis=1)
+    return np.repeat(quantized.scales, GROUP_SIZE).reshape(rows, columns)
+
+
+def test_dequantization_error_is_at_most_half_a_step():
+    weights = np.random.default_rng(0).normal(0.2, 1.0, (16, 256)).astype(np.float32)
+    for bits, symmetric, granularity in itertools.product((8, 4), (True, False), ("tensor", "channel", "group")):
+        quantized = quantize(weights, bits, symmetric, granularity, axis=0, group_size=GROUP_SIZE)
+        levels = quantized.levels()
+        lowest, highest = quantization_range(bits, symmetric)
+        assert levels.min() >= lowest and levels.max() <= highest
+
+        dequantized = quantized.dequantize()
+        assert dequantized.shape == weights.shape
+        scales = block_scales(quantized)
+        error = np.abs(dequantized - weights)
+        if symmetric:
+            assert np.all(error <= 0.5 * scales * (1 + 1e-5))
+        else:
+            # The rounded zero point may shift the range by half a step, clipping one end
+            assert np.all(error <= scales * (1 + 1e-5))
+            assert np.mean(error <= 0.5 * scales * (1 + 1e-5)) > 0.99
+
+
+def test_zero_stays_exact():
+    weights = np.random.default_rng(1).normal(size=(8, 64)).astype(np.float32)
+    weights[:, ::5] = 0
+    for bits, symmetric in itertools.product((8, 4), (True, False)):
+        dequantized = quantize(weights, bits, symmetric, "channel").dequantize()
+        assert np.all(dequantized[:, ::5] == 0)
+
+
+def test_int4_packing_round_trip():
+    values = np.random.default_rng(2).integers(-8, 8, 15)
+    packed = pack_int4(values)
+    assert packed.dtype == np.uint8 and len(packed) == 8
+    np.testing.assert_array_equal(unpack_int4(packed, len(values)), values)
+
+    unsigned = np.random.default_rng(3).integers(0, 16, 16)
+    np.testing.assert_array_equal(unpack_int4(pack_int4(unsigned), 16, signed=False), unsigned)
+
+
+def test_nbytes_counts_levels_scales_and_zero_points():
+    weights = np.random.default_rng(4).normal(size=(16, 256)).astype(np.float32)
+    assert quantize(weights, 8, True, "channel").nbytes == 16 * 256 + 16 * 4
+    assert quantize(weights, 4, True, "channel").nbytes == 16 * 256 // 2 + 16 * 4
+    groups = 16 * 256 // GROUP_SIZE
+    assert quantize(weights, 4, False, "group", group_size=GROUP_SIZE).nbytes == 16 * 256 // 2 + groups * 5
@@ -0,0 +1,169 @@
+"""
+Tests of temperature, top-k and top-p sampling in utils/sampling.py.
+"""
+
+import numpy as np
+
+from utils.sampling import (
+    AliasTable,
+    StreamingHistogram,
+    sample_convergence,
+    sample_tokens,
+    softmax,
+    top_k_candidates,
+    top_p_candidates,
+    top_p_nucleus,
+)
+
+DRAWS = 20_000
+
+
+def reference_top_p(logits, p):
+    # Sort-based nucleus: most likely tokens until the cumulative probability reaches p
+    order = np.argsort(-logits, axis=-1, kind="stable")
+    probabilities = softmax(np.take_along_axis(logits, order, axis=-1).astype(np.float64))
+    kept = np.minimum((np.cumsum(probabilities, axis=-1) < p).sum(axis=-1) + 1, logits.shape[-1])
+    return [set(row[:count]) for row, count in zip(order, kept)]
+
+
+def test_top_k_candidates_match_sort():
+    logits = np.random.default_rng(0).standard_normal((20, 500))
+    for k in (1, 7, 500, 800):
+        indices, values = top_k_candidates(logits, k)
+        expected = np.sort(logits, axis=-1)[:, ::-1][:, :k]
+        np.testing.assert_array_equal(values, expected)
+        np.testing.assert_array_equal(np.take_along_axis(logits, indices, axis=-1), values)
+
+
+def test_top_p_candidates_match_sort():
+    rng = np.random.default_rng(1)
+    # Small scales give nuclei beyond the full-sort fraction, large scales a few tokens
+    for scale in (0.3, 2, 8, 30):
+        for vocab in (1, 10, 1000, 5000):
+            logits = rng.standard_normal((30, vocab)) * scale
+            for p in (0.1, 0.5, 0.9, 0.99):
+                indices, values = top_p_candidates(logits, p)
+                kept = [set(row[np.isfinite(row_values)]) for row, row_values in zip(indices, values)]
+                assert kept == reference_top_p(logits, p), (scale, vocab, p)
+                # Kept candidates come first, as the logits of their token ids in decreasing order
+                finite = np.isfinite(values)
+                assert (finite[:, :-1] >= finite[:, 1:]).all()
+                np.testing.assert_array_equal(np.take_along_axis(logits, indices, axis=-1)[finite], values[finite])
+                for row_values, row_finite in zip(values, finite):
+                    assert (np.diff(row_values[row_finite]) <= 0).all()
+
+
+def test_top_p_nucleus_matches_sort():
+    rng = np.random.default_rng(9)
+    # Large scales give small nuclei as candidates, small scales masked whole rows
+    for scale in (0.3, 8):
+        logits = (rng.standard_normal((20, 3000)) * scale).astype(np.float32)
+        indices, values = top_p_nucleus(logits, 0.8)
+        if indices is None:
+            assert values.shape == logits.shape
+            indices = np.broadcast_to(np.arange(logits.shape[-1]), logits.shape)
+        kept = [set(row[np.isfinite(row_values)]) for row, row_values in zip(indices, values)]
+        assert kept == reference_top_p(logits, 0.8), scale
+
+
+def test_samples_stay_in_the_nucleus_and_follow_it():
+    rng = np.random.default_rng(2)
+    row = rng.standard_normal(50) * 2
+    logits = np.tile(row, (DRAWS, 1))
+    settings = [
+        {}, {"temperature": 0.5}, {"top_k": 5}, {"top_p": 0.7}, {"top_k": 8, "top_p": 0.8, "temperature": 1.5},
+    ]
+    for kwargs in settings:
+        temperature = kwargs.get("temperature", 1.0)
+        probabilities = softmax(row / temperature)
+        order = np.argsort(-probabilities)
+        kept = np.ones(len(row), dtype=bool)
+        if "top_k" in kwargs:
+            kept[order[kwargs["top_k"]:]] = False
+        if "top_p" in kwargs:
+            nucleus = np.where(kept, probabilities, 0)
+            nucleus /= nucleus.sum()
+            count = (np.cumsum(nucleus[order]) < kwargs["top_p"]).sum() + 1
+            kept[order[count:]] = False
+        expected = np.where(kept, probabilities, 0)
+        expected /= expected.sum()
+
+        counts = np.bincount(sample_tokens(logits, rng, **kwargs), minlength=len(row))
+        assert counts[~kept].sum() == 0, kwargs
+        assert 0.5 * np.abs(counts / DRAWS - expected).sum() < 0.03, kwargs
+
+
+def test_zero_temperature_is_greedy():
+    logits = np.random.default_rng(3).standard_normal((10, 30))
+    rng = np.random.default_rng(0)
+    np.testing.assert_array_equal(sample_tokens(logits, rng, temperature=0), logits.argmax(axis=-1))
+    temperatures = np.array([0, 1] * 5)
+    tokens = sample_tokens(logits, rng, temperature=temperatures, top_p=0.9)
+    np.testing.assert_array_equal(tokens[temperatures == 0], logits[temperatures == 0].argmax(axis=-1))
+
+
+def test_integer_logits_keep_fractional_temperatures():
+    rng = np.random.default_rng(4)
+    logits = np.arange(4)
+    counts = np.bincount([sample_tokens(logits, rng, temperature=0.5) for _ in range(4000)], minlength=4)
+    # Truncating 0.5 to an integer temperature of 0 would always pick token 3
+    assert 0.5 * np.abs(counts / 4000 - softmax(logits / 0.5)).sum() < 0.03
+
+
+def alias_probabilities(table):
+    # Probability of every token implied by the keep/alias columns
+    count, vocab = table.keep.shape
+    implied = np.zeros((count, vocab))
+    for row in range(count):
+        np.add.at(implied[row], np.arange(vocab), table.keep[row])
+        np.add.at(implied[row], table.alias[row], 1 - table.keep[row])
+    return implied / vocab
+
+
+def test_alias_table_is_exact():
+    rng = np.random.default_rng(5)
+    for vocab in (1, 2, 7, 100, 1000):
+        probabilities = rng.random((10, vocab)) ** rng.uniform(0.2, 8, (10, 1))
+        table = AliasTable(probabilities)
+        expected = probabilities / probabilities.sum(axis=-1, keepdims=True)
+        np.testing.assert_allclose(alias_probabilities(table), expected, rtol=0, atol=1e-12)
+
+
+def test_alias_table_never_draws_zero_probability_tokens():
+    rng = np.random.default_rng(6)
+    probabilities = rng.random((20, 300))
+    probabilities[rng.random((20, 300)) < 0.7] = 0
+    probabilities[:, 0] += 0.01
+    table = AliasTable(probabilities)
+    assert (alias_probabilities(table)[probabilities == 0] == 0).all()
+
+    tokens = table.sample(rng, 50_000)
+    assert (np.take_along_axis(probabilities, tokens, axis=-1) > 0).all()
+
+
+def test_alias_draws_converge_to_the_distribution():
+    rng = np.random.default_rng(7)
+    probabilities = softmax(rng.standard_normal((3, 50)) * 2)
+    table = AliasTable(probabilities)
+    histogram = StreamingHistogram(3, 50)
+    for _ in range(4):
+        histogram.update(table.sample(rng, 25_000))
+    assert (histogram.total == 100_000).all()
+    assert (histogram.total_variation(probabilities) < 0.02).all()
+
+    single = AliasTable(probabilities[0]).sample(rng, 10)
+    assert single.shape == (10,)
+
+
+def test_sample_convergence_bounds_the_draws_of_a_chunk():
+    rng = np.random.default_rng(8)
+    probabilities = softmax(rng.standard_normal((100, 20)))
+    table = AliasTable(probabilities)
+    sizes = []
+    sample = table.sample
+    table.sample = lambda rng, size: sizes.append(size) or sample(rng, size)
+
+    result = sample_convergence(table, rng, [30, 100], chunk_size=1000)
+    assert max(sizes) * 100 <= 1000 and sum(sizes) == 100
+    assert [report["draws"] for report in result["reports"]] == [30, 100]
+    assert (result["histogram"].total == 100).all()
@@ -0,0 +1,58 @@
+"""
+Tests of speculative decoding in utils/speculative_decoding.py.
+"""
+
+import numpy as np
+
+from utils.kv_cache import AttentionDecoder, greedy_decode
+from utils.speculative_decoding import create_draft_model, speculative_decode, token_probabilities
+
+RUNS = 6000
+TEMPERATURE = 1.5
+
+
+def create_models():
+    target = AttentionDecoder(vocab_size=6, d_model=16, num_layers=3, num_heads=2, dtype=np.float64)
+    return target, create_draft_model(target, num_layers=1)
+
+
+def test_greedy_speculative_decoding_matches_the_target():
+    target, draft = create_models()
+    prompt = np.array([1, 4, 2])
+    expected = greedy_decode(target, prompt[np.newaxis], 12)["tokens"][0]
+    for num_draft_tokens in (1, 3, 8):
+        result = speculative_decode(target, draft, prompt, 12, np.random.default_rng(0), num_draft_tokens,
+                                    temperature=0)
+        np.testing.assert_array_equal(result["tokens"], expected)
+        assert result["target_calls"] == result["rounds"] <= 12
+
+
+def test_sampled_tokens_follow_the_target_distribution():
+    target, draft = create_models()
+    prompt = np.array([3, 0])
+    vocab = target.vocab_size
+
+    # Exact joint distribution of the first two tokens under the target model
+    first = token_probabilities(target.forward(prompt[np.newaxis], target.create_cache())[0, -1], TEMPERATURE)
+    expected = np.empty((vocab, vocab))
+    for token in range(vocab):
+        logits = target.forward(np.append(prompt, token)[np.newaxis], target.create_cache())[0, -1]
+        expected[token] = first[token] * token_probabilities(logits, TEMPERATURE)
+
+    # The first round proposes one draft token, then adds a corrected or bonus token
+    rng = np.random.default_rng(1)
+    counts = np.zeros((vocab, vocab))
+    for _ in range(RUNS):
+        result = speculative_decode(target, draft, prompt, 2, rng, num_draft_tokens=4, temperature=TEMPERATURE)
+        tokens = result["tokens"]
+        counts[tokens[0], tokens[1]] += 1
+    assert 0.5 * np.abs(counts / RUNS - expected).sum() < 0.05
+
+
+def test_statistics_are_consistent():
+    target, draft = create_models()
+    result = speculative_decode(target, draft, [1, 2], 20, np.random.default_rng(2), num_draft_tokens=3)
+    assert len(result["tokens"]) == 20
+    assert result["accepted"] <= result["proposed"]
+    # Every round adds its accepted proposals plus one token from the target
+    assert result["accepted"] + result["rounds"] == 20
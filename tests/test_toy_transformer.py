@@ -0,0 +1,57 @@
+"""
+Tests of the transformer inference engine in utils/toy_transformer.py.
+"""
+
+import numpy as np
+
+from utils import toy_transformer
+from utils.data_generators import calculate_multi_head_attention
+from utils.toy_transformer import ToyTransformer, create_toy_weights
+
+
+def create_model():
+    return ToyTransformer(create_toy_weights(vocab_size=40, d_model=32, num_layers=2, num_heads=4, num_kv_heads=2,
+                                             max_length=64))
+
+
+def test_npz_round_trip_gives_the_same_logits(tmp_path):
+    model = create_model()
+    path = tmp_path / "toy.npz"
+    model.save_npz(path)
+    loaded = ToyTransformer.from_npz(path)
+
+    tokens = np.random.default_rng(0).integers(0, model.vocab_size, (2, 10))
+    expected = model.forward(tokens, model.create_cache(2))
+    np.testing.assert_array_equal(loaded.forward(tokens, loaded.create_cache(2)), expected)
+    assert (loaded.num_heads, loaded.num_kv_heads, len(loaded.layers)) == (4, 2, 2)
+
+
+def test_incremental_decoding_matches_full_forward():
+    model = create_model()
+    tokens = np.random.default_rng(1).integers(0, model.vocab_size, (2, 12))
+    full = model.forward(tokens, model.create_cache(2))
+
+    cache = model.create_cache(2, capacity=1)
+    steps = [model.forward(tokens[:, :4], cache)]
+    steps += [model.forward(tokens[:, i:i + 1], cache) for i in range(4, 12)]
+    np.testing.assert_allclose(np.concatenate(steps, axis=1), full, rtol=1e-4, atol=1e-4)
+
+
+def test_forward_stays_float32(monkeypatch):
+    model = create_model()
+    attention_dtypes = []
+
+    def recording_attention(Q, K, V, **kwargs):
+        output = calculate_multi_head_attention(Q, K, V, **kwargs)
+        attention_dtypes.append((Q.dtype, K.dtype, V.dtype, output.dtype))
+        return output
+
+    monkeypatch.setattr(toy_transformer, "calculate_multi_head_attention", recording_attention)
+    cache = model.create_cache(2, capacity=1)
+    queries = []
+    logits = model.forward(np.random.default_rng(2).integers(0, model.vocab_size, (2, 6)), cache, queries)
+
+    assert logits.dtype == np.float32
+    assert all(query.dtype == np.float32 for query in queries)
+    assert attention_dtypes and all(dtype == np.float32 for dtypes in attention_dtypes for dtype in dtypes)
+    assert all(buffer.dtype == np.float32 for buffer in cache.keys + cache.values)
@@ -0,0 +1,167 @@
+"""
+LLM Explained - Dry run
+Runs the construct() of every scene with the null renderer: animations jump
+to their final state and nothing is rasterized or encoded. Reports exceptions,
+construction time and final mobject counts in a few seconds, which makes it
+usable as a pre-commit hook after refactoring utils/custom_scenes.py.
+
+To check every scene in slides.ALL_SCENES:
+    python -m tools.dry_run
+
+To check some scenes with four worker processes:
+    python -m tools.dry_run --jobs 4 Slide1_TitleIntroduction Slide2_CommunicationRules
+"""
+
+import argparse
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from render import QUALITIES, find_scene_class
+from utils.metrics_store import record_metrics
+
+# Pixel size does not matter without rasterization, the smallest camera is cheapest
+DRY_RUN_QUALITY = "l"
+
+
+def dry_run_scene(scene_name, quality=DRY_RUN_QUALITY, slide_observers=()):
+    """
+    Runs the construct() of a scene without rendering it.
+
+    Args:
+        scene_name: Scene class name
+        quality: Quality flag letter (l, m, h, p, k), sets the camera size
+        slide_observers: Callbacks called with (scene, slide_index) at the end of each slide
+
+    Returns:
+        Dictionary with the scene name, error traceback (None on success),
+        construction time, play, slide and mobject counts
+    """
+    from manim import tempconfig
+
+    from utils.renderer import NullRenderer
+
+    result = {
+        "scene": scene_name,
+        "error": None,
+        "construct_seconds": None,
+        "plays": 0,
+        "slides": 0,
+        "mobjects": 0,
+        "family_mobjects": 0,
+    }
+    manim_config = {
+        "quality": QUALITIES[quality],
+        "dry_run": True,
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+    }
+    with tempconfig(manim_config):
+        scene_class = find_scene_class(scene_name)
+        start = time.perf_counter()
+        try:
+            scene = scene_class(renderer=NullRenderer(slide_observers))
+            scene.render()
+        except Exception:
+            result["error"] = traceback.format_exc()
+            result["construct_seconds"] = time.perf_counter() - start
+            return result
+        result["construct_seconds"] = time.perf_counter() - start
+
+    result["plays"] = scene.renderer.num_plays
+    result["slides"] = scene.renderer.slide_count
+    result["mobjects"] = len(scene.mobjects)
+    result["family_mobjects"] = len(scene.get_mobject_family_members())
+    return result
+
+
+def run_scenes(task, scene_names, jobs=None):
+    """
+    Runs a per-scene task over scenes in worker processes.
+
+    Args:
+        task: Picklable callable taking a scene name (use functools.partial for extra arguments)
+        scene_names: Scene class names
+        jobs: Number of worker processes (default: one per CPU core)
+
+    Returns:
+        List of task results, in the order of scene_names
+    """
+    jobs = min(jobs or os.cpu_count() or 1, len(scene_names))
+    if jobs <= 1:
+        return [task(name) for name in scene_names]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(task, scene_names))
+
+
+def format_results(results):
+    """
+    Formats dry run results as a text table.
+
+    Args:
+        results: List of dry_run_scene() dictionaries
+
+    Returns:
+        Report string
+    """
+    header = f"{'Scene':<40} {'Status':<6} {'Time (ms)':>10} {'Plays':>6} {'Slides':>7} {'Mobjects':>9} {'Family':>7}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        status = "FAIL" if result["error"] else "ok"
+        lines.append(
+            f"{result['scene']:<40} {status:<6} {result['construct_seconds'] * 1000:>10.1f} "
+            f"{result['plays']:>6} {result['slides']:>7} {result['mobjects']:>9} {result['family_mobjects']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run every scene without rendering.")
+    parser.add_argument("scenes", nargs="*", help="Scene names (default: every scene in slides.ALL_SCENES)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Worker processes (default: one per CPU core)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Only print failures")
+    parser.add_argument("--no-metrics", action="store_true",
+                        help="Do not append construction times to the metrics history")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.scenes:
+        scene_names = args.scenes
+    else:
+        from slides import SCENE_NAMES
+        scene_names = SCENE_NAMES
+
+    start = time.perf_counter()
+    results = run_scenes(dry_run_scene, scene_names, args.jobs)
+    failed = [result for result in results if result["error"]]
+    if not args.no_metrics:
+        record_metrics("dry_run", [
+            {
+                "scene": result["scene"],
+                "wall_seconds": result["construct_seconds"],
+                "extra": {key: result[key] for key in ("plays", "slides", "mobjects", "family_mobjects")},
+            }
+            for result in results if not result["error"]
+        ], QUALITIES[DRY_RUN_QUALITY])
+
+    if not args.quiet:
+        print(format_results(results))
+        print()
+    for result in failed:
+        print(f"{result['scene']} failed:\n{result['error']}", file=sys.stderr)
+    print(
+        f"Checked {len(results)} scene(s) in {time.perf_counter() - start:.1f}s, "
+        f"{len(failed)} failed"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
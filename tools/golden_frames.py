@@ -0,0 +1,335 @@
+"""
+LLM Explained - Golden frames
+Visual regression check without storing videos. The storyboard frame at the
+end of every slide is rasterized at low resolution during a dry run, reduced
+to a 64-bit perceptual hash (DCT pHash) and compared with the golden hashes
+committed in tools/golden_hashes.json. Slides whose hash distance exceeds the
+threshold are flagged and written as side-by-side diff images.
+
+To check every scene in slides.ALL_SCENES:
+    python -m tools.golden_frames
+
+To accept the current frames as the new golden hashes:
+    python -m tools.golden_frames --update
+
+--update also writes low-resolution golden thumbnails to
+tools/golden_thumbnails/, committed with the hashes, which diff images show
+next to the current frame. Without a thumbnail, diff images show the current
+frame and the differing hash bits, computed from the stored hashes alone.
+
+Scenes without golden hashes fail the check, so it never passes with
+nothing to compare against. To only warn about them, e.g. for a new scene
+whose hashes will be recorded with --update:
+    python -m tools.golden_frames --allow-missing
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from functools import partial
+
+import numpy as np
+
+from tools.dry_run import dry_run_scene, run_scenes
+
+GOLDEN_HASHES_PATH = os.path.join(os.path.dirname(__file__), "golden_hashes.json")
+THUMBNAIL_DIR = os.path.join(os.path.dirname(__file__), "golden_thumbnails")
+DIFF_DIR = os.path.join("media", "golden_diffs")
+
+# Storyboard frames are rasterized at 480p and stored as 320x180 thumbnails
+GOLDEN_QUALITY = "l"
+THUMBNAIL_SIZE = (320, 180)
+
+# pHash: low 8x8 DCT coefficients of a 32x32 grayscale image
+HASH_SIZE = 8
+HASH_IMAGE_SIZE = 32
+
+# Hamming distance (out of 64 bits) above which a slide is flagged
+DEFAULT_THRESHOLD = 6
+
+
+def _dct_matrix(size):
+    k = np.arange(size)[:, np.newaxis]
+    i = np.arange(size)[np.newaxis, :]
+    return np.cos(np.pi * (2 * i + 1) * k / (2 * size))
+
+
+_DCT = _dct_matrix(HASH_IMAGE_SIZE)
+
+
+def perceptual_hash(image):
+    """
+    Computes the DCT perceptual hash of an image.
+
+    Args:
+        image: PIL image
+
+    Returns:
+        Hash as a 16-character hex string
+    """
+    from PIL import Image
+
+    gray = image.convert("L").resize((HASH_IMAGE_SIZE, HASH_IMAGE_SIZE), Image.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.float64)
+    low = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    bits = low > np.median(low)
+    return np.packbits(bits.flatten()).tobytes().hex()
+
+
+def hash_distance(first, second):
+    """
+    Returns the number of differing bits between two hashes.
+
+    Args:
+        first: Hex hash
+        second: Hex hash
+
+    Returns:
+        Hamming distance
+    """
+    return bin(int(first, 16) ^ int(second, 16)).count("1")
+
+
+def capture_frame(scene):
+    """
+    Rasterizes the current state of a scene with its camera.
+
+    Args:
+        scene: Scene run by the null renderer
+
+    Returns:
+        PIL image
+    """
+    camera = scene.renderer.camera
+    camera.reset()
+    camera.capture_mobjects(scene.mobjects + [mob for mob in scene.foreground_mobjects if mob not in scene.mobjects])
+    return camera.get_image()
+
+
+def _hash_bits_image(first, second, size):
+    from PIL import Image
+
+    first_bits = np.unpackbits(np.frombuffer(bytes.fromhex(first), dtype=np.uint8))
+    second_bits = np.unpackbits(np.frombuffer(bytes.fromhex(second), dtype=np.uint8))
+    # Grey for matching bits, red for differing bits
+    pixels = np.full((HASH_SIZE * HASH_SIZE, 3), 64, dtype=np.uint8)
+    pixels[first_bits != second_bits] = (220, 40, 40)
+    image = Image.fromarray(pixels.reshape(HASH_SIZE, HASH_SIZE, 3))
+    return image.resize(size, Image.NEAREST)
+
+
+def write_diff_image(path, current, golden_hash, current_hash, golden=None):
+    """
+    Writes a side-by-side diff image: golden thumbnail, current frame and
+    their difference, or the current frame and the differing hash bits when
+    no golden thumbnail is available.
+
+    Args:
+        path: Output PNG path
+        current: Current thumbnail (PIL image)
+        golden_hash: Golden hex hash
+        current_hash: Current hex hash
+        golden: Golden thumbnail (PIL image) or None
+    """
+    from PIL import Image, ImageChops
+
+    current = current.convert("RGB")
+    if golden is not None:
+        golden = golden.convert("RGB").resize(current.size)
+        panels = [golden, current, ImageChops.difference(golden, current)]
+    else:
+        panels = [current, _hash_bits_image(golden_hash, current_hash, (current.height, current.height))]
+
+    width = sum(panel.width for panel in panels)
+    diff = Image.new("RGB", (width, current.height))
+    x = 0
+    for panel in panels:
+        diff.paste(panel, (x, 0))
+        x += panel.width
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    diff.save(path)
+
+
+class StoryboardHasher:
+    """
+    Slide observer hashing the storyboard frame at the end of every slide and
+    comparing it with the golden hashes of the scene.
+    """
+
+    def __init__(self, scene_name, golden_hashes, threshold=DEFAULT_THRESHOLD, update=False):
+        self.scene_name = scene_name
+        self.golden_hashes = golden_hashes or []
+        self.threshold = threshold
+        self.update = update
+        self.hashes = []
+        self.flagged = []
+
+    def __call__(self, scene, slide_index):
+        from PIL import Image
+
+        thumbnail = capture_frame(scene).resize(THUMBNAIL_SIZE, Image.LANCZOS)
+        current_hash = perceptual_hash(thumbnail)
+        self.hashes.append(current_hash)
+        golden_path = thumbnail_path(self.scene_name, slide_index)
+
+        if self.update:
+            os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+            thumbnail.save(golden_path, optimize=True)
+            return
+
+        if slide_index >= len(self.golden_hashes):
+            self.flagged.append({"slide": slide_index, "distance": None, "diff": None})
+            return
+
+        golden_hash = self.golden_hashes[slide_index]
+        distance = hash_distance(golden_hash, current_hash)
+        if distance <= self.threshold:
+            return
+
+        golden = Image.open(golden_path) if os.path.exists(golden_path) else None
+        diff_path = os.path.join(DIFF_DIR, f"{self.scene_name}_{slide_index:03}.png")
+        write_diff_image(diff_path, thumbnail, golden_hash, current_hash, golden)
+        self.flagged.append({"slide": slide_index, "distance": distance, "diff": diff_path})
+
+
+def thumbnail_path(scene_name, slide_index):
+    """Returns the path of a slide's golden thumbnail."""
+    return os.path.join(THUMBNAIL_DIR, f"{scene_name}_{slide_index:03}.png")
+
+
+def remove_stale_thumbnails(scene_name, slide_count):
+    """
+    Deletes the golden thumbnails of slides a scene no longer has.
+
+    Args:
+        scene_name: Scene class name
+        slide_count: Current number of slides
+    """
+    for path in glob.glob(os.path.join(THUMBNAIL_DIR, f"{scene_name}_*.png")):
+        index = os.path.basename(path)[len(scene_name) + 1:-len(".png")]
+        if index.isdigit() and int(index) >= slide_count:
+            os.remove(path)
+
+
+def check_scene(scene_name, golden, threshold=DEFAULT_THRESHOLD, update=False):
+    """
+    Hashes the storyboard frames of a scene and compares them with its golden hashes.
+
+    Args:
+        scene_name: Scene class name
+        golden: Dictionary mapping scene names to golden hex hashes, one per slide
+        threshold: Maximum hash distance of an unchanged slide
+        update: Whether to save golden thumbnails instead of comparing
+
+    Returns:
+        Dictionary with the scene name, error traceback, current hashes and flagged slides
+    """
+    golden_hashes = golden.get(scene_name)
+    hasher = StoryboardHasher(scene_name, golden_hashes, threshold, update)
+    result = dry_run_scene(scene_name, GOLDEN_QUALITY, slide_observers=[hasher])
+    flagged = hasher.flagged
+    if update and result["error"] is None:
+        remove_stale_thumbnails(scene_name, len(hasher.hashes))
+    if not update and golden_hashes is not None and len(hasher.hashes) < len(golden_hashes):
+        # Slides that no longer exist
+        flagged += [
+            {"slide": index, "distance": None, "diff": None}
+            for index in range(len(hasher.hashes), len(golden_hashes))
+        ]
+    return {"scene": scene_name, "error": result["error"], "hashes": hasher.hashes, "flagged": flagged}
+
+
+def load_golden_hashes(path=GOLDEN_HASHES_PATH):
+    """
+    Loads the golden hashes file.
+
+    Args:
+        path: JSON file path
+
+    Returns:
+        Dictionary mapping scene names to lists of hex hashes
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as golden_file:
+        return json.load(golden_file)["scenes"]
+
+
+def save_golden_hashes(scenes, path=GOLDEN_HASHES_PATH):
+    """
+    Saves the golden hashes file.
+
+    Args:
+        scenes: Dictionary mapping scene names to lists of hex hashes
+        path: JSON file path
+    """
+    with open(path, "w") as golden_file:
+        json.dump({"quality": GOLDEN_QUALITY, "scenes": dict(sorted(scenes.items()))}, golden_file, indent=2)
+        golden_file.write("\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare storyboard frames with golden perceptual hashes.")
+    parser.add_argument("scenes", nargs="*", help="Scene names (default: every scene in slides.ALL_SCENES)")
+    parser.add_argument("--update", action="store_true",
+                        help="Accept the current frames as golden hashes")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="Only warn about scenes without golden hashes instead of failing")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help="Maximum hash distance of an unchanged slide (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Worker processes (default: one per CPU core)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.scenes:
+        scene_names = args.scenes
+    else:
+        from slides import SCENE_NAMES
+        scene_names = SCENE_NAMES
+
+    golden = load_golden_hashes()
+    start = time.perf_counter()
+    task = partial(check_scene, golden=golden, threshold=args.threshold, update=args.update)
+    results = run_scenes(task, scene_names, args.jobs)
+
+    failed = [result for result in results if result["error"]]
+    for result in failed:
+        print(f"{result['scene']}: FAILED\n{result['error']}", file=sys.stderr)
+
+    if args.update:
+        for result in results:
+            if not result["error"]:
+                golden[result["scene"]] = result["hashes"]
+        save_golden_hashes(golden)
+        print(f"Updated golden hashes of {len(results) - len(failed)} scene(s) in {time.perf_counter() - start:.1f}s")
+        return 1 if failed else 0
+
+    flagged = 0
+    missing = 0
+    for result in results:
+        if result["scene"] not in golden:
+            label = "Warning" if args.allow_missing else "Error"
+            print(f"{label}: {result['scene']}: no golden hashes, run with --update", file=sys.stderr)
+            missing += 1
+            continue
+        for slide in result["flagged"]:
+            flagged += 1
+            if slide["distance"] is None:
+                print(f"{result['scene']} slide {slide['slide']}: slide added or removed")
+            else:
+                print(f"{result['scene']} slide {slide['slide']}: distance {slide['distance']}, see {slide['diff']}")
+
+    print(f"Checked {len(results)} scene(s) in {time.perf_counter() - start:.1f}s: "
+          f"{flagged} flagged, {len(failed)} failed, {missing} without golden hashes")
+    return 1 if flagged or failed or (missing and not args.allow_missing) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
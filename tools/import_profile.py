@@ -0,0 +1,224 @@
+"""
+LLM Explained - Import time profiler
+Imports each module in a fresh interpreter with `python -X importtime`,
+prints the cumulative import tree and fails when a module exceeds its
+startup budget or pulls in a dependency it must not need (e.g. manim for
+utils.data_generators).
+
+To check every budgeted module:
+    python -m tools.import_profile
+
+To show the import tree of slides.py down to 10 ms:
+    python -m tools.import_profile slides --min-ms 10 --depth 4
+
+To try a tighter budget:
+    python -m tools.import_profile --budget slides=2.5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import seconds allowed per module (fresh interpreter, best of --repeat)
+IMPORT_BUDGETS = {
+    "utils.data_generators": 0.3,
+    "render": 0.3,
+    "utils.custom_scenes": 3.0,
+    "slides": 4.0,
+}
+
+# Packages a module must not import, directly or indirectly
+FORBIDDEN_IMPORTS = {
+    "utils.data_generators": ("manim", "manim_slides", "cairo"),
+    "render": ("manim", "manim_slides", "cairo", "numpy"),
+}
+
+
+class ImportNode:
+    """
+    One module of an -X importtime tree.
+    """
+
+    def __init__(self, name, self_us, cumulative_us):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.children = []
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def parse_importtime(output):
+    """
+    Parses the stderr of `python -X importtime`.
+
+    Modules are printed after their own imports, indented two spaces per
+    nesting level, so children are collected until their parent appears.
+
+    Args:
+        output: stderr text
+
+    Returns:
+        List of top-level ImportNode, in import order
+    """
+    pending = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        node = ImportNode(name.strip(), int(self_us), int(cumulative_us))
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def profile_import(module, python=sys.executable):
+    """
+    Imports a module in a fresh interpreter.
+
+    Args:
+        module: Module name
+        python: Interpreter path
+
+    Returns:
+        ImportNode of the module
+    """
+    process = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {process.stderr.splitlines()[-1]}")
+    for node in parse_importtime(process.stderr):
+        if node.name == module:
+            return node
+    raise RuntimeError(f"import {module} printed no import time")
+
+
+def best_profile(module, repeat=3):
+    """Returns the fastest of several import profiles (the others include disk cache misses)."""
+    return min((profile_import(module) for _ in range(repeat)), key=lambda node: node.cumulative_us)
+
+
+def forbidden_imports(node, forbidden):
+    """
+    Lists the forbidden packages a module imported.
+
+    Args:
+        node: ImportNode of the module
+        forbidden: Package names
+
+    Returns:
+        Sorted list of module names
+    """
+    return sorted({
+        child.name for child in node.walk()
+        if child.name.split(".")[0] in forbidden
+    })
+
+
+def format_tree(node, min_ms=5.0, max_depth=3, depth=0):
+    """
+    Formats an import tree, most expensive imports first.
+
+    Args:
+        node: ImportNode
+        min_ms: Hide imports with a smaller cumulative time
+        max_depth: Deepest nesting level shown
+        depth: Nesting level of node
+
+    Returns:
+        List of lines
+    """
+    lines = [
+        f"{node.cumulative_us / 1000:>10.1f}ms {node.self_us / 1000:>9.1f}ms  {'  ' * depth}{node.name}"
+    ]
+    if depth < max_depth:
+        for child in sorted(node.children, key=lambda child: child.cumulative_us, reverse=True):
+            if child.cumulative_us / 1000 >= min_ms:
+                lines += format_tree(child, min_ms, max_depth, depth + 1)
+    return lines
+
+
+def format_top_self(node, limit=15):
+    """Formats the modules with the highest self time (their own top-level code)."""
+    nodes = sorted(node.walk(), key=lambda child: child.self_us, reverse=True)[:limit]
+    return [f"{child.self_us / 1000:>10.1f}ms  {child.name}" for child in nodes]
+
+
+def parse_budget(text):
+    module, _, seconds = text.partition("=")
+    if not seconds:
+        raise argparse.ArgumentTypeError("expected MODULE=SECONDS")
+    return module, float(seconds)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Profile module import times against startup budgets.")
+    parser.add_argument("modules", nargs="*",
+                        help="Modules to import (default: every module with a budget)")
+    parser.add_argument("--budget", type=parse_budget, action="append", default=[], metavar="MODULE=SECONDS",
+                        help="Override or add a budget")
+    parser.add_argument("-n", "--repeat", type=int, default=3,
+                        help="Imports per module, the fastest is reported (default: %(default)s)")
+    parser.add_argument("--min-ms", type=float, default=5.0,
+                        help="Hide imports faster than this (default: %(default)s)")
+    parser.add_argument("--depth", type=int, default=3,
+                        help="Deepest nesting level shown (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=15,
+                        help="Modules listed by self time (default: %(default)s)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Only print the budget summary")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    budgets = dict(IMPORT_BUDGETS)
+    budgets.update(args.budget)
+    modules = args.modules or list(budgets)
+
+    failures = []
+    summary = []
+    for module in modules:
+        try:
+            node = best_profile(module, args.repeat)
+        except RuntimeError as error:
+            failures.append(module)
+            summary.append(f"{module:<30} ERROR {error}")
+            continue
+
+        if not args.quiet:
+            print(f"== {module}")
+            print(f"{'cumulative':>12} {'self':>11}  module")
+            print("\n".join(format_tree(node, args.min_ms, args.depth)))
+            print("-- top self time")
+            print("\n".join(format_top_self(node, args.top)))
+            print()
+
+        seconds = node.cumulative_us / 1e6
+        budget = budgets.get(module)
+        status = "ok"
+        if budget is not None and seconds > budget:
+            status = "OVER BUDGET"
+        forbidden = forbidden_imports(node, FORBIDDEN_IMPORTS.get(module, ()))
+        if forbidden:
+            status = f"IMPORTS {', '.join(forbidden[:3])}{'...' if len(forbidden) > 3 else ''}"
+        if status != "ok":
+            failures.append(module)
+        limit = f"{budget:.2f}s" if budget is not None else "-"
+        summary.append(f"{module:<30} {seconds:>7.3f}s  budget {limit:>6}  {status}")
+
+    print("\n".join(summary))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+"""
+LLM Explained - Layout linter
+Inspects the storyboard state at the end of every slide (through the dry run,
+without rendering) and reports:
+- text extending outside the frame
+- text overlapping other text
+- text rendered smaller than a minimum pixel size at a given quality
+
+Glyph bounding boxes of every visible text are put into a uniform grid index,
+so overlap checks stay linear in the number of glyphs on crowded slides.
+
+To lint every scene in slides.ALL_SCENES for 1080p:
+    python -m tools.layout_lint
+
+To lint some scenes for a 480p preview with a 10 pixel minimum:
+    python -m tools.layout_lint -q l --min-pixels 10 Slide9_ChatGPTInternetAccess
+"""
+
+import argparse
+import json
+import math
+import sys
+from collections import defaultdict
+from functools import partial
+
+import numpy as np
+
+from render import QUALITIES
+from tools.dry_run import dry_run_scene, run_scenes
+
+# Minimum height of the tallest glyph of a text, in pixels
+DEFAULT_MIN_PIXELS = 12
+
+# Overlaps and overflows smaller than this (frame units) are antialiasing noise
+LAYOUT_TOLERANCE = 0.02
+
+# Grid cell size in frame units, about the height of a line of body text
+GRID_CELL_SIZE = 0.5
+
+
+class GridIndex:
+    """
+    Uniform grid spatial index of axis-aligned boxes.
+    Every box is registered in each cell it touches, so only boxes sharing a
+    cell are compared when looking for intersections.
+    """
+
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.boxes = []
+        self.cells = defaultdict(list)
+
+    def _cells(self, box):
+        x0, y0, x1, y1 = (math.floor(value / self.cell_size) for value in box)
+        for cell_x in range(x0, x1 + 1):
+            for cell_y in range(y0, y1 + 1):
+                yield cell_x, cell_y
+
+    def insert(self, box):
+        """
+        Adds a box to the index.
+
+        Args:
+            box: Tuple (x0, y0, x1, y1)
+
+        Returns:
+            Index of the box
+        """
+        index = len(self.boxes)
+        self.boxes.append(box)
+        for cell in self._cells(box):
+            self.cells[cell].append(index)
+        return index
+
+    def intersecting_pairs(self, tolerance=0.0):
+        """
+        Finds every pair of boxes overlapping by more than a tolerance on both axes.
+
+        Args:
+            tolerance: Minimum overlap width and height
+
+        Returns:
+            Set of (i, j) index pairs with i < j
+        """
+        pairs = set()
+        for members in self.cells.values():
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    pair = (i, j) if i < j else (j, i)
+                    if pair not in pairs and _overlap(self.boxes[i], self.boxes[j], tolerance):
+                        pairs.add(pair)
+        return pairs
+
+
+def _overlap(first, second, tolerance):
+    width = min(first[2], second[2]) - max(first[0], second[0])
+    height = min(first[3], second[3]) - max(first[1], second[1])
+    return width > tolerance and height > tolerance
+
+
+def _is_text(mob):
+    from manim import MarkupText, Paragraph, SingleStringMathTex, Text
+
+    return isinstance(mob, (Text, MarkupText, Paragraph, SingleStringMathTex))
+
+
+def _is_visible(mob):
+    fill = getattr(mob, "fill_rgbas", None)
+    stroke = getattr(mob, "stroke_rgbas", None)
+    return (
+        (fill is not None and len(fill) and fill[:, 3].max() > 0)
+        or (stroke is not None and len(stroke) and stroke[:, 3].max() > 0)
+    )
+
+
+def _text_label(mob):
+    label = getattr(mob, "text", None) or getattr(mob, "tex_string", None) or type(mob).__name__
+    label = " ".join(str(label).split())
+    return label if len(label) <= 40 else label[:37] + "..."
+
+
+def find_texts(mobjects):
+    """
+    Finds the outermost text mobjects below a list of mobjects.
+
+    Args:
+        mobjects: Top-level scene mobjects
+
+    Returns:
+        List of text mobjects (Text, MarkupText, Paragraph, MathTex parts)
+    """
+    texts = []
+    stack = list(reversed(mobjects))
+    seen = set()
+    while stack:
+        mob = stack.pop()
+        if id(mob) in seen:
+            continue
+        seen.add(id(mob))
+        if _is_text(mob):
+            texts.append(mob)
+        else:
+            stack.extend(reversed(mob.submobjects))
+    return texts
+
+
+def glyph_boxes(text):
+    """
+    Returns the bounding boxes of the visible glyphs of a text.
+
+    Args:
+        text: Text mobject
+
+    Returns:
+        Array of shape (n, 4) with x0, y0, x1, y1 per glyph
+    """
+    boxes = [
+        (mob.points[:, 0].min(), mob.points[:, 1].min(), mob.points[:, 0].max(), mob.points[:, 1].max())
+        for mob in text.get_family()
+        if len(mob.points) and _is_visible(mob)
+    ]
+    return np.array(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def lint_slide(scene, slide_index, min_pixels=DEFAULT_MIN_PIXELS):
+    """
+    Lints the layout of the current state of a scene.
+
+    Args:
+        scene: Scene at the end of a slide
+        slide_index: Index of the slide in the scene
+        min_pixels: Minimum height of the tallest glyph of a text, in pixels
+
+    Returns:
+        List of finding dictionaries (kind, slide, text, detail)
+    """
+    camera = scene.renderer.camera
+    pixels_per_unit = camera.pixel_height / camera.frame_height
+    center = camera.frame_center
+    frame = (
+        center[0] - camera.frame_width / 2,
+        center[1] - camera.frame_height / 2,
+        center[0] + camera.frame_width / 2,
+        center[1] + camera.frame_height / 2,
+    )
+
+    findings = []
+    index = GridIndex()
+    owners = []
+    labels = []
+    for text in find_texts(scene.mobjects):
+        boxes = glyph_boxes(text)
+        if not len(boxes):
+            continue
+        text_id = len(labels)
+        labels.append(_text_label(text))
+
+        x0, y0 = boxes[:, 0].min(), boxes[:, 1].min()
+        x1, y1 = boxes[:, 2].max(), boxes[:, 3].max()
+        overflow = max(frame[0] - x0, frame[1] - y0, x1 - frame[2], y1 - frame[3])
+        if overflow > LAYOUT_TOLERANCE:
+            findings.append({
+                "kind": "off-frame",
+                "slide": slide_index,
+                "text": labels[text_id],
+                "detail": f"{overflow:.2f} units outside the frame",
+            })
+
+        glyph_pixels = (boxes[:, 3] - boxes[:, 1]).max() * pixels_per_unit
+        if glyph_pixels < min_pixels:
+            findings.append({
+                "kind": "too-small",
+                "slide": slide_index,
+                "text": labels[text_id],
+                "detail": f"glyphs {glyph_pixels:.1f}px high at {camera.pixel_height}p (minimum {min_pixels}px)",
+            })
+
+        for box in boxes:
+            index.insert(tuple(box))
+            owners.append(text_id)
+
+    overlapping = {
+        tuple(sorted((owners[i], owners[j])))
+        for i, j in index.intersecting_pairs(LAYOUT_TOLERANCE)
+        if owners[i] != owners[j]
+    }
+    for first, second in sorted(overlapping):
+        findings.append({
+            "kind": "overlap",
+            "slide": slide_index,
+            "text": labels[first],
+            "detail": f"overlaps '{labels[second]}'",
+        })
+    return findings
+
+
+class LayoutCollector:
+    """
+    Slide observer collecting layout findings, each reported once per scene
+    at the first slide where it appears.
+    """
+
+    def __init__(self, min_pixels=DEFAULT_MIN_PIXELS):
+        self.min_pixels = min_pixels
+        self.findings = []
+        self._seen = set()
+
+    def __call__(self, scene, slide_index):
+        for finding in lint_slide(scene, slide_index, self.min_pixels):
+            key = (finding["kind"], finding["text"], finding["detail"])
+            if key not in self._seen:
+                self._seen.add(key)
+                self.findings.append(finding)
+
+
+def lint_scene(scene_name, quality="h", min_pixels=DEFAULT_MIN_PIXELS):
+    """
+    Lints every slide of a scene.
+
+    Args:
+        scene_name: Scene class name
+        quality: Quality flag letter the pixel sizes are checked for
+        min_pixels: Minimum height of the tallest glyph of a text, in pixels
+
+    Returns:
+        Dictionary with the scene name, error traceback and findings
+    """
+    collector = LayoutCollector(min_pixels)
+    result = dry_run_scene(scene_name, quality, slide_observers=[collector])
+    return {"scene": scene_name, "error": result["error"], "findings": collector.findings}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Lint the layout of every slide.")
+    parser.add_argument("scenes", nargs="*", help="Scene names (default: every scene in slides.ALL_SCENES)")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="h",
+                        help="Quality the pixel sizes are checked for (default: h)")
+    parser.add_argument("--min-pixels", type=float, default=DEFAULT_MIN_PIXELS,
+                        help="Minimum glyph height in pixels (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Worker processes (default: one per CPU core)")
+    parser.add_argument("--json", metavar="PATH", help="Write the findings as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.scenes:
+        scene_names = args.scenes
+    else:
+        from slides import SCENE_NAMES
+        scene_names = SCENE_NAMES
+
+    task = partial(lint_scene, quality=args.quality, min_pixels=args.min_pixels)
+    results = run_scenes(task, scene_names, args.jobs)
+
+    findings = 0
+    failed = 0
+    for result in results:
+        if result["error"]:
+            failed += 1
+            print(f"{result['scene']}: FAILED\n{result['error']}", file=sys.stderr)
+        for finding in result["findings"]:
+            findings += 1
+            print(
+                f"{result['scene']} slide {finding['slide']}: {finding['kind']}: "
+                f"'{finding['text']}' {finding['detail']}"
+            )
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump({"scenes": results}, json_file, indent=2)
+
+    print(f"Linted {len(results)} scene(s): {findings} finding(s), {failed} failed")
+    return 1 if findings or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
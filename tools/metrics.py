@@ -0,0 +1,149 @@
+"""
+LLM Explained - Metrics history queries
+Reads the metrics that render.py, tools.dry_run and the benchmarks append to
+media/metrics.sqlite.
+
+To list the slowest scenes of recent high quality renders:
+    python -m tools.metrics slowest -q h
+
+To follow the render time of one scene across commits:
+    python -m tools.metrics trend Slide1_TitleIntroduction
+
+To list scenes that got more than 10% slower between two commits:
+    python -m tools.metrics compare 5a6049e e9dd2e0 --tolerance 0.1
+
+To estimate the build time of every scene with four jobs:
+    python -m tools.metrics estimate -q h --jobs 4
+
+Benchmarks are stored with the kind "benchmark:<suite>" and dry runs with
+"dry_run", e.g. --kind benchmark:data_generators.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from render import QUALITIES
+from utils.metrics_store import DEFAULT_METRICS_DB, METRIC_COLUMNS, MetricsStore
+from utils.render_settings import get_setting
+from utils.scheduler import SceneScheduler
+
+
+def format_value(metric, value):
+    if value is None:
+        return "-"
+    if metric == "wall_seconds":
+        return f"{value * 1000:.2f}ms" if value < 1 else f"{value:.2f}s"
+    if metric in ("output_bytes", "peak_memory_bytes"):
+        return f"{value / 1e6:.1f}MB"
+    return f"{value:.0f}"
+
+
+def show_trend(store, args):
+    trend = store.trend(args.scene, args.kind, args.quality, args.metric, args.limit)
+    if not trend:
+        print(f"No {args.metric} recorded for {args.scene}")
+        return 1
+    previous = None
+    for commit, recorded_at, value, samples in trend:
+        change = f"{(value / previous - 1) * 100:+.1f}%" if previous else ""
+        when = datetime.fromtimestamp(recorded_at).strftime("%Y-%m-%d %H:%M")
+        print(f"{commit or '-':<16} {when}  {format_value(args.metric, value):>10} {change:>8}  ({samples} run(s))")
+        previous = value
+    return 0
+
+
+def show_slowest(store, args):
+    slowest = store.slowest(args.kind, args.quality, args.metric, args.limit)
+    if not slowest:
+        print(f"No {args.metric} recorded")
+        return 1
+    for scene, value in slowest:
+        print(f"{scene:<60} {format_value(args.metric, value):>10}")
+    return 0
+
+
+def show_comparison(store, args):
+    regressions = store.regressions(
+        args.base, args.head, args.kind, args.quality, args.metric, args.tolerance
+    )
+    for scene, before, after, ratio in regressions:
+        print(
+            f"REGRESSION {scene}: {format_value(args.metric, before)} -> "
+            f"{format_value(args.metric, after)} ({ratio:.2f}x)"
+        )
+    compared = store.commit_medians(args.base, args.kind, args.quality, args.metric).keys() & \
+        store.commit_medians(args.head, args.kind, args.quality, args.metric).keys()
+    print(f"Compared {len(compared)} scene(s) between {args.base} and {args.head}: "
+          f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+def show_estimate(store, args):
+    estimates = store.latest(args.kind, args.quality, "wall_seconds")
+    if args.scenes:
+        scene_names = args.scenes
+    else:
+        from slides import SCENE_NAMES
+        scene_names = SCENE_NAMES
+
+    missing = [name for name in scene_names if name not in estimates]
+    scheduler = SceneScheduler(time_estimates=estimates)
+    total = sum(scheduler.time_estimate(name) for name in scene_names)
+    print(f"Estimated {len(scene_names)} scene(s): {total:.0f}s of rendering, "
+          f"{scheduler.makespan(scene_names, args.jobs):.0f}s with {args.jobs} job(s)")
+    if missing:
+        print(f"{len(missing)} scene(s) without history use the average: {' '.join(missing)}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Query the render and benchmark metrics history.")
+    parser.add_argument("--db", default=get_setting("metrics_db", DEFAULT_METRICS_DB),
+                        help="Metrics database (default: %(default)s)")
+    parser.add_argument("--kind", default="render",
+                        help="render, dry_run or benchmark:<suite> (default: %(default)s)")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default=None,
+                        help="Only use measurements at this quality (default: any)")
+    parser.add_argument("--metric", choices=METRIC_COLUMNS, default="wall_seconds",
+                        help="Metric to report (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    trend = commands.add_parser("trend", help="Median of a metric per commit for one scene")
+    trend.add_argument("scene", help="Scene name or benchmark case id")
+    trend.add_argument("-n", "--limit", type=int, default=20, help="Number of commits (default: %(default)s)")
+    trend.set_defaults(handler=show_trend)
+
+    slowest = commands.add_parser("slowest", help="Scenes with the highest recent value")
+    slowest.add_argument("-n", "--limit", type=int, default=10, help="Number of scenes (default: %(default)s)")
+    slowest.set_defaults(handler=show_slowest)
+
+    compare = commands.add_parser("compare", help="Scenes that regressed between two commits")
+    compare.add_argument("base", help="Reference commit (as recorded, e.g. 5a6049e)")
+    compare.add_argument("head", help="Compared commit")
+    compare.add_argument("--tolerance", type=float, default=0.1,
+                         help="Allowed relative increase (default: %(default)s)")
+    compare.set_defaults(handler=show_comparison)
+
+    estimate = commands.add_parser("estimate", help="Estimated build time from recent renders")
+    estimate.add_argument("scenes", nargs="*", help="Scene names (default: every scene in slides.ALL_SCENES)")
+    estimate.add_argument("-j", "--jobs", type=int, default=1, help="Scenes rendered in parallel (default: 1)")
+    estimate.set_defaults(handler=show_estimate)
+
+    args = parser.parse_args(argv)
+    if args.quality is not None:
+        args.quality = QUALITIES[args.quality]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = MetricsStore(args.db)
+    try:
+        return args.handler(store, args)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
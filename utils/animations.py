@@ -4,12 +4,10 @@ Provides reusable animation patterns.
 """
 
 from manim import *
-import sys
-import os
 
-# Add assets to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'assets'))
-from styles.theme_config import *
+# Imported as a package module (not through an assets/ sys.path entry) so the
+# theme is executed once, not once per module name
+from assets.styles.theme_config import *
 
 
 def slide_in_from_left(mobject, run_time=0.5):
@@ -0,0 +1,117 @@
+"""
+Background layers for LLM Explained presentation.
+Renders full-frame colours and vertical gradients once per resolution into
+pixel buffers, cached in memory across frames and scenes and on disk across
+runs, so title cards do not rasterize a full-frame Rectangle every frame.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+# Bump when the rendering below changes, to invalidate layers cached on disk
+LAYER_VERSION = 1
+
+_layer_cache = {}
+
+
+def layer_key(colors, opacity, pixel_width, pixel_height, background_rgba):
+    """
+    Builds the cache key of a background layer.
+
+    Args:
+        colors: List of RGB tuples (0-1) from top to bottom
+        opacity: Layer opacity
+        pixel_width: Frame width in pixels
+        pixel_height: Frame height in pixels
+        background_rgba: RGBA tuple (0-1) of the scene background
+
+    Returns:
+        Hex digest identifying the layer
+    """
+    spec = repr((
+        LAYER_VERSION,
+        [tuple(round(float(c), 6) for c in color) for color in colors],
+        round(float(opacity), 6),
+        int(pixel_width),
+        int(pixel_height),
+        tuple(round(float(c), 6) for c in background_rgba),
+    ))
+    return hashlib.sha1(spec.encode()).hexdigest()
+
+
+def render_background_layer(colors, opacity, pixel_width, pixel_height, background_rgba):
+    """
+    Renders a full-frame colour or top-to-bottom gradient composited over the
+    scene background, matching a Rectangle with sheen_direction DOWN.
+
+    Args:
+        colors: List of RGB tuples (0-1) from top to bottom
+        opacity: Layer opacity
+        pixel_width: Frame width in pixels
+        pixel_height: Frame height in pixels
+        background_rgba: RGBA tuple (0-1) of the scene background
+
+    Returns:
+        RGBA uint8 pixel array of shape (pixel_height, pixel_width, 4)
+    """
+    colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+
+    # Evenly spaced colour stops sampled at pixel row centres
+    t = (np.arange(pixel_height) + 0.5) / pixel_height
+    stops = np.linspace(0, 1, len(colors))
+    rows = np.stack(
+        [np.interp(t, stops, colors[:, channel]) for channel in range(3)], axis=1
+    )
+
+    # Premultiplied "over" compositing, like the Cairo surface manim draws on
+    background = np.asarray(background_rgba, dtype=np.float64)
+    alpha = opacity + background[3] * (1 - opacity)
+    rgb = rows * opacity + background[:3] * background[3] * (1 - opacity)
+
+    row_pixels = np.empty((pixel_height, 4), dtype=np.uint8)
+    row_pixels[:, :3] = np.clip(np.round(rgb * 255), 0, 255)
+    row_pixels[:, 3] = np.clip(np.round(alpha * 255), 0, 255)
+
+    return np.ascontiguousarray(
+        np.broadcast_to(row_pixels[:, np.newaxis, :], (pixel_height, pixel_width, 4))
+    )
+
+
+def get_background_layer(colors, opacity, pixel_width, pixel_height, background_rgba, cache_dir=None):
+    """
+    Returns a background layer, rendering it only if it is not cached.
+
+    Args:
+        colors: List of RGB tuples (0-1) from top to bottom
+        opacity: Layer opacity
+        pixel_width: Frame width in pixels
+        pixel_height: Frame height in pixels
+        background_rgba: RGBA tuple (0-1) of the scene background
+        cache_dir: Directory of layers cached on disk (None disables it)
+
+    Returns:
+        Read-only RGBA uint8 pixel array shared between callers
+    """
+    key = layer_key(colors, opacity, pixel_width, pixel_height, background_rgba)
+    layer = _layer_cache.get(key)
+    if layer is not None:
+        return layer
+
+    path = os.path.join(cache_dir, f"{key}.npy") if cache_dir else None
+    if path and os.path.exists(path):
+        layer = np.load(path)
+    else:
+        layer = render_background_layer(colors, opacity, pixel_width, pixel_height, background_rgba)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write then rename so parallel renders never read a partial file
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as layer_file:
+                np.save(layer_file, layer)
+            os.replace(temporary_path, path)
+
+    layer.setflags(write=False)
+    _layer_cache[key] = layer
+    return layer
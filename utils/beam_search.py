@@ -0,0 +1,128 @@
+"""
+Beam search for LLM Explained presentation.
+Keeps the num_beams most likely sequences instead of Part 5's single greedy
+or sampled continuation. Beams are one (beam, length) token array and one
+score vector; every step picks the best beam x vocab candidates with
+argpartition and gathers the token and KV cache rows of the surviving beams.
+"""
+
+import time
+
+import numpy as np
+
+from utils.sampling import logsumexp
+
+
+def _gather_rows(array, indices, length):
+    # Same batch size: the gather makes a temporary copy, so rows can be overwritten in place
+    if len(indices) == len(array):
+        array[:, :length] = array[indices, :length]
+        return array
+    gathered = np.empty((len(indices),) + array.shape[1:], dtype=array.dtype)
+    gathered[:, :length] = array[indices, :length]
+    return gathered
+
+
+def normalize_score(score, length, length_penalty):
+    """
+    Normalizes a summed log probability by the sequence length.
+
+    Args:
+        score: Sum of token log probabilities
+        length: Generated tokens
+        length_penalty: Exponent of the length (0: raw scores, > 0 favors longer sequences)
+
+    Returns:
+        score / length ** length_penalty
+    """
+    return score / max(length, 1) ** length_penalty
+
+
+def beam_search(model, prompt, max_new_tokens, num_beams=4, length_penalty=1.0, early_stopping=False,
+                eos_token_id=None, cache=None):
+    """
+    Generates the most likely continuations of a prompt with beam search.
+
+    A beam emitting eos_token_id becomes a finished hypothesis. Twice
+    num_beams candidates are ranked at every step so finished ones still
+    leave num_beams beams to continue. Without an EOS token every beam runs
+    max_new_tokens steps.
+
+    Args:
+        model: Model with create_cache() and forward() (see utils/kv_cache.py)
+        prompt: Prompt token ids of shape (prompt_length,) or (1, prompt_length)
+        max_new_tokens: Longest continuation
+        num_beams: Beam width
+        length_penalty: Exponent of the length normalizing finished scores
+        early_stopping: Stop as soon as num_beams hypotheses finished; otherwise
+            stop once no running beam can beat the worst of them (same
+            heuristic as Hugging Face)
+        eos_token_id: Token ending a hypothesis (None: no early end)
+        cache: KVCache of the prompt's batch to continue from (default: a new cache)
+
+    Returns:
+        Dictionary with the hypotheses sorted by normalized score (token
+        arrays of up to max_new_tokens), their scores, the best tokens, the
+        seconds of each step (prefill first) and the cache
+    """
+    prompt = np.asarray(prompt).reshape(1, -1)
+    if cache is None:
+        cache = model.create_cache(1, prompt.shape[1] + max_new_tokens)
+    if max_new_tokens <= 0:
+        # Nothing to search: the prompt alone, with an empty continuation
+        empty = np.empty(0, dtype=np.int64)
+        return {"sequences": [empty], "scores": np.zeros(1), "tokens": empty, "step_seconds": [], "cache": cache}
+
+    sequences = np.empty((1, max_new_tokens), dtype=np.int64)
+    scores = np.zeros(1)
+    finished = []
+    step_seconds = []
+    step_input = prompt
+    for step in range(max_new_tokens):
+        start = time.perf_counter()
+        logits = model.forward(step_input, cache)[:, -1]
+        vocab = logits.shape[-1]
+        candidates = (scores[:, np.newaxis] + (logits - logsumexp(logits)[:, np.newaxis])).ravel()
+
+        count = min(num_beams if eos_token_id is None else 2 * num_beams, candidates.size)
+        top = np.argpartition(candidates, -count)[-count:]
+        top = top[np.argsort(-candidates[top], kind="stable")]
+        beam_indices, tokens = np.divmod(top, vocab)
+
+        if eos_token_id is not None:
+            ended = tokens == eos_token_id
+            # Like continuing beams, finished hypotheses must rank among the num_beams best candidates
+            for index in np.flatnonzero(ended[:num_beams]):
+                hypothesis = np.append(sequences[beam_indices[index], :step], eos_token_id)
+                finished.append((normalize_score(candidates[top[index]], step + 1, length_penalty), hypothesis))
+            kept = np.flatnonzero(~ended)[:num_beams]
+            top, beam_indices, tokens = top[kept], beam_indices[kept], tokens[kept]
+
+        scores = candidates[top]
+        sequences = _gather_rows(sequences, beam_indices, step)
+        sequences[:, step] = tokens
+        cache.reorder(beam_indices)
+        step_input = tokens[:, np.newaxis]
+        step_seconds.append(time.perf_counter() - start)
+
+        if len(finished) >= num_beams:
+            if early_stopping:
+                break
+            worst = sorted(score for score, _ in finished)[-num_beams]
+            if normalize_score(scores.max(), step + 1, length_penalty) <= worst:
+                break
+    else:
+        finished += [
+            (normalize_score(score, max_new_tokens, length_penalty), sequence)
+            for score, sequence in zip(scores, sequences)
+        ]
+
+    finished.sort(key=lambda hypothesis: hypothesis[0], reverse=True)
+    finished = finished[:num_beams]
+    return {
+        "sequences": [sequence for _, sequence in finished],
+        "scores": np.array([score for score, _ in finished]),
+        "tokens": finished[0][1],
+        "step_seconds": step_seconds,
+        "cache": cache,
+    }
@@ -5,12 +5,16 @@ Provides base classes with common functionality for slide creation.
 
 from manim import *
 from manim_slides import Slide
-import sys
 import os
+import time
 
-# Add assets to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'assets'))
-from styles.theme_config import *
+from assets.styles.theme_config import *
+
+from utils.encoding import apply_scene_profile, scene_frame_rate
+from utils.render_settings import get_flag
+from utils.render_report import directory_size
+from utils.renderer import NullRenderer, PipedSceneFileWriter, create_renderer
+from utils.scene_instrumentation import SceneInstrumentation
 
 
 class LLMSlide(Slide):
@@ -19,11 +23,91 @@ class LLMSlide(Slide):
     Provides common functionality and styling.
     """
 
+    # Scene encoding adjustments ("static", "motion"), see SCENE_ENCODING_PROFILES
+    encoding_profile = None
+
     def __init__(self, **kwargs):
+        if kwargs.get("renderer") is None:
+            kwargs["renderer"] = create_renderer(kwargs.get("skip_animations", False))
+
+        instrumentation = SceneInstrumentation(type(self).__name__, self.encoding_profile)
+        instrumentation.scene_kwargs(kwargs)
         super().__init__(**kwargs)
+        # Render statistics, tracing, profiling and frame-parallel rendering
+        self.instrumentation = instrumentation
         self.title_obj = None
         self.subtitle_obj = None
 
+    def render(self, *args, **kwargs):
+        with self.instrumentation.rendering(f"{config.pixel_width}x{config.pixel_height}"):
+            if isinstance(self.renderer, NullRenderer):
+                self.dry_run()
+            else:
+                self._render(*args, **kwargs)
+
+    def _render(self, *args, **kwargs):
+        # Apply the scene's encoding profile before the first frame is written
+        render_stats = self.instrumentation.render_stats
+        frame_rate = scene_frame_rate(config.frame_rate, self.encoding_profile)
+        file_writer = self.renderer.file_writer
+        with tempconfig({"frame_rate": frame_rate}):
+            self.renderer.camera.frame_rate = frame_rate
+            if isinstance(file_writer, PipedSceneFileWriter):
+                file_writer.configure(apply_scene_profile(file_writer.profile, self.encoding_profile), frame_rate)
+
+            start = time.perf_counter()
+            super().render(*args, **kwargs)
+            render_stats.wall_seconds = time.perf_counter() - start
+
+        if isinstance(file_writer, PipedSceneFileWriter):
+            render_stats.encode_seconds = file_writer.encoder.encode_seconds
+        slides_folder = getattr(self, "_output_folder", "slides")
+        render_stats.output_bytes = directory_size(
+            os.path.join(slides_folder, "files", type(self).__name__)
+        )
+
+    def dry_run(self):
+        """
+        Runs construct() with the null renderer: every animation jumps to its
+        final state and nothing is rasterized or written to disk.
+        """
+        start = time.perf_counter()
+        self.setup()
+        self.construct()
+        # The state after the last animation is the final slide
+        self.renderer.slide_boundary(self)
+        self.tear_down()
+        self.instrumentation.render_stats.wall_seconds = time.perf_counter() - start
+
+    def next_slide(self, *args, **kwargs):
+        with self.instrumentation.slide(self.renderer.num_plays):
+            if isinstance(self.renderer, NullRenderer):
+                self.renderer.slide_boundary(self)
+            super().next_slide(*args, **kwargs)
+
+    def play(self, *args, **kwargs):
+        self.instrumentation.play_started(self, args)
+        start_time = self.renderer.time
+        super().play(*args, **kwargs)
+        self.instrumentation.play_finished(self, start_time)
+
+    def update_to_time(self, t):
+        start = time.perf_counter()
+        super().update_to_time(t)
+        self.instrumentation.interpolate_seconds += time.perf_counter() - start
+
+    def play_internal(self, skip_rendering=False):
+        self.instrumentation.play_internal(self, skip_rendering, super().play_internal)
+
+    def tear_down(self):
+        self.instrumentation.build_finished()
+        super().tear_down()
+        self.instrumentation.torn_down()
+
+    def _save_slides(self, *args, **kwargs):
+        with self.instrumentation.tracer.span("save slides", "output"):
+            super()._save_slides(*args, **kwargs)
+
     def add_title(self, title_text, subtitle_text=None, color=ACCENT_CYAN):
         """
         Adds a title and optional subtitle to the slide.
@@ -60,8 +144,56 @@ class LLMSlide(Slide):
             bottom_color: Bottom color of gradient
             opacity: Background opacity
         """
-        bg = create_gradient_background(top_color, bottom_color, opacity)
-        self.add(bg)
+        self.add_background_layer([top_color, bottom_color], opacity)
+
+    def add_background_layer(self, colors, opacity=1):
+        """
+        Adds a full-frame colour or top-to-bottom gradient behind all mobjects.
+
+        By default this is a full-frame Rectangle mobject. With the
+        background_layers setting (LLM_SLIDES_BACKGROUND_LAYERS=1) it is
+        instead rendered once per resolution, cached in memory and on disk
+        (in memory only during dry runs, which write nothing) and used as the
+        camera background, so it is not rasterized on every frame. That
+        layer is not a mobject: FadeOut(*self.mobjects) and self.clear()
+        leave it in place, and it stays behind every z_index.
+
+        Args:
+            colors: Colour, or list of colours from top to bottom
+            opacity: Background opacity
+        """
+        if not isinstance(colors, (list, tuple)):
+            colors = [colors]
+
+        if not get_flag("background_layers"):
+            background = Rectangle(
+                width=config.frame_width,
+                height=config.frame_height,
+                fill_opacity=opacity,
+                fill_color=colors[0],
+                stroke_width=0
+            )
+            if len(colors) > 1:
+                background.set_sheen_direction(DOWN)
+                background.set_color(colors)
+            self.add(background)
+            return
+
+        from utils.background_layers import get_background_layer
+
+        camera = self.renderer.camera
+        background_rgba = list(color_to_rgb(camera.background_color)) + [camera.background_opacity]
+        # Dry runs (tools.dry_run or the dry_run setting) use the null renderer and write nothing
+        dry_run = isinstance(self.renderer, NullRenderer)
+        layer = get_background_layer(
+            [color_to_rgb(color) for color in colors],
+            opacity,
+            camera.pixel_width,
+            camera.pixel_height,
+            background_rgba,
+            cache_dir=None if dry_run else os.path.join(config.media_dir, "backgrounds"),
+        )
+        camera.set_background(layer)
 
     def highlight_word(self, text_obj, word_index, color=ACCENT_YELLOW):
         """
@@ -214,6 +346,8 @@ class TitleSlide(LLMSlide):
     Special slide class for title/transition slides.
     """
 
+    encoding_profile = "static"
+
     def create_title_slide(self, main_title, subtitle=None, background=True):
         """
         Creates a complete title slide.
@@ -165,6 +165,205 @@ def calculate_attention(Q, K, V, scale=True):
     return scores, weights, output
 
 
+def split_heads(X, num_heads):
+    """
+    Splits the model dimension into attention heads.
+
+    Args:
+        X: Array of shape (batch, seq, d_model)
+        num_heads: Number of heads
+
+    Returns:
+        Array of shape (batch, num_heads, seq, d_model // num_heads)
+    """
+    batch, seq, d_model = X.shape
+    return X.reshape(batch, seq, num_heads, d_model // num_heads).transpose(0, 2, 1, 3)
+
+
+def merge_heads(X):
+    """
+    Concatenates attention heads back into the model dimension.
+
+    Args:
+        X: Array of shape (batch, heads, seq, head_dim)
+
+    Returns:
+        Array of shape (batch, seq, heads * head_dim)
+    """
+    batch, heads, seq, head_dim = X.shape
+    return X.transpose(0, 2, 1, 3).reshape(batch, seq, heads * head_dim)
+
+
+def generate_attention_mask(query_length, key_length=None, causal=True, window=None):
+    """
+    Generates a boolean attention mask (True where a query may attend a key).
+
+    Queries are aligned with the last keys, so with a KV cache the new
+    queries see the whole cached prefix.
+
+    Args:
+        query_length: Number of queries
+        key_length: Number of keys (default: query_length)
+        causal: Whether queries only attend to keys at or before their position
+        window: Sliding window size: each query only sees the last `window`
+            keys up to its own position (implies causal)
+
+    Returns:
+        Boolean array of shape (query_length, key_length)
+    """
+    if key_length is None:
+        key_length = query_length
+    query_positions = np.arange(key_length - query_length, key_length)[:, np.newaxis]
+    key_positions = np.arange(key_length)[np.newaxis, :]
+
+    mask = np.ones((query_length, key_length), dtype=bool)
+    if causal or window is not None:
+        mask &= key_positions <= query_positions
+    if window is not None:
+        mask &= key_positions > query_positions - window
+    return mask
+
+
+def calculate_multi_head_attention(Q, K, V, mask=None, causal=False, scale=True, return_weights=False):
+    """
+    Calculates batched multi-head attention, with grouped-query (GQA) and
+    multi-query (MQA) attention when K and V have fewer heads than Q.
+
+    Each K/V head is shared by heads // kv_heads consecutive query heads.
+    Queries are viewed as (batch, kv_heads, group, seq, d) and K/V broadcast
+    over the group axis, so shared heads are never copied.
+
+    Args:
+        Q: Queries of shape (batch, heads, seq_q, d)
+        K: Keys of shape (batch, kv_heads, seq_k, d), heads divisible by kv_heads
+        V: Values of shape (batch, kv_heads, seq_k, d_v)
+        mask: Boolean mask broadcastable to (batch, heads, seq_q, seq_k),
+            True where attention is allowed (see generate_attention_mask)
+        causal: Whether to apply a causal mask (queries aligned with the last keys)
+        scale: Whether to scale by sqrt(d)
+        return_weights: Whether to also return the attention weights, which
+            take batch * heads * seq_q * seq_k values
+
+    Returns:
+        Output of shape (batch, heads, seq_q, d_v), or a tuple of
+        (output, weights) when return_weights is set
+    """
+    batch, heads, seq_q, d = Q.shape
+    kv_heads, seq_k = K.shape[1], K.shape[2]
+    if heads % kv_heads:
+        raise ValueError(f"{heads} query heads cannot share {kv_heads} key/value heads")
+    group = heads // kv_heads
+    # Float inputs keep their dtype (float32 stays float32); integer inputs are promoted
+    dtype = np.result_type(Q, K, V, np.float32)
+    Q, K, V = (np.asarray(X, dtype=dtype) for X in (Q, K, V))
+
+    # (batch, kv_heads, group, seq_q, seq_k) scores, K/V broadcast across the group
+    Q_grouped = Q.reshape(batch, kv_heads, group, seq_q, d)
+    scores = np.matmul(Q_grouped, K[:, :, np.newaxis].swapaxes(-1, -2))
+    if scale:
+        # A scalar of the scores' dtype: a float64 one would promote float32 scores
+        scores *= dtype.type(1 / np.sqrt(d))
+
+    if causal:
+        causal_mask = generate_attention_mask(seq_q, seq_k)
+        mask = causal_mask if mask is None else mask & causal_mask
+    if mask is not None:
+        mask = np.asarray(mask, dtype=bool)
+        mask = mask.reshape((1,) * (4 - mask.ndim) + mask.shape)
+        if mask.shape[1] == 1:
+            mask = mask[:, :, np.newaxis]
+        else:
+            mask = mask.reshape(mask.shape[0], kv_heads, group, *mask.shape[2:])
+        np.copyto(scores, -np.inf, where=~mask)
+
+    # Softmax in place: the scores buffer becomes the weights
+    scores -= scores.max(axis=-1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=-1, keepdims=True)
+
+    output = np.matmul(scores, V[:, :, np.newaxis]).reshape(batch, heads, seq_q, V.shape[-1])
+    if return_weights:
+        return output, scores.reshape(batch, heads, seq_q, seq_k)
+    return output
+
+
+def calculate_chunked_attention(Q, K, V, block_size=256, causal=False, window=None, scale=True):
+    """
+    Calculates attention tile by tile with an online softmax, without ever
+    holding the full seq_q x seq_k score matrix.
+
+    For each query tile, key/value tiles are visited in order while a running
+    row maximum, softmax denominator and weighted value sum are rescaled, so
+    peak memory is O(seq * d + block_size^2). Tiles that the causal or sliding
+    window mask hides entirely are skipped.
+
+    Args:
+        Q: Queries of shape (..., seq_q, d), e.g. (seq, d) or (batch, heads, seq, d)
+        K: Keys of shape (..., seq_k, d)
+        V: Values of shape (..., seq_k, d_v)
+        block_size: Queries and keys per tile
+        causal: Whether queries only attend to keys at or before their position
+        window: Sliding window size (see generate_attention_mask), implies causal
+        scale: Whether to scale by sqrt(d_k)
+
+    Returns:
+        Output of shape (..., seq_q, d_v), equal to calculate_attention's output
+    """
+    seq_q, d = Q.shape[-2:]
+    seq_k = K.shape[-2]
+    masked = causal or window is not None
+    # Queries are aligned with the last keys, as in generate_attention_mask
+    offset = seq_k - seq_q
+    # Float inputs keep their dtype; integer inputs are promoted, as in calculate_attention
+    dtype = np.result_type(Q, K, V, np.float32)
+    Q, K, V = (np.asarray(X, dtype=dtype) for X in (Q, K, V))
+    scale_factor = dtype.type(1 / np.sqrt(d) if scale else 1.0)
+
+    output = np.empty(np.broadcast_shapes(Q.shape[:-2], V.shape[:-2]) + (seq_q, V.shape[-1]), dtype=dtype)
+    for q_start in range(0, seq_q, block_size):
+        q_end = min(q_start + block_size, seq_q)
+        Q_tile = Q[..., q_start:q_end, :] * scale_factor
+
+        # Range of keys visible to any query of the tile
+        k_first, k_last = 0, seq_k
+        if masked:
+            k_last = min(seq_k, offset + q_end)
+        if window is not None:
+            k_first = max(0, offset + q_start - window + 1)
+
+        row_max = np.full(output.shape[:-2] + (q_end - q_start, 1), -np.inf, dtype=dtype)
+        row_sum = np.zeros_like(row_max)
+        acc = np.zeros(output.shape[:-2] + (q_end - q_start, V.shape[-1]), dtype=dtype)
+
+        for k_start in range(k_first, k_last, block_size):
+            k_end = min(k_start + block_size, k_last)
+            scores = np.matmul(Q_tile, K[..., k_start:k_end, :].swapaxes(-1, -2))
+            if masked:
+                query_positions = np.arange(offset + q_start, offset + q_end)[:, np.newaxis]
+                key_positions = np.arange(k_start, k_end)[np.newaxis, :]
+                tile_mask = key_positions <= query_positions
+                if window is not None:
+                    tile_mask &= key_positions > query_positions - window
+                np.copyto(scores, -np.inf, where=~tile_mask)
+
+            # Rescale what was accumulated under the previous maximum
+            new_max = np.maximum(row_max, scores.max(axis=-1, keepdims=True))
+            # Rows with every key masked so far keep a finite reference
+            safe_max = np.where(np.isneginf(new_max), 0, new_max)
+            correction = np.exp(row_max - safe_max)
+            scores -= safe_max
+            np.exp(scores, out=scores)
+
+            row_sum *= correction
+            row_sum += scores.sum(axis=-1, keepdims=True)
+            acc *= correction
+            acc += np.matmul(scores, V[..., k_start:k_end, :])
+            row_max = new_max
+
+        np.divide(acc, row_sum, out=output[..., q_start:q_end, :])
+    return output
+
+
 def generate_positional_encoding(max_length=10, d_model=4):
     """
     Generates sinusoidal positional encoding.
@@ -321,8 +520,9 @@ def generate_quantization_example(original_value=1.2, scale_factor=23.5):
     Returns:
         Dictionary with quantization steps
     """
-    # Quantize
-    quantized = int(original_value * scale_factor)
+    # Quantize: round to the nearest level (int() would truncate 28.9 to 28);
+    # utils/quantization.py does the same for whole weight arrays
+    quantized = int(np.rint(original_value * scale_factor))
 
     # Dequantize
     dequantized = quantized / scale_factor
@@ -0,0 +1,336 @@
+"""
+Video encoding pipeline for LLM Explained presentation.
+Streams raw RGBA frames through pipes into ffmpeg encoder processes, encodes
+independent segments concurrently and concatenates them without re-encoding.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+
+from utils.tracing import get_tracer
+
+FFMPEG_BINARY = shutil.which("ffmpeg") or "ffmpeg"
+
+# Encoder profiles: preview favours encode speed, publish favours file size
+ENCODER_PROFILES = {
+    "preview": {
+        "codec": "libx264",
+        "preset": "ultrafast",
+        "crf": 28,
+        "pix_fmt": "yuv420p",
+    },
+    "publish": {
+        "codec": "libx264",
+        "preset": "slow",
+        "crf": 23,
+        "pix_fmt": "yuv420p",
+    },
+}
+
+DEFAULT_ENCODER_PROFILE = "publish"
+
+# Per-scene adjustments declared with LLMSlide.encoding_profile
+SCENE_ENCODING_PROFILES = {
+    # Text appearing then holding still: a higher CRF and fewer frames are not visible
+    "static": {"crf_offset": 5, "max_frame_rate": 30},
+    # Continuous motion keeps the full quality of the encoder profile
+    "motion": {"crf_offset": 0, "max_frame_rate": None},
+}
+
+
+def get_encoder_profile(name=DEFAULT_ENCODER_PROFILE):
+    """
+    Returns a copy of an encoder profile.
+
+    Args:
+        name: Profile name ("preview" or "publish")
+
+    Returns:
+        Dictionary of encoder settings
+    """
+    if name not in ENCODER_PROFILES:
+        raise ValueError(
+            f"Unknown encoder profile '{name}', expected one of: {', '.join(ENCODER_PROFILES)}"
+        )
+    return dict(ENCODER_PROFILES[name])
+
+
+def get_scene_encoding_profile(name):
+    """
+    Returns the per-scene encoding adjustments of a scene profile.
+
+    Args:
+        name: Scene profile name ("static", "motion") or None
+
+    Returns:
+        Dictionary with crf_offset and max_frame_rate
+    """
+    if name is None:
+        return {"crf_offset": 0, "max_frame_rate": None}
+    if name not in SCENE_ENCODING_PROFILES:
+        raise ValueError(
+            f"Unknown scene encoding profile '{name}', expected one of: {', '.join(SCENE_ENCODING_PROFILES)}"
+        )
+    return dict(SCENE_ENCODING_PROFILES[name])
+
+
+def apply_scene_profile(profile, scene_profile_name):
+    """
+    Adjusts an encoder profile for a scene.
+
+    Args:
+        profile: Encoder profile dictionary
+        scene_profile_name: Scene profile name or None
+
+    Returns:
+        New encoder profile dictionary
+    """
+    adjustments = get_scene_encoding_profile(scene_profile_name)
+    profile = dict(profile)
+    profile["crf"] = min(51, profile["crf"] + adjustments["crf_offset"])
+    return profile
+
+
+def scene_frame_rate(frame_rate, scene_profile_name):
+    """
+    Returns the frame rate a scene is rendered at.
+
+    Args:
+        frame_rate: Frame rate of the render quality
+        scene_profile_name: Scene profile name or None
+
+    Returns:
+        Frame rate, capped by the scene profile
+    """
+    max_frame_rate = get_scene_encoding_profile(scene_profile_name)["max_frame_rate"]
+    if max_frame_rate is None:
+        return frame_rate
+    return min(frame_rate, max_frame_rate)
+
+
+def build_ffmpeg_command(output_path, width, height, frame_rate, profile):
+    """
+    Builds the ffmpeg command encoding raw RGBA frames read from stdin.
+
+    Args:
+        output_path: Encoded video path
+        width: Frame width in pixels
+        height: Frame height in pixels
+        frame_rate: Frames per second
+        profile: Encoder profile dictionary
+
+    Returns:
+        List of command arguments
+    """
+    return [
+        FFMPEG_BINARY, "-y", "-loglevel", "error", "-nostats",
+        "-f", "rawvideo", "-pix_fmt", "rgba",
+        "-s", f"{width}x{height}", "-r", str(frame_rate),
+        "-i", "-",
+        "-an",
+        "-c:v", profile["codec"],
+        "-preset", profile["preset"],
+        "-crf", str(profile["crf"]),
+        "-pix_fmt", profile["pix_fmt"],
+        "-f", "mp4",
+        str(output_path),
+    ]
+
+
+class FFmpegSegment:
+    """
+    One independently encoded video segment.
+    Frames are queued by the renderer and written to the stdin pipe of an
+    ffmpeg process by a feeder thread, so rasterization and encoding overlap.
+    The ffmpeg process is only started when the first frame arrives.
+    """
+
+    def __init__(self, output_path, width, height, frame_rate, profile,
+                 slots=None, max_queued_frames=8):
+        self.output_path = str(output_path)
+        self.width = width
+        self.height = height
+        self.frame_rate = frame_rate
+        self.profile = profile
+        self.frames = 0
+        self.encode_seconds = 0.0
+        self._slots = slots
+        self._queue = queue.Queue(maxsize=max_queued_frames)
+        self._process = None
+        self._thread = None
+        self._error = None
+
+    @property
+    def started(self):
+        return self._process is not None
+
+    def write(self, frame, num_frames=1):
+        """
+        Queues a frame for encoding.
+
+        Args:
+            frame: RGBA numpy array of shape (height, width, 4)
+            num_frames: Number of times the frame is repeated
+        """
+        if self._process is None:
+            self._start()
+        self._raise_pending_error()
+        self._queue.put((frame, num_frames))
+        self.frames += num_frames
+
+    def close(self):
+        """Signals the end of the segment without waiting for the encoder."""
+        if self._process is not None:
+            self._queue.put(None)
+
+    def wait(self):
+        """Waits for the encoder to finish and raises if it failed."""
+        if self._thread is not None:
+            self._thread.join()
+        self._raise_pending_error()
+
+    def _start(self):
+        if self._slots is not None:
+            self._slots.acquire()
+        # Encode into a temporary file so an interrupted render never
+        # leaves a truncated segment behind that manim would treat as cached
+        root, ext = os.path.splitext(self.output_path)
+        self._encoding_path = f"{root}.encoding{ext}"
+        command = build_ffmpeg_command(
+            self._encoding_path, self.width, self.height, self.frame_rate, self.profile
+        )
+        self._started_at = time.perf_counter()
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        self._thread = threading.Thread(target=self._feed, daemon=True)
+        self._thread.start()
+
+    def _feed(self):
+        tracer = get_tracer()
+        tracer.name_thread("ffmpeg feeder")
+        tracer.begin("encode", "ffmpeg", segment=os.path.basename(self.output_path))
+        stdin = self._process.stdin
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                frame, num_frames = item
+                data = frame.data if frame.flags.c_contiguous else frame.tobytes()
+                for _ in range(num_frames):
+                    stdin.write(data)
+        except (BrokenPipeError, OSError):
+            # ffmpeg exited early, its stderr explains why
+            pass
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+            stderr = self._process.stderr.read().decode(errors="replace")
+            returncode = self._process.wait()
+            self.encode_seconds = time.perf_counter() - self._started_at
+            if returncode == 0:
+                os.replace(self._encoding_path, self.output_path)
+            else:
+                self._error = RuntimeError(
+                    f"ffmpeg failed to encode {self.output_path} "
+                    f"(exit code {returncode}): {stderr.strip()}"
+                )
+                # Unblock a renderer waiting on a full queue
+                while not self._queue.empty():
+                    self._queue.get_nowait()
+            tracer.end("encode", "ffmpeg", frames=self.frames, returncode=returncode)
+            if self._slots is not None:
+                self._slots.release()
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            raise self._error
+
+
+class SegmentEncoder:
+    """
+    Runs up to max_workers segment encoders at the same time.
+    Opening a segment blocks once every worker is busy, which keeps the
+    renderer from queuing more frames than the encoders can absorb.
+    """
+
+    def __init__(self, width, height, frame_rate, profile, max_workers=None):
+        self.width = width
+        self.height = height
+        self.frame_rate = frame_rate
+        self.profile = profile
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.segments = []
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+
+    def open_segment(self, output_path):
+        """
+        Creates a new segment encoded in the background.
+
+        Args:
+            output_path: Encoded video path
+
+        Returns:
+            FFmpegSegment
+        """
+        segment = FFmpegSegment(
+            output_path, self.width, self.height, self.frame_rate, self.profile,
+            slots=self._slots
+        )
+        self.segments.append(segment)
+        return segment
+
+    def wait(self):
+        """Waits for every segment to finish encoding."""
+        for segment in self.segments:
+            segment.wait()
+
+    @property
+    def encode_seconds(self):
+        """Total encoder busy time across segments."""
+        return sum(segment.encode_seconds for segment in self.segments)
+
+    @property
+    def frames(self):
+        """Total number of frames written across segments."""
+        return sum(segment.frames for segment in self.segments)
+
+
+def concat_segments(segment_paths, output_path):
+    """
+    Concatenates encoded segments with the ffmpeg concat demuxer.
+    Streams are copied, so segments must share the same encoder settings.
+
+    Args:
+        segment_paths: Ordered list of segment paths
+        output_path: Combined video path
+    """
+    output_path = str(output_path)
+    list_path = output_path + ".concat.txt"
+    with open(list_path, "w") as list_file:
+        for path in segment_paths:
+            escaped = os.path.abspath(str(path)).replace("'", "'\\''")
+            list_file.write(f"file '{escaped}'\n")
+
+    try:
+        subprocess.run(
+            [
+                FFMPEG_BINARY, "-y", "-loglevel", "error", "-nostats",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-c", "copy", output_path,
+            ],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+    finally:
+        os.remove(list_path)
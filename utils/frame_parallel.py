@@ -0,0 +1,296 @@
+"""
+Frame-range parallel rendering for LLM Explained presentation.
+Splits the frames of one long animation across worker processes. Each worker
+replays construct() without rendering up to that animation, rasterizes its
+slice of frames and encodes it; the slices are then stitched in order.
+
+An animation frame only depends on the start state and alpha, so this is
+exact for animations without time-based updaters, which are never split.
+"""
+
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from manim import config
+from manim.animation.animation import Wait
+from manim.utils.file_ops import write_to_movie
+
+from utils.encoding import FFmpegSegment, concat_segments
+from utils.render_settings import current_settings, apply_settings, get_int_setting
+from utils.tracing import get_tracer
+
+# Seed used when a scene does not set one, so every worker rebuilds the
+# same start state as the scene that dispatched the slices
+FRAME_PARALLEL_SEED = 0
+
+# Replaying construct() costs every worker some time, so short slices are not worth it
+DEFAULT_MIN_SLICE_FRAMES = 30
+
+# manim config keys a worker needs to rasterize identical frames
+WORKER_CONFIG_KEYS = (
+    "pixel_width",
+    "pixel_height",
+    "frame_rate",
+    "frame_width",
+    "frame_height",
+    "background_opacity",
+    "media_dir",
+)
+
+
+class FrameSliceComplete(Exception):
+    """Raised in a worker once its slice of frames is encoded."""
+
+
+class FrameSlice:
+    """
+    Describes the frames of one animation assigned to a worker.
+    """
+
+    def __init__(self, module_name, module_file, scene_name, play_index,
+                 start, stop, output_path, profile, random_seed, manim_config, settings):
+        self.module_name = module_name
+        self.module_file = module_file
+        self.scene_name = scene_name
+        self.play_index = play_index
+        self.start = start
+        self.stop = stop
+        self.output_path = output_path
+        self.profile = profile
+        self.random_seed = random_seed
+        self.manim_config = manim_config
+        self.settings = settings
+
+
+def frame_times(run_time):
+    """
+    Returns the times at which manim renders the frames of an animation.
+
+    Args:
+        run_time: Animation run time in seconds
+
+    Returns:
+        Numpy array of frame times
+    """
+    return np.arange(0, run_time, 1 / config.frame_rate)
+
+
+def split_frame_range(frame_count, workers):
+    """
+    Splits a frame range into contiguous, nearly equal slices.
+
+    Args:
+        frame_count: Number of frames
+        workers: Number of slices wanted
+
+    Returns:
+        List of (start, stop) tuples
+    """
+    workers = max(1, min(workers, frame_count))
+    bounds = [round(i * frame_count / workers) for i in range(workers + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(workers)]
+
+
+def load_scene_class(module_name, module_file, scene_name):
+    """
+    Imports a scene class in a worker process.
+
+    Args:
+        module_name: Name of the module defining the scene
+        module_file: Path of that module, used when it is not importable by name
+        scene_name: Scene class name
+
+    Returns:
+        Scene class
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            spec = importlib.util.spec_from_file_location(module_name, module_file)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+    return getattr(module, scene_name)
+
+
+def render_frame_slice(frame_slice):
+    """
+    Worker entry point: rebuilds the scene up to the sliced animation and
+    encodes the frames of the slice.
+
+    Args:
+        frame_slice: FrameSlice to render
+
+    Returns:
+        Path of the encoded slice
+    """
+    apply_settings(frame_slice.settings)
+    config.update(frame_slice.manim_config)
+    # Animations before the sliced one are replayed in skipping mode
+    config.update({
+        "write_to_movie": False,
+        "disable_caching": True,
+        "progress_bar": "none",
+        "from_animation_number": frame_slice.play_index,
+    })
+
+    scene_class = load_scene_class(
+        frame_slice.module_name, frame_slice.module_file, frame_slice.scene_name
+    )
+    scene = scene_class(random_seed=frame_slice.random_seed)
+    scene.instrumentation.frame_slice = frame_slice
+    tracer = get_tracer()
+    span_name = f"{frame_slice.scene_name} frames {frame_slice.start}-{frame_slice.stop}"
+    try:
+        with tracer.span(span_name, "frame_slice", play=frame_slice.play_index):
+            scene.setup()
+            scene.construct()
+    except FrameSliceComplete:
+        return frame_slice.output_path
+    finally:
+        tracer.save()
+
+    raise RuntimeError(
+        f"{frame_slice.scene_name} finished before animation {frame_slice.play_index}"
+    )
+
+
+def render_slice_frames(scene, frame_slice):
+    """
+    Rasterizes and encodes the frames of a slice in a worker.
+
+    Args:
+        scene: Scene positioned at the start of the sliced animation
+        frame_slice: FrameSlice to render
+    """
+    renderer = scene.renderer
+    segment = FFmpegSegment(
+        frame_slice.output_path,
+        config.pixel_width,
+        config.pixel_height,
+        config.frame_rate,
+        frame_slice.profile,
+    )
+    for t in frame_times(scene.duration)[frame_slice.start:frame_slice.stop]:
+        scene.update_to_time(t)
+        renderer.update_frame(scene, scene.moving_mobjects)
+        segment.write(renderer.get_frame())
+    segment.close()
+    segment.wait()
+
+
+class FrameParallelRenderer:
+    """
+    Dispatches the frames of long animations to a pool of worker processes.
+    """
+
+    def __init__(self, jobs, min_slice_frames=DEFAULT_MIN_SLICE_FRAMES):
+        self.jobs = jobs
+        self.min_slice_frames = min_slice_frames
+        self._pool = None
+
+    def should_split(self, scene):
+        """
+        Decides whether the current animation of a scene is split.
+
+        Args:
+            scene: Scene about to run play_internal
+
+        Returns:
+            True if the animation is rendered by the worker pool
+        """
+        renderer = scene.renderer
+        segment = getattr(renderer.file_writer, "segment", None)
+        if renderer.skip_animations or not write_to_movie() or segment is None or segment.started:
+            return False
+        if all(isinstance(animation, Wait) for animation in scene.animations):
+            return False
+        # Time-based updaters depend on every previous frame, not only on alpha
+        if scene.updaters or any(
+            mob.has_time_based_updater() for mob in scene.get_mobject_family_members()
+        ):
+            return False
+        return len(frame_times(scene.duration)) >= 2 * self.min_slice_frames
+
+    def render_play(self, scene):
+        """
+        Renders the current animation of a scene across the worker pool and
+        stitches the slices into the animation's partial movie file.
+
+        Args:
+            scene: Scene about to run play_internal
+        """
+        file_writer = scene.renderer.file_writer
+        output_path = str(file_writer.partial_movie_file_path)
+        root, ext = os.path.splitext(output_path)
+        frame_count = len(frame_times(scene.duration))
+        workers = min(self.jobs, frame_count // self.min_slice_frames)
+
+        scene_class = type(scene)
+        manim_config = {key: config[key] for key in WORKER_CONFIG_KEYS}
+        manim_config["background_color"] = str(config.background_color)
+        settings = current_settings()
+        settings["frame_jobs"] = None
+
+        slices = [
+            FrameSlice(
+                module_name=scene_class.__module__,
+                module_file=sys.modules[scene_class.__module__].__file__,
+                scene_name=scene_class.__name__,
+                play_index=scene.renderer.num_plays,
+                start=start,
+                stop=stop,
+                output_path=f"{root}.slice{index:03d}{ext}",
+                profile=file_writer.profile,
+                random_seed=scene.random_seed,
+                manim_config=manim_config,
+                settings=settings,
+            )
+            for index, (start, stop) in enumerate(split_frame_range(frame_count, workers))
+        ]
+
+        futures = [self._get_pool().submit(render_frame_slice, frame_slice) for frame_slice in slices]
+        slice_paths = [future.result() for future in futures]
+        try:
+            concat_segments(slice_paths, output_path)
+        finally:
+            for path in slice_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def shutdown(self):
+        """Stops the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Spawned workers do not inherit the encoder threads of this process
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+
+def create_frame_parallel_renderer():
+    """
+    Creates the frame-range parallel renderer selected by the render settings.
+
+    Returns:
+        FrameParallelRenderer, or None when frame-range parallelism is off
+    """
+    jobs = get_int_setting("frame_jobs", 1)
+    if jobs <= 1:
+        return None
+    return FrameParallelRenderer(
+        jobs, get_int_setting("frame_slice_min", DEFAULT_MIN_SLICE_FRAMES)
+    )
@@ -0,0 +1,300 @@
+"""
+KV cache decoding for LLM Explained presentation.
+Keeps the keys and values of every processed token so each decoding step
+only computes attention for the new tokens, as in Part 5's token-by-token
+generation.
+
+Models used by the decoding helpers (AttentionDecoder, and the generation,
+beam search and speculative decoding modules built on it) provide:
+    create_cache(batch_size, capacity) -> KVCache
+    forward(tokens, cache) -> logits of shape (batch, new_tokens, vocab)
+where forward appends the keys/values of the new tokens to the cache.
+"""
+
+import time
+
+import numpy as np
+
+from utils.data_generators import (
+    calculate_multi_head_attention,
+    generate_positional_encoding,
+    merge_heads,
+    split_heads,
+)
+
+# Tokens preallocated by a new cache
+DEFAULT_CAPACITY = 64
+
+
+class KVCache:
+    """
+    Preallocated key/value buffers of every layer.
+
+    Buffers have shape (batch, kv_heads, capacity, head_dim). When a step
+    needs more room the capacity doubles, so appending n tokens copies
+    O(n) values overall instead of concatenating at every step.
+
+    Args:
+        num_layers: Number of attention layers
+        batch_size: Number of sequences decoded together
+        num_kv_heads: Key/value heads per layer
+        head_dim: Dimension of each head
+        capacity: Tokens preallocated
+        dtype: Buffer dtype
+    """
+
+    def __init__(self, num_layers, batch_size, num_kv_heads, head_dim,
+                 capacity=DEFAULT_CAPACITY, dtype=np.float32):
+        shape = (batch_size, num_kv_heads, capacity, head_dim)
+        self.keys = [np.empty(shape, dtype=dtype) for _ in range(num_layers)]
+        self.values = [np.empty(shape, dtype=dtype) for _ in range(num_layers)]
+        self.lengths = [0] * num_layers
+        self.grow_count = 0
+
+    @property
+    def num_layers(self):
+        return len(self.keys)
+
+    @property
+    def batch_size(self):
+        return self.keys[0].shape[0]
+
+    @property
+    def num_kv_heads(self):
+        return self.keys[0].shape[1]
+
+    @property
+    def capacity(self):
+        return self.keys[0].shape[2]
+
+    @property
+    def head_dim(self):
+        return self.keys[0].shape[3]
+
+    @property
+    def length(self):
+        """Tokens cached by every layer."""
+        return min(self.lengths)
+
+    def append(self, layer, K, V):
+        """
+        Appends the keys and values of new tokens to a layer.
+
+        Args:
+            layer: Layer index
+            K: Keys of shape (batch, kv_heads, new_tokens, head_dim)
+            V: Values of the same shape
+
+        Returns:
+            Tuple of (keys, values) views over every cached token of the layer
+        """
+        start = self.lengths[layer]
+        end = start + K.shape[2]
+        if end > self.capacity:
+            self._grow(end)
+        self.keys[layer][:, :, start:end] = K
+        self.values[layer][:, :, start:end] = V
+        self.lengths[layer] = end
+        return self.layer(layer)
+
+    def layer(self, layer):
+        """Returns (keys, values) views over the cached tokens of a layer."""
+        end = self.lengths[layer]
+        return self.keys[layer][:, :, :end], self.values[layer][:, :, :end]
+
+    def _grow(self, required):
+        # A zero capacity would never double
+        capacity = max(self.capacity, 1)
+        while capacity < required:
+            capacity *= 2
+        for buffers in (self.keys, self.values):
+            for layer, old in enumerate(buffers):
+                new = np.empty(old.shape[:2] + (capacity,) + old.shape[3:], dtype=old.dtype)
+                new[:, :, :self.lengths[layer]] = old[:, :, :self.lengths[layer]]
+                buffers[layer] = new
+        self.grow_count += 1
+
+    def reorder(self, indices):
+        """
+        Reorders (and duplicates or drops) sequences of the batch, e.g. to
+        follow surviving beams.
+
+        Args:
+            indices: Source batch row of every new row
+        """
+        indices = np.asarray(indices)
+        for buffers in (self.keys, self.values):
+            for layer, old in enumerate(buffers):
+                end = self.lengths[layer]
+                if len(indices) == old.shape[0]:
+                    # The gather makes a temporary copy, so rows can be overwritten in place
+                    old[:, :, :end] = old[indices, :, :end]
+                else:
+                    new = np.empty((len(indices),) + old.shape[1:], dtype=old.dtype)
+                    new[:, :, :end] = old[indices, :, :end]
+                    buffers[layer] = new
+
+    def truncate(self, length):
+        """
+        Drops cached tokens beyond a length, e.g. rejected speculative tokens.
+
+        Args:
+            length: Tokens kept
+        """
+        self.lengths = [min(layer_length, length) for layer_length in self.lengths]
+
+    def memory_report(self):
+        """
+        Reports cache memory.
+
+        Returns:
+            Dictionary with the cached tokens, capacity, allocated and used
+            bytes, and used bytes per layer, per head and per token
+        """
+        itemsize = self.keys[0].itemsize
+        used = 2 * sum(self.lengths) * self.batch_size * self.num_kv_heads * self.head_dim * itemsize
+        return {
+            "tokens": self.length,
+            "capacity": self.capacity,
+            "allocated_bytes": sum(buffer.nbytes for buffer in self.keys + self.values),
+            "used_bytes": used,
+            "bytes_per_layer": used / self.num_layers,
+            "bytes_per_head": used / (self.num_layers * self.num_kv_heads),
+            "bytes_per_token": used / self.length if self.length else 0,
+            "grow_count": self.grow_count,
+        }
+
+
+def kv_cache_bytes(num_layers, num_kv_heads, head_dim, tokens, batch_size=1, bytes_per_value=2):
+    """
+    Computes the KV cache size of a model, e.g. to compare MHA and GQA on the slides.
+
+    Args:
+        num_layers: Number of layers
+        num_kv_heads: Key/value heads per layer
+        head_dim: Dimension of each head
+        tokens: Context length
+        batch_size: Number of sequences
+        bytes_per_value: 2 for FP16/BF16, 1 for INT8
+
+    Returns:
+        Size in bytes (keys and values)
+    """
+    return 2 * num_layers * num_kv_heads * head_dim * tokens * batch_size * bytes_per_value
+
+
+class AttentionDecoder:
+    """
+    Toy decoder-only language model made of attention layers with seeded
+    random weights: embedding + positional encoding, then per layer Q/K/V
+    projections, cached causal attention (GQA when num_kv_heads < num_heads)
+    and a residual output projection, and a head tied to the embedding.
+
+    Args:
+        vocab_size: Vocabulary size
+        d_model: Model dimension
+        num_layers: Number of attention layers
+        num_heads: Query heads per layer
+        num_kv_heads: Key/value heads per layer (default: num_heads)
+        max_length: Longest sequence (positional encoding size)
+        seed: Weight seed
+        dtype: Weight and activation dtype
+    """
+
+    def __init__(self, vocab_size=1000, d_model=64, num_layers=2, num_heads=4, num_kv_heads=None,
+                 max_length=2048, seed=42, dtype=np.float32):
+        rng = np.random.default_rng(seed)
+        self.vocab_size = vocab_size
+        self.d_model = d_model
+        self.num_heads = num_heads
+        self.num_kv_heads = num_kv_heads or num_heads
+        self.head_dim = d_model // num_heads
+        self.dtype = dtype
+
+        def weights(rows, columns):
+            return (rng.standard_normal((rows, columns)) / np.sqrt(rows)).astype(dtype)
+
+        self.embedding = rng.standard_normal((vocab_size, d_model)).astype(dtype)
+        self.positional = generate_positional_encoding(max_length, d_model).astype(dtype)
+        kv_dim = self.num_kv_heads * self.head_dim
+        self.layers = [
+            {
+                "W_q": weights(d_model, d_model),
+                "W_k": weights(d_model, kv_dim),
+                "W_v": weights(d_model, kv_dim),
+                "W_o": weights(d_model, d_model),
+            }
+            for _ in range(num_layers)
+        ]
+        self.forward_calls = 0
+        self.forward_seconds = 0.0
+
+    def create_cache(self, batch_size=1, capacity=DEFAULT_CAPACITY):
+        return KVCache(len(self.layers), batch_size, self.num_kv_heads, self.head_dim, capacity, self.dtype)
+
+    def forward(self, tokens, cache):
+        """
+        Runs new tokens through the model, attending to every cached token.
+
+        Args:
+            tokens: Token ids of shape (batch, new_tokens)
+            cache: KVCache of the batch, extended with the new tokens
+
+        Returns:
+            Logits of shape (batch, new_tokens, vocab)
+        """
+        start = time.perf_counter()
+        tokens = np.asarray(tokens)
+        positions = np.arange(cache.length, cache.length + tokens.shape[1])
+        x = self.embedding[tokens] + self.positional[positions]
+
+        for index, layer in enumerate(self.layers):
+            Q = split_heads(x @ layer["W_q"], self.num_heads)
+            K, V = cache.append(
+                index,
+                split_heads(x @ layer["W_k"], self.num_kv_heads),
+                split_heads(x @ layer["W_v"], self.num_kv_heads),
+            )
+            attention = calculate_multi_head_attention(Q, K, V, causal=True)
+            x = x + merge_heads(attention) @ layer["W_o"]
+
+        # A scale of the model's dtype: a float64 scalar would promote float32 logits
+        logits = x @ self.embedding.T
+        logits *= np.dtype(self.dtype).type(1 / np.sqrt(self.d_model))
+        self.forward_calls += 1
+        self.forward_seconds += time.perf_counter() - start
+        return logits
+
+
+def greedy_decode(model, prompt, max_new_tokens, cache=None):
+    """
+    Generates tokens one at a time, always picking the most likely one.
+
+    The prompt is processed in one forward pass (prefill); every following
+    step feeds only the last token.
+
+    Args:
+        model: Model with create_cache() and forward() (see module docstring)
+        prompt: Prompt token ids of shape (batch, prompt_length)
+        max_new_tokens: Tokens generated
+        cache: KVCache to continue from (default: a new cache)
+
+    Returns:
+        Dictionary with the generated tokens (batch, max_new_tokens), the
+        seconds of each step (prefill first) and the cache
+    """
+    prompt = np.asarray(prompt)
+    if cache is None:
+        cache = model.create_cache(prompt.shape[0], prompt.shape[1] + max_new_tokens)
+
+    tokens = np.empty((prompt.shape[0], max_new_tokens), dtype=np.int64)
+    step_seconds = []
+    step_input = prompt
+    for step in range(max_new_tokens):
+        start = time.perf_counter()
+        logits = model.forward(step_input, cache)
+        tokens[:, step] = logits[:, -1].argmax(axis=-1)
+        step_input = tokens[:, step:step + 1]
+        step_seconds.append(time.perf_counter() - start)
+
+    return {"tokens": tokens, "step_seconds": step_seconds, "cache": cache}
@@ -0,0 +1,193 @@
+"""
+Logit processors for LLM Explained presentation.
+The API parameters beyond temperature/top-k/top-p: repetition, frequency and
+presence penalties, and logit bias. Processors modify (batch, vocab) logits in
+place, chained by LogitProcessorList before sampling (see utils/sampling.py).
+
+Penalties read per-row token counts (TokenCounts) updated with the tokens of
+every step, so a step costs O(vocab) however long the output already is.
+"""
+
+import numpy as np
+
+
+class TokenCounts:
+    """
+    Occurrences of every token in each sequence of a batch.
+
+    Args:
+        batch_size: Number of sequences
+        vocab_size: Vocabulary size
+        dtype: Count dtype
+    """
+
+    def __init__(self, batch_size, vocab_size, dtype=np.int32):
+        self.counts = np.zeros((batch_size, vocab_size), dtype=dtype)
+
+    @classmethod
+    def from_tokens(cls, tokens, vocab_size):
+        """
+        Counts existing tokens, e.g. the prompt.
+
+        Args:
+            tokens: Token ids of shape (batch, length)
+            vocab_size: Vocabulary size
+
+        Returns:
+            TokenCounts
+        """
+        tokens = np.asarray(tokens)
+        token_counts = cls(tokens.shape[0], vocab_size)
+        token_counts.add(tokens)
+        return token_counts
+
+    def update(self, tokens):
+        """
+        Counts the token generated by every row at one step.
+
+        Args:
+            tokens: Token ids of shape (batch,)
+        """
+        self.counts[np.arange(len(self.counts)), tokens] += 1
+
+    def add(self, tokens):
+        """
+        Counts several tokens per row.
+
+        Args:
+            tokens: Token ids of shape (batch, length)
+        """
+        tokens = np.asarray(tokens)
+        rows = np.repeat(np.arange(len(self.counts)), tokens.shape[1])
+        # Unlike counts[rows, tokens] += 1, add.at counts repeated tokens of a row
+        np.add.at(self.counts, (rows, tokens.ravel()), 1)
+
+    def reorder(self, indices):
+        """Reorders the rows, e.g. to follow surviving beams."""
+        self.counts = self.counts[np.asarray(indices)]
+
+    def presence(self):
+        """Returns a boolean (batch, vocab) array of the tokens seen by every row."""
+        return self.counts > 0
+
+
+class RepetitionPenalty:
+    """
+    Repetition penalty (Hugging Face, CTRL paper): logits of already seen
+    tokens are divided by the penalty when positive and multiplied by it when
+    negative, so values above 1 always make repetitions less likely.
+
+    Args:
+        penalty: Penalty (1.0 disables it)
+    """
+
+    def __init__(self, penalty):
+        if penalty <= 0:
+            raise ValueError(f"Repetition penalty must be positive, got {penalty}")
+        self.penalty = penalty
+
+    def __call__(self, logits, token_counts):
+        seen = token_counts.presence()
+        positive = logits > 0
+        np.divide(logits, self.penalty, out=logits, where=seen & positive)
+        np.multiply(logits, self.penalty, out=logits, where=seen & ~positive)
+        return logits
+
+
+class FrequencyPenalty:
+    """
+    Frequency penalty (OpenAI): subtracts penalty * count from every token's
+    logit, discouraging tokens in proportion to how often they appeared.
+
+    Args:
+        penalty: Penalty, typically between -2.0 and 2.0
+    """
+
+    def __init__(self, penalty):
+        self.penalty = penalty
+
+    def __call__(self, logits, token_counts):
+        logits -= np.multiply(token_counts.counts, self.penalty, dtype=logits.dtype)
+        return logits
+
+
+class PresencePenalty:
+    """
+    Presence penalty (OpenAI): subtracts the penalty once from every token
+    that already appeared, encouraging new topics.
+
+    Args:
+        penalty: Penalty, typically between -2.0 and 2.0
+    """
+
+    def __init__(self, penalty):
+        self.penalty = penalty
+
+    def __call__(self, logits, token_counts):
+        np.subtract(logits, self.penalty, out=logits, where=token_counts.presence())
+        return logits
+
+
+class LogitBias:
+    """
+    Logit bias (OpenAI): adds a fixed value to chosen tokens; -100 bans a
+    token and 100 forces it.
+
+    Args:
+        bias: Dictionary mapping token ids to biases
+    """
+
+    def __init__(self, bias):
+        self.token_ids = np.fromiter(bias.keys(), dtype=np.int64, count=len(bias))
+        self.values = np.fromiter(bias.values(), dtype=np.float64, count=len(bias))
+
+    def __call__(self, logits, token_counts=None):
+        logits[:, self.token_ids] += self.values.astype(logits.dtype)
+        return logits
+
+
+class LogitProcessorList(list):
+    """
+    Processors applied in order to the same logits.
+    """
+
+    def __call__(self, logits, token_counts):
+        """
+        Applies every processor in place.
+
+        Args:
+            logits: Array of shape (batch, vocab), modified in place
+            token_counts: TokenCounts of the batch
+
+        Returns:
+            The logits array
+        """
+        for processor in self:
+            logits = processor(logits, token_counts)
+        return logits
+
+
+def create_logit_processors(repetition_penalty=None, frequency_penalty=None, presence_penalty=None,
+                            logit_bias=None):
+    """
+    Builds the processor chain of API-style generation parameters.
+
+    Args:
+        repetition_penalty: Hugging Face repetition penalty (None or 1.0: off)
+        frequency_penalty: OpenAI frequency penalty (None or 0: off)
+        presence_penalty: OpenAI presence penalty (None or 0: off)
+        logit_bias: Dictionary mapping token ids to biases
+
+    Returns:
+        LogitProcessorList
+    """
+    processors = LogitProcessorList()
+    if repetition_penalty not in (None, 1.0):
+        processors.append(RepetitionPenalty(repetition_penalty))
+    if frequency_penalty:
+        processors.append(FrequencyPenalty(frequency_penalty))
+    if presence_penalty:
+        processors.append(PresencePenalty(presence_penalty))
+    if logit_bias:
+        processors.append(LogitBias(logit_bias))
+    return processors
@@ -0,0 +1,277 @@
+"""
+Memory profiling for LLM Explained presentation.
+Opt-in (LLM_SLIDES_MEMORY_PROFILE=1, render.py --memory-profile): samples the
+resident set size while a scene renders, records tracemalloc top allocators at
+every next_slide() and checks for memory retained between scenes rendered in
+the same process. tracemalloc only runs while a scene renders; the retained
+memory check compares the RSS and live objects per type between scene starts.
+The per-scene peaks feed the memory-aware scheduler.
+"""
+
+import collections
+import gc
+import json
+import os
+import sys
+import threading
+import tracemalloc
+
+from utils.render_settings import get_flag
+
+# Interval of the RSS sampling thread
+RSS_SAMPLE_SECONDS = 0.05
+
+# Allocators listed per slide
+TOP_ALLOCATORS = 10
+
+# RSS growth between scene starts above which the previous scene is reported as a leak suspect
+LEAK_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# (scene name, RSS, live objects per type) at the start of the previous scene of this process
+_previous_scene = None
+
+
+def current_rss():
+    """
+    Returns the resident set size of the current process.
+
+    Returns:
+        RSS in bytes (the peak RSS where the current value is unavailable),
+        or None where neither is available (e.g. on Windows)
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        # Unix only
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _rss():
+    return current_rss() or 0
+
+
+def live_object_counts():
+    """
+    Counts the objects tracked by the garbage collector per type.
+
+    Returns:
+        Counter mapping type names to object counts
+    """
+    return collections.Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def top_allocators(snapshot, limit=TOP_ALLOCATORS):
+    """
+    Lists the source lines holding the most traced memory.
+
+    Args:
+        snapshot: tracemalloc snapshot
+        limit: Number of lines
+
+    Returns:
+        List of dictionaries (where, size_bytes, count)
+    """
+    return [
+        {"where": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+class SceneMemoryProfiler:
+    """
+    Memory profile of one scene render.
+    A sampling thread tracks the RSS peak between checkpoints, since frame
+    buffers peak in the middle of animations rather than at slide boundaries.
+    RSS figures are 0 where current_rss() is unavailable; tracemalloc figures
+    are still recorded.
+    """
+
+    def __init__(self, scene_name, top=TOP_ALLOCATORS):
+        self.scene_name = scene_name
+        self.top = top
+        self.slides = []
+        self.peak_rss = 0
+        self.start_rss = None
+        self.start_traced = 0
+        self.retained = None
+        self._slide_peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_tracing = False
+
+    def start(self):
+        """Checks what the previous scene left behind, then starts tracing."""
+        global _previous_scene
+
+        gc.collect()
+        rss = _rss()
+        counts = live_object_counts()
+        if _previous_scene is not None:
+            self.retained = self._leak_check(*_previous_scene, rss, counts)
+        _previous_scene = (self.scene_name, rss, counts)
+
+        # Tracing slows every allocation down, so it only runs until finish()
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.start_traced, _ = tracemalloc.get_traced_memory()
+        self.start_rss = _rss()
+        self.peak_rss = self._slide_peak = self.start_rss
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def _sample(self):
+        while not self._stop.wait(RSS_SAMPLE_SECONDS):
+            rss = _rss()
+            self._slide_peak = max(self._slide_peak, rss)
+            self.peak_rss = max(self.peak_rss, rss)
+
+    def _leak_check(self, previous_name, previous_rss, previous_counts, rss, counts):
+        growth = rss - previous_rss
+        counts.subtract(previous_counts)
+        suspects = [
+            {"type": name, "count_diff": count_diff}
+            for name, count_diff in counts.most_common(self.top)
+            if count_diff > 0
+        ]
+        return {
+            "previous_scene": previous_name,
+            "growth_bytes": growth,
+            "leak_suspected": growth > LEAK_THRESHOLD_BYTES,
+            "top_growth": suspects,
+        }
+
+    def checkpoint(self):
+        """Records memory at a slide boundary."""
+        rss = _rss()
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        self.slides.append({
+            "slide": len(self.slides),
+            "rss_bytes": rss,
+            "peak_rss_bytes": max(self._slide_peak, rss),
+            "traced_bytes": traced,
+            "traced_peak_bytes": traced_peak,
+            "top_allocators": top_allocators(tracemalloc.take_snapshot(), self.top),
+        })
+        self._slide_peak = rss
+
+    def finish(self):
+        """
+        Stops sampling, and tracing if start() enabled it.
+
+        Returns:
+            Report dictionary of the scene
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.peak_rss = max(self.peak_rss, _rss())
+        _, traced_peak = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return {
+            "scene": self.scene_name,
+            "start_rss_bytes": self.start_rss,
+            "peak_rss_bytes": self.peak_rss,
+            "scene_peak_bytes": self.peak_rss - self.start_rss,
+            "traced_peak_bytes": traced_peak - self.start_traced,
+            "slides": self.slides,
+            "retained_from_previous_scene": self.retained,
+        }
+
+
+def create_memory_profiler(scene_name):
+    """
+    Creates the memory profiler of a scene when profiling is enabled.
+
+    Args:
+        scene_name: Scene class name
+
+    Returns:
+        SceneMemoryProfiler, or None when the memory_profile setting is off
+    """
+    if not get_flag("memory_profile"):
+        return None
+    return SceneMemoryProfiler(scene_name)
+
+
+def write_memory_report(reports, path, quality):
+    """
+    Writes scene memory reports, keeping the reports of scenes not rendered
+    this time and of other qualities.
+
+    Args:
+        reports: List of SceneMemoryProfiler.finish() dictionaries
+        path: JSON report path
+        quality: manim quality the reports were measured at (e.g. "high_quality")
+    """
+    existing = {}
+    if os.path.exists(path):
+        with open(path) as report_file:
+            existing = json.load(report_file).get("qualities", {})
+
+    scenes = existing.setdefault(quality, {})
+    for report in reports:
+        scenes[report["scene"]] = report
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as report_file:
+        json.dump({"qualities": existing}, report_file, indent=2)
+
+
+def load_memory_estimates(path, quality):
+    """
+    Loads the peak memory of each scene from a memory report.
+
+    Args:
+        path: JSON report path
+        quality: manim quality name (e.g. "high_quality")
+
+    Returns:
+        Dictionary mapping scene names to peak RSS in bytes (empty without a report)
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as report_file:
+        scenes = json.load(report_file).get("qualities", {}).get(quality, {})
+    # Peaks of 0 were measured without RSS support and estimate nothing
+    return {name: report["peak_rss_bytes"] for name, report in scenes.items() if report["peak_rss_bytes"]}
+
+
+def format_memory_report(reports):
+    """
+    Formats scene memory reports as a text table, heaviest scenes first.
+
+    Args:
+        reports: List of SceneMemoryProfiler.finish() dictionaries
+
+    Returns:
+        Report string
+    """
+    header = f"{'Scene':<40} {'Peak RSS (MB)':>14} {'Scene (MB)':>11} {'Traced (MB)':>12} {'Leak check':>12}"
+    lines = [header, "-" * len(header)]
+    for report in sorted(reports, key=lambda report: report["peak_rss_bytes"], reverse=True):
+        retained = report["retained_from_previous_scene"]
+        leak = "-"
+        if retained is not None:
+            leak = f"{'LEAK ' if retained['leak_suspected'] else ''}{retained['growth_bytes'] / 1e6:+.1f}"
+        lines.append(
+            f"{report['scene']:<40} {report['peak_rss_bytes'] / 1e6:>14.1f} "
+            f"{report['scene_peak_bytes'] / 1e6:>11.1f} {report['traced_peak_bytes'] / 1e6:>12.1f} {leak:>12}"
+        )
+    return "\n".join(lines)
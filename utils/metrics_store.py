@@ -0,0 +1,312 @@
+"""
+Metrics history for LLM Explained presentation.
+Renders, dry runs and benchmarks append one row per scene (or benchmark
+case) to a local SQLite database, tagged with the git commit, so build
+timings survive CI logs and feed the scene scheduler.
+"""
+
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import time
+
+from utils.render_settings import get_flag, get_setting
+
+DEFAULT_METRICS_DB = os.path.join("media", "metrics.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    scene TEXT NOT NULL,
+    quality TEXT,
+    git_commit TEXT,
+    wall_seconds REAL,
+    frames INTEGER,
+    output_bytes INTEGER,
+    peak_memory_bytes INTEGER,
+    cache_hits INTEGER,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS metrics_lookup ON metrics (kind, quality, scene, recorded_at);
+CREATE INDEX IF NOT EXISTS metrics_commit ON metrics (git_commit);
+"""
+
+METRIC_COLUMNS = ("wall_seconds", "frames", "output_bytes", "peak_memory_bytes", "cache_hits")
+
+_git_commit = None
+
+
+def current_git_commit():
+    """
+    Returns the short hash of the checked out commit, with a "-dirty" suffix
+    when the working tree has uncommitted changes.
+
+    Returns:
+        Commit string, or None outside a git repository
+    """
+    global _git_commit
+    if _git_commit is None:
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+            dirty = subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        _git_commit = f"{commit}-dirty" if dirty else commit
+    return _git_commit
+
+
+class MetricsStore:
+    """
+    SQLite metrics history.
+    """
+
+    def __init__(self, path=DEFAULT_METRICS_DB):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def record(self, kind, scene, quality=None, git_commit=None, extra=None, **metrics):
+        """
+        Appends one measurement.
+
+        Args:
+            kind: Measurement kind ("render", "dry_run", "benchmark:<suite>")
+            scene: Scene class name or benchmark case id
+            quality: Quality name (e.g. "high_quality"), None when not applicable
+            git_commit: Commit measured (default: the checked out commit)
+            extra: Additional JSON-serializable values
+            metrics: Values of METRIC_COLUMNS
+        """
+        self.record_many(kind, [dict(metrics, scene=scene, extra=extra)], quality, git_commit)
+
+    def record_many(self, kind, rows, quality=None, git_commit=None):
+        """
+        Appends several measurements in one transaction.
+
+        Args:
+            kind: Measurement kind
+            rows: Dictionaries with "scene", optional METRIC_COLUMNS values and "extra"
+            quality: Quality name
+            git_commit: Commit measured (default: the checked out commit)
+        """
+        git_commit = git_commit or current_git_commit()
+        now = time.time()
+        values = [
+            (
+                now, kind, row["scene"], quality, git_commit,
+                *(row.get(column) for column in METRIC_COLUMNS),
+                json.dumps(row["extra"]) if row.get("extra") is not None else None,
+            )
+            for row in rows
+        ]
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO metrics (recorded_at, kind, scene, quality, git_commit, "
+                f"{', '.join(METRIC_COLUMNS)}, extra) VALUES ({', '.join('?' * (6 + len(METRIC_COLUMNS)))})",
+                values,
+            )
+
+    def trend(self, scene, kind="render", quality=None, metric="wall_seconds", limit=20):
+        """
+        Returns the median of a metric per commit for one scene, oldest first.
+
+        Args:
+            scene: Scene class name or benchmark case id
+            kind: Measurement kind
+            quality: Quality name (None: any)
+            metric: One of METRIC_COLUMNS
+            limit: Number of most recent commits
+
+        Returns:
+            List of (git_commit, first recorded_at, median value, sample count)
+        """
+        rows = self._query(
+            f"SELECT git_commit, recorded_at, {metric} AS value FROM metrics "
+            f"WHERE kind = ? AND scene = ? AND {metric} IS NOT NULL" + self._quality_filter(quality)
+            + " ORDER BY recorded_at",
+            [kind, scene] + self._quality_args(quality),
+        )
+        commits = {}
+        for row in rows:
+            entry = commits.setdefault(row["git_commit"], [row["recorded_at"], []])
+            entry[1].append(row["value"])
+        trend = [
+            (commit, first, statistics.median(values), len(values))
+            for commit, (first, values) in commits.items()
+        ]
+        trend.sort(key=lambda entry: entry[1])
+        return trend[-limit:]
+
+    def latest(self, kind="render", quality=None, metric="wall_seconds", samples=5):
+        """
+        Returns the median of the most recent samples of a metric per scene.
+
+        Args:
+            kind: Measurement kind
+            quality: Quality name (None: any)
+            metric: One of METRIC_COLUMNS
+            samples: Number of most recent samples per scene
+
+        Returns:
+            Dictionary mapping scenes to values
+        """
+        rows = self._query(
+            f"SELECT scene, {metric} AS value FROM metrics "
+            f"WHERE kind = ? AND {metric} IS NOT NULL" + self._quality_filter(quality)
+            + " ORDER BY recorded_at DESC",
+            [kind] + self._quality_args(quality),
+        )
+        values = {}
+        for row in rows:
+            scene_values = values.setdefault(row["scene"], [])
+            if len(scene_values) < samples:
+                scene_values.append(row["value"])
+        return {scene: statistics.median(scene_values) for scene, scene_values in values.items()}
+
+    def slowest(self, kind="render", quality=None, metric="wall_seconds", limit=10):
+        """
+        Returns the scenes with the highest recent value of a metric.
+
+        Returns:
+            List of (scene, value), highest first
+        """
+        latest = self.latest(kind, quality, metric)
+        return sorted(latest.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def commit_medians(self, git_commit, kind="render", quality=None, metric="wall_seconds"):
+        """
+        Returns the median of a metric per scene for one commit.
+
+        Returns:
+            Dictionary mapping scenes to values
+        """
+        rows = self._query(
+            f"SELECT scene, {metric} AS value FROM metrics "
+            f"WHERE kind = ? AND git_commit = ? AND {metric} IS NOT NULL" + self._quality_filter(quality),
+            [kind, git_commit] + self._quality_args(quality),
+        )
+        values = {}
+        for row in rows:
+            values.setdefault(row["scene"], []).append(row["value"])
+        return {scene: statistics.median(scene_values) for scene, scene_values in values.items()}
+
+    def regressions(self, base_commit, head_commit, kind="render", quality=None,
+                    metric="wall_seconds", tolerance=0.1):
+        """
+        Compares two commits scene by scene.
+
+        Args:
+            base_commit: Reference commit
+            head_commit: Compared commit
+            kind: Measurement kind
+            quality: Quality name (None: any)
+            metric: One of METRIC_COLUMNS
+            tolerance: Relative increase reported as a regression
+
+        Returns:
+            List of (scene, base value, head value, ratio) above the tolerance, worst first
+        """
+        base = self.commit_medians(base_commit, kind, quality, metric)
+        head = self.commit_medians(head_commit, kind, quality, metric)
+        regressions = [
+            (scene, base[scene], head[scene], head[scene] / base[scene])
+            for scene in base.keys() & head.keys()
+            if base[scene] and head[scene] > base[scene] * (1 + tolerance)
+        ]
+        return sorted(regressions, key=lambda entry: entry[3], reverse=True)
+
+    def _query(self, sql, args):
+        return self.connection.execute(sql, args).fetchall()
+
+    @staticmethod
+    def _quality_filter(quality):
+        return "" if quality is None else " AND quality = ?"
+
+    @staticmethod
+    def _quality_args(quality):
+        return [] if quality is None else [quality]
+
+
+def open_metrics_store():
+    """
+    Opens the metrics history selected by the render settings.
+
+    Returns:
+        MetricsStore, or None when LLM_SLIDES_METRICS=0
+    """
+    if not get_flag("metrics", default=True):
+        return None
+    return MetricsStore(get_setting("metrics_db", DEFAULT_METRICS_DB))
+
+
+def record_metrics(kind, rows, quality=None):
+    """
+    Appends measurements to the metrics history, if enabled.
+
+    Args:
+        kind: Measurement kind ("render", "dry_run", "benchmark:<suite>")
+        rows: Dictionaries with "scene", optional METRIC_COLUMNS values and "extra"
+        quality: Quality name
+    """
+    store = open_metrics_store()
+    if store is None or not rows:
+        return
+    try:
+        store.record_many(kind, rows, quality)
+    finally:
+        store.close()
+
+
+def load_time_estimates(quality, kind="render"):
+    """
+    Loads the recent wall time of each scene from the metrics history.
+
+    Args:
+        quality: Quality name (e.g. "high_quality")
+        kind: Measurement kind
+
+    Returns:
+        Dictionary mapping scene names to seconds (empty when disabled or unrecorded)
+    """
+    return _load_latest(kind, quality, "wall_seconds")
+
+
+def load_peak_memory_estimates(quality, kind="render"):
+    """
+    Loads the recent peak RSS of each profiled scene from the metrics history.
+
+    Args:
+        quality: Quality name
+        kind: Measurement kind
+
+    Returns:
+        Dictionary mapping scene names to bytes
+    """
+    return _load_latest(kind, quality, "peak_memory_bytes")
+
+
+def _load_latest(kind, quality, metric):
+    store = open_metrics_store()
+    if store is None:
+        return {}
+    try:
+        return store.latest(kind, quality, metric)
+    finally:
+        store.close()
@@ -0,0 +1,236 @@
+"""
+CPU profiling for LLM Explained presentation.
+Opt-in (LLM_SLIDES_PROFILE_DIR, render.py --profile): wraps each scene render
+in cProfile and a stack sampler, and writes <scene>.pstats plus a
+<scene>.collapsed stack file (flamegraph.pl, speedscope and inferno read it).
+The per-scene profiles are merged into a deck-wide hotspot table.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+
+from utils.render_settings import get_setting
+
+# Interval of the stack sampling thread
+SAMPLE_SECONDS = 0.005
+
+# Functions listed in the hotspot table
+HOTSPOT_ROWS = 25
+
+
+def frame_label(code):
+    """
+    Labels a code object for collapsed stacks.
+
+    Args:
+        code: Code object
+
+    Returns:
+        "function (file.py:line)" string without the ";" separator
+    """
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+class StackSampler:
+    """
+    Samples the Python stack of one thread at a fixed interval.
+    Unlike cProfile, samples keep whole call paths, which a flame graph needs.
+    """
+
+    def __init__(self, interval=SAMPLE_SECONDS):
+        self.interval = interval
+        self.samples = Counter()
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Starts sampling the calling thread."""
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write_collapsed(self, path):
+        """
+        Writes the samples in collapsed stack format ("root;...;leaf count").
+
+        Args:
+            path: Output path
+        """
+        with open(path, "w") as collapsed_file:
+            for stack, count in self.samples.most_common():
+                collapsed_file.write(f"{stack} {count}\n")
+
+
+class SceneProfiler:
+    """
+    CPU profile of one scene render.
+    """
+
+    def __init__(self, scene_name, output_dir, interval=SAMPLE_SECONDS):
+        self.scene_name = scene_name
+        self.output_dir = output_dir
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(interval)
+
+    def start(self):
+        self.sampler.start()
+        self.profile.enable()
+
+    def finish(self):
+        """
+        Stops profiling and writes the scene's profile files.
+
+        Returns:
+            Dictionary with the scene name, pstats and collapsed stack paths,
+            and the number of stack samples
+        """
+        self.profile.disable()
+        self.sampler.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        pstats_path = os.path.join(self.output_dir, f"{self.scene_name}.pstats")
+        collapsed_path = os.path.join(self.output_dir, f"{self.scene_name}.collapsed")
+        self.profile.dump_stats(pstats_path)
+        self.sampler.write_collapsed(collapsed_path)
+        return {
+            "scene": self.scene_name,
+            "pstats": pstats_path,
+            "collapsed": collapsed_path,
+            "samples": sum(self.sampler.samples.values()),
+        }
+
+
+def create_scene_profiler(scene_name):
+    """
+    Creates the CPU profiler of a scene when profiling is enabled.
+
+    Args:
+        scene_name: Scene class name
+
+    Returns:
+        SceneProfiler, or None when the profile_dir setting is not defined
+    """
+    output_dir = get_setting("profile_dir")
+    if not output_dir:
+        return None
+    return SceneProfiler(scene_name, output_dir)
+
+
+def function_name(key):
+    """
+    Formats a pstats function key as "path/module.py:line(function)", keeping
+    the last directories of the path so manim and repository functions read alike.
+
+    Args:
+        key: (filename, line, function) tuple
+
+    Returns:
+        Function name string
+    """
+    filename, line, name = key
+    if filename == "~":
+        # Built-in and C extension functions, such as "<method 'fill' of 'cairo.Context' objects>"
+        return name
+    path = "/".join(filename.replace(os.sep, "/").split("/")[-3:])
+    return f"{path}:{line}({name})"
+
+
+def function_package(key):
+    """
+    Returns the top-level package a pstats function belongs to (manim, cairo,
+    numpy, utils, scenes, ...), used to roll hotspots up by library.
+    """
+    filename, _, name = key
+    if filename == "~":
+        for package in ("cairo", "numpy"):
+            if package in name:
+                return package
+        return "builtins"
+    parts = filename.replace(os.sep, "/").split("/")
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            return parts[parts.index(marker) + 1].split(".")[0]
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if os.path.abspath(filename).startswith(repo_root):
+        return os.path.relpath(os.path.abspath(filename), repo_root).split(os.sep)[0].removesuffix(".py")
+    return "stdlib"
+
+
+def merge_profiles(reports, output_dir):
+    """
+    Merges scene profiles into deck.pstats and deck.collapsed.
+
+    Args:
+        reports: List of SceneProfiler.finish() dictionaries
+        output_dir: Profile directory
+
+    Returns:
+        Merged pstats.Stats, or None without reports
+    """
+    if not reports:
+        return None
+    stats = pstats.Stats(*(report["pstats"] for report in reports))
+    stats.dump_stats(os.path.join(output_dir, "deck.pstats"))
+
+    samples = Counter()
+    for report in reports:
+        with open(report["collapsed"]) as collapsed_file:
+            for line in collapsed_file:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                samples[stack] += int(count)
+    with open(os.path.join(output_dir, "deck.collapsed"), "w") as collapsed_file:
+        for stack, count in samples.most_common():
+            collapsed_file.write(f"{stack} {count}\n")
+    return stats
+
+
+def format_hotspots(stats, limit=HOTSPOT_ROWS):
+    """
+    Formats the functions with the most self time, then self time per package.
+
+    Args:
+        stats: pstats.Stats
+        limit: Number of functions listed
+
+    Returns:
+        Report string
+    """
+    total = stats.total_tt or 1.0
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+
+    header = f"{'Self (s)':>9} {'Self %':>7} {'Cumul. (s)':>11} {'Calls':>10}  Function"
+    lines = [header, "-" * len(header)]
+    for key, (_, calls, self_seconds, cumulative_seconds, _) in rows[:limit]:
+        lines.append(
+            f"{self_seconds:>9.2f} {self_seconds / total:>7.1%} {cumulative_seconds:>11.2f} {calls:>10}  "
+            f"{function_name(key)}"
+        )
+
+    packages = Counter()
+    for key, (_, _, self_seconds, _, _) in stats.stats.items():
+        packages[function_package(key)] += self_seconds
+    lines += ["", f"{'Self (s)':>9} {'Self %':>7}  Package", "-" * len(header)]
+    for package, self_seconds in packages.most_common():
+        lines.append(f"{self_seconds:>9.2f} {self_seconds / total:>7.1%}  {package}")
+    return "\n".join(lines)
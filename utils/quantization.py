@@ -0,0 +1,265 @@
+"""
+Weight quantization for LLM Explained presentation.
+Generalizes generate_quantization_example (one value, int() truncation) to
+whole weight arrays: INT8/INT4, symmetric or asymmetric (zero point), with
+one scale per tensor, per output channel or per group of consecutive
+weights. Values are rounded to the nearest level, INT4 values are packed two
+per byte, and error and memory reports give the quantization slides (Part 7)
+numbers from real tensors.
+"""
+
+import numpy as np
+
+GRANULARITIES = ("tensor", "channel", "group")
+
+# Weights sharing a scale in group-wise quantization (as in GPTQ/AWQ)
+DEFAULT_GROUP_SIZE = 128
+
+
+def quantization_range(bits, symmetric=True):
+    """
+    Returns the integer levels of a quantization scheme.
+
+    Symmetric schemes use a range centered on zero ([-127, 127] for INT8,
+    [-7, 7] for INT4) so zero stays exact without a zero point; asymmetric
+    schemes use every unsigned level ([0, 255], [0, 15]).
+
+    Args:
+        bits: 8 or 4
+        symmetric: Whether the scheme is symmetric
+
+    Returns:
+        Tuple of (lowest, highest) level
+    """
+    if bits not in (4, 8):
+        raise ValueError(f"Only 8 and 4 bit quantization are supported, got {bits}")
+    if symmetric:
+        return -(2 ** (bits - 1) - 1), 2 ** (bits - 1) - 1
+    return 0, 2 ** bits - 1
+
+
+def _to_blocks(weights, granularity, axis, group_size):
+    # Rows of the returned 2-D array share one scale
+    if granularity == "tensor":
+        return weights.reshape(1, -1)
+    channels = np.moveaxis(weights, axis, 0).reshape(weights.shape[axis], -1)
+    if granularity == "channel":
+        return channels
+    if channels.shape[1] % group_size:
+        raise ValueError(f"{channels.shape[1]} weights per channel do not split into groups of {group_size}")
+    return channels.reshape(-1, group_size)
+
+
+def _from_blocks(blocks, shape, granularity, axis):
+    if granularity == "tensor":
+        return blocks.reshape(shape)
+    moved = (shape[axis],) + shape[:axis] + shape[axis + 1:]
+    return np.moveaxis(blocks.reshape(moved), 0, axis)
+
+
+def pack_int4(values):
+    """
+    Packs 4-bit values two per byte (first value in the low nibble).
+
+    Args:
+        values: Integer array with values in [-8, 15]
+
+    Returns:
+        uint8 array of ceil(size / 2) bytes
+    """
+    nibbles = np.asarray(values).ravel().astype(np.uint8) & 0x0F
+    if len(nibbles) % 2:
+        nibbles = np.append(nibbles, np.uint8(0))
+    return nibbles[0::2] | (nibbles[1::2] << 4)
+
+
+def unpack_int4(packed, count, signed=True):
+    """
+    Unpacks bytes written by pack_int4.
+
+    Args:
+        packed: uint8 array
+        count: Number of values
+        signed: Whether nibbles are two's complement ([-8, 7]) or unsigned ([0, 15])
+
+    Returns:
+        int8 array of count values
+    """
+    values = np.empty(2 * len(packed), dtype=np.uint8)
+    values[0::2] = packed & 0x0F
+    values[1::2] = packed >> 4
+    values = values[:count].view(np.int8)
+    if signed:
+        # Sign-extends the nibble: 8..15 become -8..-1
+        values = (values ^ 8) - 8
+    return values.astype(np.int8, copy=False)
+
+
+class QuantizedTensor:
+    """
+    Quantized weights with their scales and zero points.
+
+    Args:
+        data: int8/uint8 levels, or packed INT4 bytes
+        scales: float32 scale of every block
+        zero_points: Level representing 0.0 in every block (None when symmetric)
+        shape: Original shape
+        bits: 8 or 4
+        granularity: "tensor", "channel" or "group"
+        axis: Channel axis
+        group_size: Weights per group
+    """
+
+    def __init__(self, data, scales, zero_points, shape, bits, granularity, axis, group_size):
+        self.data = data
+        self.scales = scales
+        self.zero_points = zero_points
+        self.shape = shape
+        self.bits = bits
+        self.granularity = granularity
+        self.axis = axis
+        self.group_size = group_size
+
+    @property
+    def symmetric(self):
+        return self.zero_points is None
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        """Bytes of the levels, scales and zero points."""
+        return self.data.nbytes + self.scales.nbytes + (0 if self.symmetric else self.zero_points.nbytes)
+
+    def levels(self):
+        """Returns the integer levels in the original shape (INT4 unpacked)."""
+        if self.bits == 4:
+            values = unpack_int4(self.data, self.size, signed=self.symmetric)
+        else:
+            values = self.data
+        return values.reshape(self.shape)
+
+    def dequantize(self, dtype=np.float32):
+        """
+        Converts the levels back to real values: (level - zero_point) * scale.
+
+        Args:
+            dtype: Output dtype
+
+        Returns:
+            Array of the original shape
+        """
+        levels = self.levels()
+        blocks = _to_blocks(levels, self.granularity, self.axis, self.group_size).astype(dtype)
+        if not self.symmetric:
+            blocks -= self.zero_points[:, np.newaxis]
+        blocks *= self.scales[:, np.newaxis].astype(dtype)
+        return _from_blocks(blocks, self.shape, self.granularity, self.axis)
+
+
+def quantize(weights, bits=8, symmetric=True, granularity="channel", axis=0, group_size=DEFAULT_GROUP_SIZE):
+    """
+    Quantizes a weight array.
+
+    Symmetric: scale = max|w| / highest level, level = round(w / scale).
+    Asymmetric: scale = (max - min) / (levels - 1), zero_point = round(-min / scale),
+    level = round(w / scale) + zero_point. Levels are rounded to the nearest
+    integer (not truncated) and clipped to the scheme's range.
+
+    Args:
+        weights: Array to quantize
+        bits: 8 or 4
+        symmetric: Whether to use a symmetric scheme
+        granularity: One scale per "tensor", per "channel" along axis, or
+            per "group" of group_size consecutive weights within a channel
+        axis: Channel axis (e.g. 0 for the output rows of a (out, in) matrix)
+        group_size: Weights per group
+
+    Returns:
+        QuantizedTensor
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity '{granularity}', expected one of {GRANULARITIES}")
+    weights = np.asarray(weights, dtype=np.float32)
+    axis = axis % weights.ndim if weights.ndim else 0
+    lowest, highest = quantization_range(bits, symmetric)
+    blocks = _to_blocks(weights, granularity, axis, group_size)
+
+    if symmetric:
+        scales = np.abs(blocks).max(axis=-1) / highest
+        zero_points = None
+    else:
+        minimum = np.minimum(blocks.min(axis=-1), 0)
+        maximum = np.maximum(blocks.max(axis=-1), 0)
+        scales = (maximum - minimum) / (highest - lowest)
+    # All-zero blocks: any scale represents them exactly
+    scales = np.where(scales > 0, scales, 1).astype(np.float32)
+
+    levels = blocks / scales[:, np.newaxis]
+    if not symmetric:
+        zero_points = np.clip(np.rint(-minimum / scales), lowest, highest).astype(np.uint8)
+        levels += zero_points[:, np.newaxis]
+    np.rint(levels, out=levels)
+    np.clip(levels, lowest, highest, out=levels)
+    levels = _from_blocks(levels.astype(np.int8 if symmetric else np.uint8), weights.shape, granularity, axis)
+
+    data = pack_int4(levels) if bits == 4 else np.ascontiguousarray(levels)
+    return QuantizedTensor(data, scales, zero_points, weights.shape, bits, granularity, axis, group_size)
+
+
+def quantization_error(original, dequantized):
+    """
+    Measures the error of quantized weights.
+
+    Args:
+        original: Original array
+        dequantized: Dequantized array of the same shape
+
+    Returns:
+        Dictionary with the maximum absolute error, mean squared error and
+        signal-to-noise ratio in dB
+    """
+    original = np.asarray(original, dtype=np.float64)
+    error = original - dequantized
+    mse = float(np.mean(np.square(error)))
+    signal = float(np.mean(np.square(original)))
+    return {
+        "max_abs_error": float(np.abs(error).max()),
+        "mse": mse,
+        "snr_db": 10 * np.log10(signal / mse) if mse > 0 else float("inf"),
+    }
+
+
+def quantization_report(weights, bits=8, symmetric=True, granularity="channel", axis=0,
+                        group_size=DEFAULT_GROUP_SIZE, original_bytes_per_value=2):
+    """
+    Quantizes weights and reports error and memory, e.g. for the slides.
+
+    Args:
+        weights: Array to quantize
+        bits: 8 or 4
+        symmetric: Whether to use a symmetric scheme
+        granularity: "tensor", "channel" or "group"
+        axis: Channel axis
+        group_size: Weights per group
+        original_bytes_per_value: Size of the unquantized values (2 for FP16, 4 for FP32)
+
+    Returns:
+        Dictionary with the scheme, error statistics, original and quantized
+        bytes, bytes saved, compression ratio and the QuantizedTensor
+    """
+    quantized = quantize(weights, bits, symmetric, granularity, axis, group_size)
+    original_bytes = quantized.size * original_bytes_per_value
+    return {
+        "bits": bits,
+        "symmetric": symmetric,
+        "granularity": granularity,
+        **quantization_error(weights, quantized.dequantize()),
+        "original_bytes": original_bytes,
+        "quantized_bytes": quantized.nbytes,
+        "saved_bytes": original_bytes - quantized.nbytes,
+        "compression": original_bytes / quantized.nbytes,
+        "quantized": quantized,
+    }
@@ -0,0 +1,135 @@
+"""
+Render report for LLM Explained presentation.
+Collects per-scene render statistics (duration, frames, encode time, output
+size, motion/static split) and formats the post-build report.
+"""
+
+import json
+import os
+
+
+class SceneRenderStats:
+    """
+    Render statistics of one scene.
+    """
+
+    def __init__(self, scene, encoding_profile=None):
+        self.scene = scene
+        self.encoding_profile = encoding_profile
+        self.frame_rate = None
+        self.frames = 0
+        self.cache_hits = 0
+        self.motion_seconds = 0.0
+        self.static_seconds = 0.0
+        self.encode_seconds = None
+        self.output_bytes = None
+        self.wall_seconds = None
+
+    def add_play(self, seconds, frame_rate, static, cached=False):
+        """
+        Records one play call.
+
+        Args:
+            seconds: Rendered duration of the play
+            frame_rate: Frames per second
+            static: Whether the play only held a frozen frame
+            cached: Whether the partial movie was reused from the cache
+        """
+        self.frame_rate = frame_rate
+        if cached:
+            self.cache_hits += 1
+        self.frames += round(seconds * frame_rate)
+        if static:
+            self.static_seconds += seconds
+        else:
+            self.motion_seconds += seconds
+
+    @property
+    def duration_seconds(self):
+        return self.motion_seconds + self.static_seconds
+
+    @property
+    def motion_ratio(self):
+        """Fraction of the rendered duration spent animating."""
+        if not self.duration_seconds:
+            return 0.0
+        return self.motion_seconds / self.duration_seconds
+
+    def as_dict(self):
+        return {
+            "scene": self.scene,
+            "encoding_profile": self.encoding_profile,
+            "frame_rate": self.frame_rate,
+            "duration_seconds": self.duration_seconds,
+            "frames": self.frames,
+            "cache_hits": self.cache_hits,
+            "motion_seconds": self.motion_seconds,
+            "static_seconds": self.static_seconds,
+            "motion_ratio": self.motion_ratio,
+            "encode_seconds": self.encode_seconds,
+            "output_bytes": self.output_bytes,
+            "wall_seconds": self.wall_seconds,
+        }
+
+
+def directory_size(path):
+    """
+    Returns the total size of the files below a directory.
+
+    Args:
+        path: Directory path
+
+    Returns:
+        Size in bytes (0 if the directory does not exist)
+    """
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def format_report(rows):
+    """
+    Formats render statistics as a text table, heaviest scenes first.
+
+    Args:
+        rows: List of SceneRenderStats.as_dict() dictionaries
+
+    Returns:
+        Report string
+    """
+    header = f"{'Scene':<40} {'Profile':<8} {'Dur (s)':>8} {'Frames':>7} {'Enc (s)':>8} {'Size (MB)':>10} {'Motion':>7}"
+    lines = [header, "-" * len(header)]
+
+    def size(row):
+        return row["output_bytes"] or 0
+
+    for row in sorted(rows, key=size, reverse=True):
+        encode = "-" if row["encode_seconds"] is None else f"{row['encode_seconds']:.1f}"
+        lines.append(
+            f"{row['scene']:<40} {row['encoding_profile'] or '-':<8} "
+            f"{row['duration_seconds']:>8.1f} {row['frames']:>7} {encode:>8} "
+            f"{size(row) / 1e6:>10.2f} {row['motion_ratio']:>7.0%}"
+        )
+
+    lines.append("-" * len(header))
+    lines.append(
+        f"{'Total':<40} {'':<8} {sum(row['duration_seconds'] for row in rows):>8.1f} "
+        f"{sum(row['frames'] for row in rows):>7} "
+        f"{sum(row['encode_seconds'] or 0 for row in rows):>8.1f} "
+        f"{sum(size(row) for row in rows) / 1e6:>10.2f}"
+    )
+    return "\n".join(lines)
+
+
+def write_report(rows, path):
+    """
+    Writes render statistics as JSON.
+
+    Args:
+        rows: List of SceneRenderStats.as_dict() dictionaries
+        path: Output file path
+    """
+    with open(path, "w") as report_file:
+        json.dump({"scenes": rows}, report_file, indent=2)
@@ -0,0 +1,88 @@
+"""
+Render settings for LLM Explained presentation.
+Reads rendering options from LLM_SLIDES_* environment variables, so they
+apply both to scenes rendered by the manim CLI and to render.py workers.
+"""
+
+import os
+
+ENV_PREFIX = "LLM_SLIDES_"
+
+
+def get_setting(name, default=None):
+    """
+    Reads a render setting.
+
+    Args:
+        name: Setting name without prefix (e.g. "encoder")
+        default: Value returned when the setting is not defined
+
+    Returns:
+        Setting value as a string, or default
+    """
+    return os.environ.get(ENV_PREFIX + name.upper(), default)
+
+
+def get_int_setting(name, default=0):
+    """
+    Reads an integer render setting.
+
+    Args:
+        name: Setting name without prefix
+        default: Value returned when the setting is not defined
+
+    Returns:
+        Setting value as an int
+    """
+    value = get_setting(name)
+    if value in (None, ""):
+        return default
+    return int(value)
+
+
+def get_flag(name, default=False):
+    """
+    Reads a boolean render setting ("1", "true", "yes" or "on").
+
+    Args:
+        name: Setting name without prefix
+        default: Value returned when the setting is not defined
+
+    Returns:
+        Setting value as a bool
+    """
+    value = get_setting(name)
+    if value in (None, ""):
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def apply_settings(settings):
+    """
+    Applies render settings to the current process environment.
+
+    Args:
+        settings: Dict of setting names to values (None removes a setting)
+    """
+    for name, value in settings.items():
+        key = ENV_PREFIX + name.upper()
+        if value is None or value is False:
+            os.environ.pop(key, None)
+        elif value is True:
+            os.environ[key] = "1"
+        else:
+            os.environ[key] = str(value)
+
+
+def current_settings():
+    """
+    Collects the render settings defined in the current process.
+
+    Returns:
+        Dict of setting names (lowercase, without prefix) to values
+    """
+    return {
+        key[len(ENV_PREFIX):].lower(): value
+        for key, value in os.environ.items()
+        if key.startswith(ENV_PREFIX)
+    }
@@ -0,0 +1,334 @@
+"""
+Rendering pipeline for LLM Explained presentation.
+Provides the renderer and scene file writer used by LLMSlide when the
+LLM_SLIDES_* render settings ask for something other than stock manim.
+"""
+
+import numpy as np
+from manim import config, logger
+from manim.camera.camera import Camera
+from manim.mobject.types.vectorized_mobject import VMobject
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.file_ops import write_to_movie
+
+from utils.encoding import DEFAULT_ENCODER_PROFILE, SegmentEncoder, get_encoder_profile
+from utils.render_settings import get_flag, get_int_setting, get_setting
+from utils.tracing import get_tracer
+
+# Extra pixels around dirty regions covering antialiasing
+DIRTY_REGION_MARGIN = 2
+
+# Above this fraction of the frame, redrawing everything is cheaper than clipping
+MAX_DIRTY_FRACTION = 0.6
+
+
+class PipedSceneFileWriter(SceneFileWriter):
+    """
+    Scene file writer streaming raw frames straight into ffmpeg.
+    Every play is encoded as an independent partial movie file while the
+    next play is rasterized; manim then combines them without re-encoding.
+    """
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.profile = get_encoder_profile(get_setting("encoder", DEFAULT_ENCODER_PROFILE))
+        self.encoder = SegmentEncoder(
+            config.pixel_width,
+            config.pixel_height,
+            config.frame_rate,
+            self.profile,
+            max_workers=get_int_setting("encode_jobs") or None,
+        )
+        self.segment = None
+
+    def configure(self, profile, frame_rate):
+        """
+        Changes the encoder profile and frame rate before rendering starts.
+
+        Args:
+            profile: Encoder profile dictionary
+            frame_rate: Frames per second
+        """
+        self.profile = profile
+        self.encoder.profile = profile
+        self.encoder.frame_rate = frame_rate
+
+    def open_partial_movie_stream(self, file_path=None):
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+        self.segment = self.encoder.open_segment(file_path)
+
+    def close_partial_movie_stream(self):
+        self.segment.close()
+        logger.debug(
+            "Animation %(num)d : Partial movie file queued for encoding in %(path)s",
+            {"num": self.renderer.num_plays, "path": f"'{self.partial_movie_file_path}'"},
+        )
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        if not write_to_movie():
+            return super().write_frame(frame_or_renderer, num_frames)
+        self.segment.write(frame_or_renderer, num_frames)
+
+    def finish(self):
+        tracer = get_tracer()
+        # Partial movie files must be complete before manim combines them
+        with tracer.span("wait for encoders", "output"):
+            self.encoder.wait()
+        with tracer.span("combine movie", "output"):
+            super().finish()
+
+
+class DirtyRegionCamera(Camera):
+    """
+    Camera able to redraw a rectangular region of the frame only.
+    """
+
+    def pixel_bounding_box(self, mobjects, margin=DIRTY_REGION_MARGIN):
+        """
+        Computes the pixel bounding box of mobjects, including their strokes.
+
+        Args:
+            mobjects: Mobjects with points
+            margin: Extra pixels added on every side
+
+        Returns:
+            Tuple (x0, y0, x1, y1) clamped to the frame, or None if empty
+        """
+        points = [mob.points for mob in mobjects if len(mob.points)]
+        if not points:
+            return None
+        points = np.concatenate(points)
+
+        scale_x = self.pixel_width / self.frame_width
+        scale_y = self.pixel_height / self.frame_height
+        stroke = max(
+            max(getattr(mob, "stroke_width", 0), getattr(mob, "background_stroke_width", 0))
+            for mob in mobjects
+        )
+        # Cairo strokes are stroke_width * cairo_line_width_multiple frame units wide
+        pad = stroke * self.cairo_line_width_multiple * scale_x / 2 + margin
+
+        center = self.frame_center
+        x0 = (points[:, 0].min() - center[0]) * scale_x + self.pixel_width / 2 - pad
+        x1 = (points[:, 0].max() - center[0]) * scale_x + self.pixel_width / 2 + pad
+        y0 = self.pixel_height / 2 - (points[:, 1].max() - center[1]) * scale_y - pad
+        y1 = self.pixel_height / 2 - (points[:, 1].min() - center[1]) * scale_y + pad
+
+        x0 = int(max(0, np.floor(x0)))
+        y0 = int(max(0, np.floor(y0)))
+        x1 = int(min(self.pixel_width, np.ceil(x1)))
+        y1 = int(min(self.pixel_height, np.ceil(y1)))
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return x0, y0, x1, y1
+
+    def capture_mobjects_in_region(self, mobjects, background, region):
+        """
+        Restores a region from a background layer and redraws mobjects
+        clipped to that region; pixels outside it are left untouched.
+
+        Args:
+            mobjects: Flattened mobjects in drawing order
+            background: Pixel array the region is restored from
+            region: Tuple (x0, y0, x1, y1) in pixels
+        """
+        x0, y0, x1, y1 = region
+        self.pixel_array[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+
+        ctx = self.get_cairo_context(self.pixel_array)
+        # The clip path is given in pixels, mobjects are drawn in frame units
+        matrix = ctx.get_matrix()
+        ctx.identity_matrix()
+        ctx.new_path()
+        ctx.rectangle(x0, y0, x1 - x0, y1 - y0)
+        ctx.set_matrix(matrix)
+        ctx.clip()
+        try:
+            self.capture_mobjects(mobjects, include_submobjects=False)
+        finally:
+            ctx.reset_clip()
+
+
+class LLMRenderer(CairoRenderer):
+    """
+    Cairo renderer with optional dirty-region rasterization.
+
+    Manim already rasterizes static mobjects once per animation into a
+    background layer. In dirty-region mode, each later frame of the animation
+    only restores the bounding box of the animated mobjects (at the previous
+    and current frame) from that layer, and redraws the moving mobjects that
+    intersect it, clipped to the box.
+    """
+
+    def __init__(self, dirty_regions=False, **kwargs):
+        if dirty_regions:
+            kwargs["camera_class"] = DirtyRegionCamera
+        super().__init__(**kwargs)
+        self.dirty_regions = dirty_regions
+        self._dirty_play = None
+        self._dirty_region = None
+
+    def render(self, scene, time, moving_mobjects):
+        if not self.dirty_regions or not self._update_dirty_region(scene, moving_mobjects):
+            super().render(scene, time, moving_mobjects)
+            return
+        self.add_frame(self.get_frame())
+
+    def _update_dirty_region(self, scene, moving_mobjects):
+        """
+        Redraws the dirty region of the current frame.
+
+        Returns:
+            False when the whole frame must be redrawn instead
+        """
+        if self.static_image is None or not all(isinstance(mob, VMobject) for mob in moving_mobjects):
+            return False
+
+        # Mobjects changed by the animations or by updaters this frame
+        sources = [animation.mobject for animation in scene.animations]
+        sources += [mob for mob in scene.get_mobject_family_members() if mob.updaters]
+        changing_ids = {id(member) for source in sources for member in source.get_family()}
+        changing = [mob for mob in moving_mobjects if id(mob) in changing_ids]
+        region = self.camera.pixel_bounding_box(changing)
+
+        # The first frame of each animation is drawn in full
+        first_frame = self._dirty_play != self.num_plays
+        self._dirty_play = self.num_plays
+        previous, self._dirty_region = self._dirty_region, region
+        if first_frame:
+            return False
+
+        region = _union_regions(region, previous)
+        if region is None:
+            return True
+        x0, y0, x1, y1 = region
+        if (x1 - x0) * (y1 - y0) > MAX_DIRTY_FRACTION * self.camera.pixel_width * self.camera.pixel_height:
+            return False
+
+        visible = [
+            mob for mob in moving_mobjects
+            if _regions_overlap(self.camera.pixel_bounding_box([mob]), region)
+        ]
+        self.camera.capture_mobjects_in_region(visible, self.static_image, region)
+        return True
+
+
+def _union_regions(first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return (
+        min(first[0], second[0]),
+        min(first[1], second[1]),
+        max(first[2], second[2]),
+        max(first[3], second[3]),
+    )
+
+
+def _regions_overlap(first, second):
+    if first is None or second is None:
+        return False
+    return first[0] < second[2] and second[0] < first[2] and first[1] < second[3] and second[1] < first[3]
+
+
+class NullSceneFileWriter(SceneFileWriter):
+    """
+    Scene file writer that writes nothing and creates no output folders.
+    """
+
+    def init_output_directories(self, scene_name):
+        self.output_name = str(scene_name)
+
+    def next_section(self, name, type_, skip_animations):
+        # Sections without a video file
+        super().next_section(name, type_, skip_animations=True)
+
+
+class NullRenderer(CairoRenderer):
+    """
+    Renderer that never rasterizes or encodes.
+
+    Every play jumps straight to the final state of its animations, so
+    construct() runs at the speed of the scene logic alone. Callbacks in
+    slide_observers are called with (scene, slide_index) at the end of each
+    slide, for tools inspecting the storyboard state of every slide. Like
+    manim-slides, a boundary without any animation since the previous one
+    does not make a slide.
+    """
+
+    def __init__(self, slide_observers=(), **kwargs):
+        kwargs.setdefault("file_writer_class", NullSceneFileWriter)
+        kwargs["skip_animations"] = True
+        super().__init__(**kwargs)
+        self.slide_observers = list(slide_observers)
+        self.slide_count = 0
+        self._slide_start_play = 0
+
+    def play(self, scene, *args, **kwargs):
+        scene.compile_animation_data(*args, **kwargs)
+        scene.begin_animations()
+        scene.play_internal(skip_rendering=True)
+        self.time += scene.duration
+        self.num_plays += 1
+
+    def slide_boundary(self, scene):
+        """
+        Notifies the slide observers that a slide ends with the current state.
+
+        Args:
+            scene: Scene being run
+        """
+        if self.num_plays == self._slide_start_play:
+            return
+        for observer in self.slide_observers:
+            observer(scene, self.slide_count)
+        self.slide_count += 1
+        self._slide_start_play = self.num_plays
+
+    def update_frame(self, *args, **kwargs):
+        pass
+
+    def render(self, scene, time, moving_mobjects):
+        pass
+
+    def scene_finished(self, scene):
+        pass
+
+
+def use_piped_encoder():
+    """Returns True when frames should be streamed into ffmpeg segments."""
+    # Frame-range parallel rendering stitches encoded slices, so it needs the pipeline too
+    requested = get_setting("encoder") is not None or get_int_setting("frame_jobs", 1) > 1
+    return (
+        requested
+        and config.movie_file_extension == ".mp4"
+        and not config.transparent
+    )
+
+
+def create_renderer(skip_animations=False):
+    """
+    Creates the renderer selected by the render settings.
+
+    Args:
+        skip_animations: Whether the renderer starts in skipping mode
+
+    Returns:
+        Renderer instance, or None to let manim build its default renderer
+    """
+    if get_flag("dry_run"):
+        return NullRenderer()
+
+    piped = use_piped_encoder()
+    dirty_regions = get_flag("dirty_regions")
+    if not piped and not dirty_regions:
+        return None
+    return LLMRenderer(
+        dirty_regions=dirty_regions,
+        file_writer_class=PipedSceneFileWriter if piped else SceneFileWriter,
+        skip_animations=skip_animations,
+    )
@@ -0,0 +1,467 @@
+"""
+Token sampling for LLM Explained presentation.
+Vectorized temperature, top-k and top-p (nucleus) sampling over (batch, vocab)
+logits, with the semantics shown on the API parameter slides (Slide56-58):
+top-k keeps the k most likely tokens, top-p keeps the most likely tokens until
+their cumulative probability reaches p (including the token that crosses it).
+
+Fixed distributions sampled millions of times (empirical histograms converging
+to the softmax) use alias tables instead: O(1) per draw after one build.
+"""
+
+import time
+
+import numpy as np
+
+from utils.logit_processors import TokenCounts
+
+# Rows processed together, so temporaries of 100k-token vocabularies stay in cache
+ROW_CHUNK = 64
+
+# Candidates first considered by top-p, at least quadrupled every further round
+TOP_P_INITIAL_CANDIDATES = 1024
+
+# Once top-p would sort more than this fraction of the vocabulary, one full sort is cheaper
+TOP_P_FULL_SORT_FRACTION = 1 / 8
+
+# Draws generated at once, over all distributions, when streaming into a histogram
+DRAW_CHUNK = 1 << 20
+
+
+def softmax(logits, axis=-1):
+    """
+    Computes a numerically stable softmax.
+
+    Args:
+        logits: Logits array
+        axis: Axis normalized
+
+    Returns:
+        Probabilities of the same shape
+    """
+    exp_logits = np.exp(logits - logits.max(axis=axis, keepdims=True))
+    return exp_logits / exp_logits.sum(axis=axis, keepdims=True)
+
+
+def logsumexp(logits, axis=-1):
+    """Computes log(sum(exp(logits))) along an axis without overflow."""
+    row_max = logits.max(axis=axis, keepdims=True)
+    return (np.log(np.exp(logits - row_max).sum(axis=axis, keepdims=True)) + row_max).squeeze(axis)
+
+
+def top_k_candidates(logits, k):
+    """
+    Finds the k largest logits of every row with a partial sort.
+
+    Args:
+        logits: Array of shape (batch, vocab)
+        k: Candidates kept
+
+    Returns:
+        Tuple of (token ids, logits), both (batch, k) and sorted by decreasing logit
+    """
+    k = min(k, logits.shape[-1])
+    indices = np.argpartition(logits, -k, axis=-1)[:, -k:]
+    values = np.take_along_axis(logits, indices, axis=-1)
+    order = np.argsort(-values, axis=-1, kind="stable")
+    return np.take_along_axis(indices, order, axis=-1), np.take_along_axis(values, order, axis=-1)
+
+
+def top_p_mask(sorted_logits, p, log_normalizer=None):
+    """
+    Selects the nucleus of sorted candidates.
+
+    Args:
+        sorted_logits: Candidate logits of shape (batch, k), sorted decreasingly
+        p: Cumulative probability threshold
+        log_normalizer: log of each row's softmax denominator (default: over the candidates)
+
+    Returns:
+        Tuple of (boolean mask of kept candidates, boolean array telling
+        whether each row's candidates reach p)
+    """
+    if log_normalizer is None:
+        log_normalizer = logsumexp(sorted_logits)
+    cumulative = np.cumsum(np.exp(sorted_logits - log_normalizer[:, np.newaxis]), axis=-1)
+    # Keep candidates until the cumulative probability reaches p, including the one crossing it
+    kept = np.minimum((cumulative < p).sum(axis=-1) + 1, sorted_logits.shape[-1])
+    mask = np.arange(sorted_logits.shape[-1]) < kept[:, np.newaxis]
+    return mask, cumulative[:, -1] >= p
+
+
+def top_p_nucleus(logits, p, initial_candidates=TOP_P_INITIAL_CANDIDATES,
+                  full_sort_fraction=TOP_P_FULL_SORT_FRACTION):
+    """
+    Finds the top-p nucleus of every row without ever sorting token ids.
+
+    Every round partitions out the top k logits and sums their probability
+    without sorting them. Rows whose candidates reach p sort the candidate
+    values (a fraction of the cost of an argsort) to find the smallest logit
+    kept; the others grow k at least fourfold, or to an estimate of the
+    tokens still needed. Rows estimated to need more than full_sort_fraction
+    of the vocabulary sort all their values instead, and the nucleus is then
+    given as masked whole rows, which sampling reads anyway.
+
+    Args:
+        logits: Array of shape (batch, vocab)
+        p: Cumulative probability threshold
+        initial_candidates: Candidates considered first
+        full_sort_fraction: Fraction of the vocabulary beyond which rows are fully sorted
+
+    Returns:
+        Tuple of (token ids, logits) of shape (batch, k), in no particular
+        order, with -inf for candidates outside a row's nucleus (logits tied
+        with its smallest kept logit are kept too). When a row needed a full
+        sort, token ids are None and the logits are whole rows.
+    """
+    vocab = logits.shape[-1]
+    full_sort_size = max(int(full_sort_fraction * vocab), 1)
+    log_normalizer = logsumexp(logits)
+    found = []
+
+    def mask_nucleus(rows, values):
+        # Only values are sorted, to find the smallest logit kept
+        sorted_values = np.sort(values, axis=-1)[:, ::-1]
+        mask, _ = top_p_mask(sorted_values, p, log_normalizer[rows])
+        thresholds = sorted_values[np.arange(len(rows)), mask.sum(axis=-1) - 1]
+        return np.where(values >= thresholds[:, np.newaxis], values, -np.inf)
+
+    rows = np.arange(len(logits))
+    needed = np.full(len(rows), min(initial_candidates, full_sort_size, vocab))
+    while len(rows):
+        full = needed > full_sort_size
+        if full.any():
+            found.append((rows[full], None, mask_nucleus(rows[full], logits[rows[full]])))
+            rows, needed = rows[~full], needed[~full]
+            if not len(rows):
+                break
+
+        k = int(needed.max())
+        row_logits = logits[rows]
+        indices = np.argpartition(row_logits, vocab - k, axis=-1)[:, vocab - k:]
+        values = np.take_along_axis(row_logits, indices, axis=-1)
+        missing = p - np.exp(values - log_normalizer[rows, np.newaxis]).sum(axis=-1)
+        complete = (missing <= 0) | (k == vocab)
+        if complete.any():
+            found.append((rows[complete], indices[complete], mask_nucleus(rows[complete], values[complete])))
+
+        # The missing mass needs at least missing / p_smallest more tokens (none is
+        # likelier than the smallest candidate) and at most missing / p_mean (each
+        # is likelier than the mean of the rest); k grows to the geometric mean
+        # of the two bounds, computed in log space
+        tiny = np.finfo(np.float64).tiny
+        log_missing = np.log(np.maximum(missing, tiny))
+        log_at_least = log_missing - (values.min(axis=-1) - log_normalizer[rows])
+        log_at_most = log_missing + np.log(max(vocab - k, 1)) - np.log(np.maximum(1 - p + missing, tiny))
+        estimate = k + np.exp(np.minimum((log_at_least + log_at_most) / 2, np.log(vocab)))
+        needed = np.minimum(np.maximum(4 * k, estimate), vocab).astype(np.int64)[~complete]
+        rows = rows[~complete]
+
+    if any(indices is None for _, indices, _ in found):
+        # Rows needing a full sort: every row becomes a masked whole row
+        all_values = np.full(logits.shape, -np.inf, dtype=logits.dtype)
+        for rows, indices, values in found:
+            if indices is None:
+                all_values[rows] = values
+            else:
+                all_values[rows[:, np.newaxis], indices] = values
+        return None, all_values
+
+    width = max(indices.shape[-1] for _, indices, _ in found)
+    all_indices = np.zeros((len(logits), width), dtype=np.int64)
+    all_values = np.full((len(logits), width), -np.inf, dtype=logits.dtype)
+    for rows, indices, values in found:
+        all_indices[rows, :indices.shape[-1]] = indices
+        all_values[rows, :values.shape[-1]] = values
+    return all_indices, all_values
+
+
+def top_p_candidates(logits, p):
+    """
+    Finds the top-p nucleus of every row, sorted, e.g. to show it on the slides.
+
+    Sampling only needs top_p_nucleus: sorting the token ids of large
+    nuclei costs far more than finding them.
+
+    Args:
+        logits: Array of shape (batch, vocab)
+        p: Cumulative probability threshold
+
+    Returns:
+        Tuple of (token ids, logits) of shape (batch, k), sorted decreasingly,
+        with -inf for candidates outside a row's nucleus
+    """
+    _, values = top_p_nucleus(logits, p)
+    sizes = np.isfinite(values).sum(axis=-1)
+    indices, values = top_k_candidates(logits, int(sizes.max()))
+    values[np.arange(values.shape[-1]) >= sizes[:, np.newaxis]] = -np.inf
+    return indices, values
+
+
+def _sample_rows(logits, rng, temperature, top_k, top_p):
+    greedy = temperature <= 0
+    temperature = np.where(greedy, 1, temperature)[:, np.newaxis]
+
+    if top_k is not None:
+        # Temperature does not change the ranking, so only the candidates are scaled
+        indices, values = top_k_candidates(logits, top_k)
+        values /= temperature
+        if top_p is not None:
+            mask, _ = top_p_mask(values, top_p)
+            values = np.where(mask, values, -np.inf)
+    elif top_p is not None:
+        indices, values = top_p_nucleus(logits / temperature, top_p)
+    else:
+        # A new array, so the draw below may work in place
+        indices, values = None, logits / temperature
+
+    # Inverse CDF draw for all rows at once: count the cumulative weights below each row's draw
+    values -= values.max(axis=-1, keepdims=True)
+    np.exp(values, out=values)
+    np.cumsum(values, axis=-1, out=values)
+    totals = values[:, -1]
+    # Strictly below the total, so zero-weight (filtered) tokens after the last kept one are never drawn
+    draws = np.minimum((rng.random(len(values)) * totals).astype(values.dtype), np.nextafter(totals, 0))
+    positions = (values <= draws[:, np.newaxis]).sum(axis=-1)
+
+    if indices is None:
+        tokens = positions
+    else:
+        tokens = indices[np.arange(len(values)), positions]
+    if greedy.any():
+        tokens = np.where(greedy, logits.argmax(axis=-1), tokens)
+    return tokens
+
+
+def sample_tokens(logits, rng, temperature=1.0, top_k=None, top_p=None):
+    """
+    Draws one token per row: temperature scaling, then top-k, then top-p on
+    the remaining candidates, as in the OpenAI and Hugging Face APIs.
+
+    Every logit is read, and exponentiated unless top_k is set, so large
+    batches over large vocabularies take far longer than milliseconds (see
+    the README for timings). Top-p without top-k also sorts the logit values of
+    rows whose nucleus spans a large part of the vocabulary.
+
+    Args:
+        logits: Array of shape (batch, vocab) or (vocab,)
+        rng: np.random.Generator
+        temperature: Temperature, scalar or one per row (0 picks the most likely token)
+        top_k: Number of most likely tokens kept (None: all)
+        top_p: Cumulative probability kept (None: all)
+
+    Returns:
+        Token ids of shape (batch,), or a single id for 1-D logits
+    """
+    logits = np.asarray(logits)
+    if not np.issubdtype(logits.dtype, np.floating):
+        logits = logits.astype(np.float64)
+    single = logits.ndim == 1
+    logits = np.atleast_2d(logits)
+    temperature = np.broadcast_to(np.asarray(temperature, dtype=logits.dtype), (len(logits),))
+
+    tokens = np.empty(len(logits), dtype=np.int64)
+    for start in range(0, len(logits), ROW_CHUNK):
+        rows = slice(start, start + ROW_CHUNK)
+        tokens[rows] = _sample_rows(logits[rows], rng, temperature[rows], top_k, top_p)
+    return tokens[0] if single else tokens
+
+
+def sample_decode(model, prompt, max_new_tokens, rng, temperature=1.0, top_k=None, top_p=None, cache=None,
+                  processors=None, token_counts=None):
+    """
+    Generates tokens one at a time by sampling, with a KV cache.
+
+    Args:
+        model: Model with create_cache() and forward() (see utils/kv_cache.py)
+        prompt: Prompt token ids of shape (batch, prompt_length)
+        max_new_tokens: Tokens generated
+        rng: np.random.Generator
+        temperature: Temperature, scalar or one per row
+        top_k: Number of most likely tokens kept
+        top_p: Cumulative probability kept
+        cache: KVCache to continue from (default: a new cache)
+        processors: Logit processors applied before sampling (see utils/logit_processors.py)
+        token_counts: TokenCounts read by the processors (default: counts of the prompt)
+
+    Returns:
+        Dictionary with the generated tokens (batch, max_new_tokens), the
+        seconds of each step (prefill first), the cache and the token counts
+    """
+    prompt = np.asarray(prompt)
+    if cache is None:
+        cache = model.create_cache(prompt.shape[0], prompt.shape[1] + max_new_tokens)
+
+    tokens = np.empty((prompt.shape[0], max_new_tokens), dtype=np.int64)
+    step_seconds = []
+    step_input = prompt
+    for step in range(max_new_tokens):
+        start = time.perf_counter()
+        logits = model.forward(step_input, cache)[:, -1]
+        if processors:
+            if token_counts is None:
+                token_counts = TokenCounts.from_tokens(prompt, logits.shape[-1])
+            processors(logits, token_counts)
+        tokens[:, step] = sample_tokens(logits, rng, temperature, top_k, top_p)
+        if token_counts is not None:
+            token_counts.update(tokens[:, step])
+        step_input = tokens[:, step:step + 1]
+        step_seconds.append(time.perf_counter() - start)
+
+    return {"tokens": tokens, "step_seconds": step_seconds, "cache": cache, "token_counts": token_counts}
+
+
+class AliasTable:
+    """
+    Walker/Vose alias tables of a batch of discrete distributions.
+
+    Every column of a table holds the probability of keeping its own token
+    and the alias token taking the rest, so a draw is one uniform number:
+    its integer part picks a column and its fraction keeps or aliases it.
+
+    The tables of all distributions are built together: each iteration
+    pairs the next underfull column of every distribution with its current
+    overfull one (Vose's method, scanning smalls then larges instead of
+    keeping work lists), so building takes vocab vectorized steps.
+
+    Args:
+        probabilities: Array of shape (distributions, vocab) or (vocab,),
+            normalized per row
+    """
+
+    def __init__(self, probabilities):
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        self.single = probabilities.ndim == 1
+        probabilities = np.atleast_2d(probabilities)
+        if (probabilities < 0).any():
+            raise ValueError("Probabilities must be non-negative")
+        self.probabilities = probabilities / probabilities.sum(axis=-1, keepdims=True)
+
+        count, vocab = self.probabilities.shape
+        scaled = self.probabilities * vocab
+        self.keep = np.ones((count, vocab))
+        self.alias = np.tile(np.arange(vocab), (count, 1))
+
+        # Underfull columns first: they receive first, then overfull ones in the order they run out
+        order = np.argsort(scaled >= 1, axis=-1, kind="stable")
+        rows = np.arange(count)
+        receiver = np.zeros(count, dtype=np.int64)
+        donor = (scaled < 1).sum(axis=-1)
+        for _ in range(vocab - 1):
+            active = np.flatnonzero((receiver < donor) & (donor < vocab))
+            if not len(active):
+                break
+            receiving = order[active, receiver[active]]
+            donating = order[active, donor[active]]
+            received = scaled[active, receiving]
+            self.keep[active, receiving] = received
+            self.alias[active, receiving] = donating
+            scaled[active, donating] -= 1 - received
+            receiver[active] += 1
+            # A donor left underfull is already queued as a receiver, so the next large one donates
+            donor[active] += scaled[active, donating] < 1
+        # Columns left (last donors, rounding errors) keep their own token
+
+    @property
+    def vocab_size(self):
+        return self.keep.shape[-1]
+
+    def sample(self, rng, size):
+        """
+        Draws tokens from every distribution.
+
+        Args:
+            rng: np.random.Generator
+            size: Draws per distribution
+
+        Returns:
+            Token ids of shape (distributions, size), or (size,) for a single distribution
+        """
+        count, vocab = self.keep.shape
+        uniform = rng.random((count, size)) * vocab
+        columns = uniform.astype(np.int64)
+        uniform -= columns
+        flat = columns + np.arange(count)[:, np.newaxis] * vocab
+        tokens = np.where(uniform < self.keep.ravel()[flat], columns, self.alias.ravel()[flat])
+        return tokens[0] if self.single else tokens
+
+
+class StreamingHistogram:
+    """
+    Token counts of several distributions, accumulated chunk by chunk so
+    millions of draws never need to be stored.
+
+    Args:
+        num_distributions: Number of distributions
+        vocab_size: Number of tokens
+    """
+
+    def __init__(self, num_distributions, vocab_size):
+        self.counts = np.zeros((num_distributions, vocab_size), dtype=np.int64)
+        self._offsets = np.arange(num_distributions)[:, np.newaxis] * vocab_size
+
+    @property
+    def total(self):
+        """Draws counted per distribution."""
+        return self.counts.sum(axis=-1)
+
+    def update(self, tokens):
+        """
+        Counts a chunk of draws.
+
+        Args:
+            tokens: Token ids of shape (distributions, draws)
+        """
+        tokens = np.atleast_2d(tokens)
+        # Row r counts into bin r * vocab + token of the flat counts; unlike a bincount
+        # of every bin, no temporary as large as the histogram is allocated
+        np.add.at(self.counts.reshape(-1), (tokens + self._offsets).ravel(), 1)
+
+    def frequencies(self):
+        return self.counts / np.maximum(self.total, 1)[:, np.newaxis]
+
+    def total_variation(self, probabilities):
+        """
+        Computes the total variation distance to the target distributions.
+
+        Args:
+            probabilities: Array of shape (distributions, vocab)
+
+        Returns:
+            Distance of every distribution, between 0 and 1
+        """
+        return 0.5 * np.abs(self.frequencies() - np.atleast_2d(probabilities)).sum(axis=-1)
+
+
+def sample_convergence(table, rng, checkpoints, chunk_size=DRAW_CHUNK):
+    """
+    Draws from alias tables and reports how the empirical histograms
+    approach the distributions, e.g. for the sampling slides.
+
+    Args:
+        table: AliasTable
+        rng: np.random.Generator
+        checkpoints: Increasing numbers of draws per distribution to report at
+        chunk_size: Draws generated at once over all distributions (at least one each)
+
+    Returns:
+        Dictionary with the final StreamingHistogram and one report per
+        checkpoint (draws, total variation of every distribution, seconds)
+    """
+    histogram = StreamingHistogram(*table.keep.shape)
+    # Bounds the uniforms and index arrays of a chunk however many distributions there are
+    draws_per_chunk = max(1, chunk_size // len(table.keep))
+    reports = []
+    drawn = 0
+    start = time.perf_counter()
+    for checkpoint in checkpoints:
+        while drawn < checkpoint:
+            size = min(draws_per_chunk, checkpoint - drawn)
+            histogram.update(table.sample(rng, size))
+            drawn += size
+        reports.append({
+            "draws": drawn,
+            "total_variation": histogram.total_variation(table.probabilities),
+            "seconds": time.perf_counter() - start,
+        })
+    return {"histogram": histogram, "reports": reports}
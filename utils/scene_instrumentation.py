@@ -0,0 +1,229 @@
+"""
+Scene instrumentation for LLM Explained presentation.
+Groups the render hooks of LLMSlide (render statistics, tracing, memory and
+CPU profiling, frame-range parallel rendering) behind one object that the
+scene calls at fixed points of a render. The optional features are imported
+only when their render setting enables them.
+"""
+
+import time
+from contextlib import contextmanager
+
+from utils.render_report import SceneRenderStats
+from utils.render_settings import get_flag, get_int_setting, get_setting
+from utils.tracing import get_tracer, trace_constructors, trace_timestamp
+
+
+class SceneInstrumentation:
+    """
+    Render instrumentation of one scene.
+
+    LLMSlide calls, in order: scene_kwargs() before the scene is created,
+    rendering() around the whole render, play_started()/play_finished()
+    around each play, play_internal() in place of the base play_internal,
+    slide() around each slide boundary and torn_down() after tear_down.
+    """
+
+    def __init__(self, scene_name, encoding_profile=None):
+        self.scene_name = scene_name
+        self.render_stats = SceneRenderStats(scene_name, encoding_profile)
+        self.memory_report = None
+        self.profile_report = None
+        # Set in frame-parallel worker processes (see frame_parallel.render_frame_slice)
+        self.frame_slice = None
+        self.interpolate_seconds = 0.0
+        self.play_internal_seconds = 0.0
+        self._play_name = None
+        self._trace_mark = None
+
+        self.tracer = get_tracer()
+        if self.tracer.enabled:
+            from manim import MarkupText, MathTex, Tex, Text
+
+            # Text layout and LaTeX compilation get their own spans inside "build mobjects"
+            trace_constructors((Text, MarkupText, MathTex, Tex))
+
+        self.frame_parallel = None
+        if get_int_setting("frame_jobs", 1) > 1:
+            from utils.frame_parallel import create_frame_parallel_renderer
+
+            self.frame_parallel = create_frame_parallel_renderer()
+
+        self.memory_profiler = None
+        if get_flag("memory_profile"):
+            from utils.memory_profile import create_memory_profiler
+
+            self.memory_profiler = create_memory_profiler(scene_name)
+
+        self.profiler = None
+        if get_setting("profile_dir"):
+            from utils.profiling import create_scene_profiler
+
+            self.profiler = create_scene_profiler(scene_name)
+
+    def scene_kwargs(self, kwargs):
+        """
+        Adjusts the keyword arguments of the scene constructor.
+
+        Args:
+            kwargs: Scene keyword arguments, updated in place
+        """
+        if self.frame_parallel is not None and kwargs.get("random_seed") is None:
+            from utils.frame_parallel import FRAME_PARALLEL_SEED
+
+            # Workers must rebuild exactly the same scene state
+            kwargs["random_seed"] = FRAME_PARALLEL_SEED
+
+    @contextmanager
+    def rendering(self, resolution):
+        """
+        Profiles and traces a whole scene render.
+
+        Args:
+            resolution: Frame size label, e.g. "1920x1080"
+        """
+        if self.memory_profiler is not None:
+            self.memory_profiler.start()
+        if self.profiler is not None:
+            self.profiler.start()
+        try:
+            with self.tracer.span(self.scene_name, "scene", resolution=resolution):
+                self._trace_mark = trace_timestamp()
+                yield
+        finally:
+            if self.profiler is not None:
+                self.profile_report = self.profiler.finish()
+            self.tracer.save()
+            if self.memory_profiler is not None:
+                self.memory_report = self.memory_profiler.finish()
+
+    def report(self):
+        """
+        Returns the render statistics of the scene.
+
+        Returns:
+            Dictionary of render statistics with "memory" and "profile" reports
+        """
+        result = self.render_stats.as_dict()
+        result["memory"] = self.memory_report
+        result["profile"] = self.profile_report
+        return result
+
+    @contextmanager
+    def slide(self, plays):
+        """
+        Traces a slide boundary and takes a memory checkpoint.
+
+        Args:
+            plays: Number of plays so far
+        """
+        self.build_finished()
+        with self.tracer.span("next_slide", "slide", plays=plays):
+            if self.memory_profiler is not None:
+                self.memory_profiler.checkpoint()
+            yield
+        self._trace_mark = trace_timestamp()
+
+    def play_started(self, scene, animations):
+        """
+        Starts the trace span of a play.
+
+        Args:
+            scene: Playing scene
+            animations: Positional arguments of play()
+        """
+        from manim import Wait
+
+        self.build_finished()
+        self._play_name = "wait" if len(animations) == 1 and isinstance(animations[0], Wait) else "play"
+        if self.tracer.enabled:
+            self.tracer.begin(
+                self._play_name, "play",
+                index=scene.renderer.num_plays,
+                animations=[str(animation) for animation in animations],
+                mobjects=len(scene.get_mobject_family_members()),
+            )
+        self.interpolate_seconds = 0.0
+        self.play_internal_seconds = 0.0
+
+    def play_finished(self, scene, start_time):
+        """
+        Records the statistics of a play and ends its trace span.
+
+        Args:
+            scene: Playing scene
+            start_time: Renderer time before the play
+        """
+        renderer = scene.renderer
+        static = scene.is_current_animation_frozen_frame()
+        # A hashed play that ended up skipped reused its cached partial movie
+        hashes = getattr(renderer, "animations_hashes", None)
+        self.render_stats.add_play(
+            renderer.time - start_time,
+            renderer.camera.frame_rate,
+            static=static,
+            cached=bool(hashes) and hashes[-1] is not None and renderer.skip_animations,
+        )
+
+        self.tracer.end(
+            self._play_name, "play",
+            frames=round((renderer.time - start_time) * renderer.camera.frame_rate),
+            static=static,
+            interpolate_ms=self.interpolate_seconds * 1000,
+            rasterize_ms=(self.play_internal_seconds - self.interpolate_seconds) * 1000,
+        )
+        self._trace_mark = trace_timestamp()
+
+    def play_internal(self, scene, skip_rendering, base_play_internal):
+        """
+        Renders the frames of the current animation, in frame-parallel
+        workers when the animation is split.
+
+        Args:
+            scene: Playing scene
+            skip_rendering: Whether frames are not rendered
+            base_play_internal: play_internal of the base scene class
+        """
+        start = time.perf_counter()
+        try:
+            self._play_internal(scene, skip_rendering, base_play_internal)
+        finally:
+            self.play_internal_seconds += time.perf_counter() - start
+
+    def _play_internal(self, scene, skip_rendering, base_play_internal):
+        # Worker process: render only the assigned frames of this animation
+        if self.frame_slice is not None and scene.renderer.num_plays == self.frame_slice.play_index:
+            from utils.frame_parallel import FrameSliceComplete, render_slice_frames
+
+            render_slice_frames(scene, self.frame_slice)
+            raise FrameSliceComplete()
+
+        if not skip_rendering and self.frame_parallel is not None and self.frame_parallel.should_split(scene):
+            self.frame_parallel.render_play(scene)
+
+            # Jump straight to the final state of the animation
+            scene.renderer.skip_animations = True
+            try:
+                base_play_internal(skip_rendering=True)
+            finally:
+                scene.renderer.skip_animations = False
+            scene.renderer.time += scene.duration
+            return
+
+        base_play_internal(skip_rendering)
+
+    def build_finished(self):
+        """
+        Records the time since the previous play as building mobjects.
+        """
+        if self._trace_mark is not None:
+            self.tracer.begin("build mobjects", "construct", timestamp=self._trace_mark)
+            self.tracer.end("build mobjects", "construct")
+            self._trace_mark = None
+
+    def torn_down(self):
+        """
+        Stops the frame-parallel workers once the scene is torn down.
+        """
+        if self.frame_parallel is not None:
+            self.frame_parallel.shutdown()
@@ -0,0 +1,134 @@
+"""
+Scene scheduler for LLM Explained presentation.
+Runs scene renders in a process pool, starting the longest scenes (from the
+metrics history) first and never co-scheduling scenes whose estimated peak
+memory together exceeds the memory budget.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+class SceneScheduler:
+    """
+    Chooses which scene starts next.
+
+    Args:
+        memory_estimates: Dictionary mapping scene names to peak memory in bytes
+        memory_budget: Total bytes running scenes may use together (None: no limit)
+        time_estimates: Dictionary mapping scene names to render seconds (see MetricsStore)
+    """
+
+    def __init__(self, memory_estimates=None, memory_budget=None, time_estimates=None):
+        self.memory_estimates = memory_estimates or {}
+        self.memory_budget = memory_budget
+        self.time_estimates = time_estimates or {}
+        # Scenes without an estimate are assumed as heavy as the average one
+        self.default_estimate = _average(self.memory_estimates)
+        self.default_time_estimate = _average(self.time_estimates)
+
+    def estimate(self, scene_name):
+        return self.memory_estimates.get(scene_name, self.default_estimate)
+
+    def time_estimate(self, scene_name):
+        return self.time_estimates.get(scene_name, self.default_time_estimate)
+
+    def order(self, scene_names):
+        """
+        Sorts scenes longest first (heaviest first without timings), so large
+        scenes do not end up running alone at the end.
+
+        Args:
+            scene_names: Scene class names
+
+        Returns:
+            Sorted list of scene names
+        """
+        if self.time_estimates:
+            return sorted(
+                scene_names, key=lambda name: (self.time_estimate(name), self.estimate(name)), reverse=True
+            )
+        return sorted(scene_names, key=self.estimate, reverse=True)
+
+    def makespan(self, scene_names, jobs):
+        """
+        Estimates the wall time of rendering scenes in a pool, starting them in
+        scheduling order (the memory budget is not simulated).
+
+        Args:
+            scene_names: Scene class names
+            jobs: Number of concurrent scenes
+
+        Returns:
+            Estimated seconds
+        """
+        workers = [0.0] * max(1, jobs)
+        for name in self.order(scene_names):
+            workers[workers.index(min(workers))] += self.time_estimate(name)
+        return max(workers)
+
+    def next_scene(self, pending, running):
+        """
+        Picks the next scene that fits in the memory budget.
+
+        Args:
+            pending: Scenes waiting to start, in priority order
+            running: Scenes currently rendering
+
+        Returns:
+            Scene name, or None if every pending scene has to wait
+        """
+        if not pending:
+            return None
+        if self.memory_budget is None or not running:
+            # An idle pool always starts something, even above the budget
+            return pending[0]
+
+        used = sum(self.estimate(name) for name in running)
+        for name in pending:
+            if used + self.estimate(name) <= self.memory_budget:
+                return name
+        return None
+
+
+def _average(estimates):
+    values = list(estimates.values())
+    return sum(values) / len(values) if values else 0
+
+
+def run_scheduled(func, scene_names, args, jobs, scheduler=None, on_result=None, on_error=None):
+    """
+    Runs func(scene_name, *args) for every scene in a process pool.
+
+    Args:
+        func: Picklable function rendering one scene
+        scene_names: Scene class names
+        args: Extra arguments passed to func
+        jobs: Maximum number of concurrent scenes
+        scheduler: SceneScheduler (default: no memory budget)
+        on_result: Callback called with (scene_name, result)
+        on_error: Callback called with (scene_name, exception)
+    """
+    scheduler = scheduler or SceneScheduler()
+    pending = scheduler.order(scene_names)
+    running = {}
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            while len(running) < jobs:
+                name = scheduler.next_scene(pending, list(running.values()))
+                if name is None:
+                    break
+                pending.remove(name)
+                running[pool.submit(func, name, *args)] = name
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as error:
+                    if on_error is not None:
+                        on_error(name, error)
+                else:
+                    if on_result is not None:
+                        on_result(name, result)
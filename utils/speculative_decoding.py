@@ -0,0 +1,191 @@
+"""
+Speculative decoding for LLM Explained presentation.
+A small draft model proposes k tokens one at a time, then the target model
+scores all of them in a single forward pass. Each proposal is accepted with
+probability min(1, p/q) (p: target, q: draft probability); the first rejected
+one is replaced by a sample of max(0, p - q), and a bonus token is sampled
+from the target when all k are accepted. The output then follows the target
+model's distribution exactly, while the target runs about once per
+accepted run of tokens instead of once per token.
+"""
+
+import copy
+import time
+
+import numpy as np
+
+from utils.kv_cache import greedy_decode
+from utils.sampling import sample_decode, softmax
+
+# Tokens proposed by the draft model per round
+DEFAULT_DRAFT_TOKENS = 4
+
+
+def create_draft_model(target, num_layers=1):
+    """
+    Builds a draft model from the first layers of a target AttentionDecoder
+    (layer skipping): it shares the embedding, so its guesses agree with
+    the target far more often than an unrelated random model would.
+
+    Args:
+        target: AttentionDecoder
+        num_layers: Layers kept
+
+    Returns:
+        AttentionDecoder sharing the target's weights
+    """
+    draft = copy.copy(target)
+    draft.layers = target.layers[:num_layers]
+    draft.forward_calls = 0
+    draft.forward_seconds = 0.0
+    return draft
+
+
+def token_probabilities(logits, temperature):
+    """
+    Converts logits into the distribution tokens are sampled from.
+
+    Args:
+        logits: Array of shape (..., vocab)
+        temperature: Temperature (0: one-hot on the most likely token)
+
+    Returns:
+        float64 probabilities of the same shape
+    """
+    logits = np.asarray(logits, dtype=np.float64)
+    if temperature <= 0:
+        one_hot = np.zeros(logits.shape)
+        np.put_along_axis(one_hot, logits.argmax(axis=-1)[..., np.newaxis], 1.0, axis=-1)
+        return one_hot
+    return softmax(logits / temperature)
+
+
+def _draw(probabilities, rng):
+    cumulative = np.cumsum(probabilities)
+    return min(int(np.searchsorted(cumulative, rng.random() * cumulative[-1], side="right")),
+               len(probabilities) - 1)
+
+
+def speculative_decode(target, draft, prompt, max_new_tokens, rng, num_draft_tokens=DEFAULT_DRAFT_TOKENS,
+                       temperature=1.0):
+    """
+    Generates tokens with speculative decoding.
+
+    Both models keep a KV cache; tokens a cache has not seen yet (the
+    prompt, then the last accepted token) are fed with the next forward
+    pass, and rejected proposals are rolled back with KVCache.truncate.
+
+    Args:
+        target: Target model with create_cache() and forward() (see utils/kv_cache.py)
+        draft: Draft model over the same vocabulary
+        prompt: Prompt token ids of shape (prompt_length,) or (1, prompt_length)
+        max_new_tokens: Tokens generated
+        rng: np.random.Generator
+        num_draft_tokens: Tokens proposed per round (k)
+        temperature: Sampling temperature (0: greedy, accepting proposals
+            equal to the target's most likely token)
+
+    Returns:
+        Dictionary with the generated tokens (max_new_tokens,), the number of
+        rounds, proposed and accepted tokens, the acceptance rate, target
+        and draft forward calls, target calls per generated token and the
+        seconds of each round
+    """
+    sequence = list(np.asarray(prompt).reshape(-1))
+    prompt_length = len(sequence)
+    capacity = prompt_length + max_new_tokens + num_draft_tokens + 1
+    target_cache = target.create_cache(1, capacity)
+    draft_cache = draft.create_cache(1, capacity)
+
+    stats = {"rounds": 0, "proposed": 0, "accepted": 0, "target_calls": 0, "draft_calls": 0}
+    round_seconds = []
+    while len(sequence) - prompt_length < max_new_tokens:
+        start = time.perf_counter()
+        # Never propose beyond max_new_tokens: the round also adds one target token
+        proposals = min(num_draft_tokens, max_new_tokens - (len(sequence) - prompt_length) - 1)
+        base = len(sequence)
+
+        draft_tokens = []
+        draft_probabilities = []
+        for _ in range(proposals):
+            pending = (sequence + draft_tokens)[draft_cache.length:]
+            logits = draft.forward(np.array([pending]), draft_cache)[0, -1]
+            draft_probabilities.append(token_probabilities(logits, temperature))
+            draft_tokens.append(_draw(draft_probabilities[-1], rng))
+        stats["draft_calls"] += proposals
+
+        # One target pass scores every proposal, plus the token after the last one
+        pending = (sequence + draft_tokens)[target_cache.length:]
+        logits = target.forward(np.array([pending]), target_cache)[0, -(proposals + 1):]
+        target_probabilities = token_probabilities(logits, temperature)
+        stats["target_calls"] += 1
+
+        accepted = 0
+        for token, p, q in zip(draft_tokens, target_probabilities, draft_probabilities):
+            if rng.random() * q[token] < p[token]:
+                accepted += 1
+                continue
+            residual = np.maximum(p - q, 0)
+            next_token = _draw(residual if residual.sum() > 0 else p, rng)
+            break
+        else:
+            next_token = _draw(target_probabilities[proposals], rng)
+
+        sequence += draft_tokens[:accepted] + [next_token]
+        # The caches keep the accepted proposals; the new token is fed next round
+        target_cache.truncate(base + accepted)
+        draft_cache.truncate(base + accepted)
+
+        stats["rounds"] += 1
+        stats["proposed"] += proposals
+        stats["accepted"] += accepted
+        round_seconds.append(time.perf_counter() - start)
+
+    generated = len(sequence) - prompt_length
+    return {
+        "tokens": np.array(sequence[prompt_length:], dtype=np.int64),
+        **stats,
+        "acceptance_rate": stats["accepted"] / stats["proposed"] if stats["proposed"] else 0.0,
+        "target_calls_per_token": stats["target_calls"] / generated if generated else 0.0,
+        "round_seconds": round_seconds,
+    }
+
+
+def compare_speculative(target, draft, prompt, max_new_tokens, seed=0, num_draft_tokens=DEFAULT_DRAFT_TOKENS,
+                        temperature=1.0):
+    """
+    Times speculative decoding against plain KV-cached decoding of the target.
+
+    Args:
+        target: Target model
+        draft: Draft model
+        prompt: Prompt token ids of shape (prompt_length,) or (1, prompt_length)
+        max_new_tokens: Tokens generated
+        seed: Seed of both runs' samplers
+        num_draft_tokens: Tokens proposed per round
+        temperature: Sampling temperature (0: greedy)
+
+    Returns:
+        Dictionary with the speculative_decode() statistics, both wall-clock
+        times and the speedup
+    """
+    prompt = np.asarray(prompt).reshape(1, -1)
+
+    start = time.perf_counter()
+    if temperature <= 0:
+        greedy_decode(target, prompt, max_new_tokens)
+    else:
+        sample_decode(target, prompt, max_new_tokens, np.random.default_rng(seed), temperature)
+    plain_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = speculative_decode(target, draft, prompt, max_new_tokens, np.random.default_rng(seed),
+                                num_draft_tokens, temperature)
+    speculative_seconds = time.perf_counter() - start
+
+    result.update({
+        "plain_seconds": plain_seconds,
+        "speculative_seconds": speculative_seconds,
+        "speedup": plain_seconds / speculative_seconds,
+    })
+    return result
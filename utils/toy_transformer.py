@@ -0,0 +1,338 @@
+"""
+Toy transformer inference for LLM Explained presentation.
+A small decoder-only transformer chaining the steps the deck walks through:
+token embedding, sinusoidal positional encoding (generate_positional_encoding),
+Q/K/V projections, causal attention and the prediction layer (Slide41),
+with pre-LayerNorm GPT-2 style blocks.
+
+Weights live in an .npz file (see create_toy_weights for the layout) and are
+kept in float32. Q, K and V come from one fused projection, and activations
+are written into preallocated buffers reused by every layer and step.
+"""
+
+import numpy as np
+
+from utils.data_generators import (
+    calculate_attention,
+    calculate_multi_head_attention,
+    generate_positional_encoding,
+    merge_heads,
+    split_heads,
+)
+from utils.kv_cache import DEFAULT_CAPACITY, KVCache, greedy_decode
+from utils.sampling import sample_decode, softmax
+
+LAYER_NORM_EPSILON = 1e-5
+
+# Positional encoding length when the weights do not include one
+DEFAULT_MAX_LENGTH = 2048
+
+# sqrt(2 / pi), for the tanh approximation of GELU
+GELU_SCALE = np.float32(np.sqrt(2 / np.pi))
+
+
+def create_toy_weights(vocab_size=1000, d_model=128, num_layers=4, num_heads=8, num_kv_heads=None,
+                       d_ff=None, max_length=DEFAULT_MAX_LENGTH, seed=42):
+    """
+    Creates seeded random weights in the .npz layout of ToyTransformer.
+
+    Layout: "embedding" (vocab, d_model), "positional" (max_length, d_model),
+    "num_heads" and "num_kv_heads" scalars, "final_norm.gamma/beta", and per
+    layer i "layers.i.<name>" for norm1.gamma/beta, qkv (d_model,
+    d_model + 2 * kv_dim), qkv_bias, out, out_bias, norm2.gamma/beta,
+    mlp_in (d_model, d_ff), mlp_in_bias, mlp_out (d_ff, d_model) and
+    mlp_out_bias. The prediction layer is tied to the embedding, its logits
+    multiplied by the optional "logit_scale" scalar (1/sqrt(d_model) here,
+    as the embedding has unit variance).
+
+    Args:
+        vocab_size: Vocabulary size
+        d_model: Model dimension
+        num_layers: Number of transformer blocks
+        num_heads: Query heads per layer
+        num_kv_heads: Key/value heads per layer (default: num_heads)
+        d_ff: MLP hidden dimension (default: 4 * d_model)
+        max_length: Longest sequence
+        seed: Random seed
+
+    Returns:
+        Dictionary of float32 arrays (and the two head count scalars)
+    """
+    rng = np.random.default_rng(seed)
+    num_kv_heads = num_kv_heads or num_heads
+    d_ff = d_ff or 4 * d_model
+    kv_dim = num_kv_heads * (d_model // num_heads)
+
+    def matrix(rows, columns):
+        return (rng.standard_normal((rows, columns)) / np.sqrt(rows)).astype(np.float32)
+
+    weights = {
+        "embedding": rng.standard_normal((vocab_size, d_model)).astype(np.float32),
+        "positional": generate_positional_encoding(max_length, d_model).astype(np.float32),
+        "num_heads": np.array(num_heads),
+        "num_kv_heads": np.array(num_kv_heads),
+        "logit_scale": np.array(1 / np.sqrt(d_model), dtype=np.float32),
+        "final_norm.gamma": np.ones(d_model, dtype=np.float32),
+        "final_norm.beta": np.zeros(d_model, dtype=np.float32),
+    }
+    for layer in range(num_layers):
+        prefix = f"layers.{layer}."
+        weights.update({
+            prefix + "norm1.gamma": np.ones(d_model, dtype=np.float32),
+            prefix + "norm1.beta": np.zeros(d_model, dtype=np.float32),
+            prefix + "qkv": matrix(d_model, d_model + 2 * kv_dim),
+            prefix + "qkv_bias": np.zeros(d_model + 2 * kv_dim, dtype=np.float32),
+            prefix + "out": matrix(d_model, d_model),
+            prefix + "out_bias": np.zeros(d_model, dtype=np.float32),
+            prefix + "norm2.gamma": np.ones(d_model, dtype=np.float32),
+            prefix + "norm2.beta": np.zeros(d_model, dtype=np.float32),
+            prefix + "mlp_in": matrix(d_model, d_ff),
+            prefix + "mlp_in_bias": np.zeros(d_ff, dtype=np.float32),
+            prefix + "mlp_out": matrix(d_ff, d_model),
+            prefix + "mlp_out_bias": np.zeros(d_model, dtype=np.float32),
+        })
+    return weights
+
+
+def layer_norm(x, gamma, beta, out):
+    """
+    Normalizes the last axis into a preallocated buffer.
+
+    Args:
+        x: Array of shape (..., d_model)
+        gamma: Scale of shape (d_model,)
+        beta: Shift of shape (d_model,)
+        out: Output buffer of x's shape (may not be x)
+
+    Returns:
+        out
+    """
+    np.subtract(x, x.mean(axis=-1, keepdims=True), out=out)
+    variance = np.mean(np.square(out), axis=-1, keepdims=True)
+    out *= 1 / np.sqrt(variance + LAYER_NORM_EPSILON)
+    out *= gamma
+    out += beta
+    return out
+
+
+def gelu(x, scratch):
+    """
+    Applies GELU (tanh approximation) in place.
+
+    Args:
+        x: Array modified in place
+        scratch: Buffer of x's shape
+
+    Returns:
+        x
+    """
+    np.multiply(x, x, out=scratch)
+    scratch *= x
+    scratch *= 0.044715
+    scratch += x
+    scratch *= GELU_SCALE
+    np.tanh(scratch, out=scratch)
+    scratch += 1
+    x *= scratch
+    x *= 0.5
+    return x
+
+
+class ToyTransformer:
+    """
+    Decoder-only transformer inference engine.
+
+    Implements the create_cache()/forward() protocol of utils/kv_cache.py,
+    so greedy, sampled, beam search and speculative decoding all run on it.
+
+    Args:
+        weights: Dictionary of arrays in the create_toy_weights() layout
+    """
+
+    def __init__(self, weights):
+        self.embedding = np.asarray(weights["embedding"], dtype=np.float32)
+        self.vocab_size, self.d_model = self.embedding.shape
+        self.num_heads = int(weights["num_heads"])
+        self.num_kv_heads = int(weights["num_kv_heads"])
+        self.head_dim = self.d_model // self.num_heads
+        self.dtype = np.float32
+        if "positional" in weights:
+            self.positional = np.asarray(weights["positional"], dtype=np.float32)
+        else:
+            self.positional = generate_positional_encoding(DEFAULT_MAX_LENGTH, self.d_model).astype(np.float32)
+
+        self.layers = []
+        layer = 0
+        while f"layers.{layer}.qkv" in weights:
+            prefix = f"layers.{layer}."
+            self.layers.append({
+                name[len(prefix):]: np.asarray(value, dtype=np.float32)
+                for name, value in weights.items() if name.startswith(prefix)
+            })
+            layer += 1
+        self.final_gamma = np.asarray(weights["final_norm.gamma"], dtype=np.float32)
+        self.final_beta = np.asarray(weights["final_norm.beta"], dtype=np.float32)
+        self.logit_scale = np.float32(weights.get("logit_scale", 1.0))
+        self.d_ff = self.layers[0]["mlp_in"].shape[1]
+
+        self._workspace_rows = 0
+        self._workspace = {}
+
+    @classmethod
+    def from_npz(cls, path):
+        """Loads a model from an .npz file in the create_toy_weights() layout."""
+        with np.load(path) as weights:
+            return cls(dict(weights))
+
+    def save_npz(self, path):
+        """Saves the weights in the create_toy_weights() layout."""
+        weights = {
+            "embedding": self.embedding,
+            "positional": self.positional,
+            "num_heads": np.array(self.num_heads),
+            "num_kv_heads": np.array(self.num_kv_heads),
+            "logit_scale": np.array(self.logit_scale),
+            "final_norm.gamma": self.final_gamma,
+            "final_norm.beta": self.final_beta,
+        }
+        for index, layer in enumerate(self.layers):
+            weights.update({f"layers.{index}.{name}": value for name, value in layer.items()})
+        np.savez(path, **weights)
+
+    def create_cache(self, batch_size=1, capacity=DEFAULT_CAPACITY):
+        return KVCache(len(self.layers), batch_size, self.num_kv_heads, self.head_dim, capacity, self.dtype)
+
+    def _buffers(self, batch, seq):
+        # Flat buffers grown to the largest batch * seq seen; views of their first rows are used
+        rows = batch * seq
+        if rows > self._workspace_rows:
+            qkv_dim = self.layers[0]["qkv"].shape[1]
+            widths = {"x": self.d_model, "normed": self.d_model, "qkv": qkv_dim, "projected": self.d_model,
+                      "hidden": self.d_ff, "scratch": self.d_ff}
+            self._workspace = {name: np.empty((rows, width), dtype=self.dtype) for name, width in widths.items()}
+            self._workspace_rows = rows
+        return {name: buffer[:rows].reshape(batch, seq, -1) for name, buffer in self._workspace.items()}
+
+    def forward(self, tokens, cache, queries=None):
+        """
+        Runs new tokens through the model, attending to every cached token.
+
+        Args:
+            tokens: Token ids of shape (batch, new_tokens)
+            cache: KVCache of the batch, extended with the new tokens
+            queries: Optional list receiving a copy of every layer's queries
+                (batch, heads, new_tokens, head_dim), e.g. for the slides
+
+        Returns:
+            float32 logits of shape (batch, new_tokens, vocab)
+        """
+        tokens = np.asarray(tokens)
+        batch, seq = tokens.shape
+        buffers = self._buffers(batch, seq)
+        x, normed, qkv = buffers["x"], buffers["normed"], buffers["qkv"]
+        projected, hidden = buffers["projected"], buffers["hidden"]
+
+        positions = np.arange(cache.length, cache.length + seq)
+        np.add(self.embedding[tokens], self.positional[positions], out=x)
+        kv_dim = self.num_kv_heads * self.head_dim
+
+        for index, layer in enumerate(self.layers):
+            # Attention block: one fused matmul yields Q, K and V
+            layer_norm(x, layer["norm1.gamma"], layer["norm1.beta"], out=normed)
+            np.matmul(normed, layer["qkv"], out=qkv)
+            qkv += layer["qkv_bias"]
+            Q = split_heads(qkv[..., :self.d_model], self.num_heads)
+            if queries is not None:
+                queries.append(Q.copy())
+            K, V = cache.append(
+                index,
+                split_heads(qkv[..., self.d_model:self.d_model + kv_dim], self.num_kv_heads),
+                split_heads(qkv[..., self.d_model + kv_dim:], self.num_kv_heads),
+            )
+            attention = calculate_multi_head_attention(Q, K, V, causal=True)
+            np.matmul(merge_heads(attention), layer["out"], out=projected)
+            x += projected
+            x += layer["out_bias"]
+
+            # MLP block
+            layer_norm(x, layer["norm2.gamma"], layer["norm2.beta"], out=normed)
+            np.matmul(normed, layer["mlp_in"], out=hidden)
+            hidden += layer["mlp_in_bias"]
+            gelu(hidden, buffers["scratch"])
+            np.matmul(hidden, layer["mlp_out"], out=projected)
+            x += projected
+            x += layer["mlp_out_bias"]
+
+        # Prediction layer, tied to the embedding; a new array since callers keep the logits
+        layer_norm(x, self.final_gamma, self.final_beta, out=normed)
+        normed *= self.logit_scale
+        return normed @ self.embedding.T
+
+    def inspect(self, tokens, layer=0, head=0):
+        """
+        Runs a short sequence and returns the intermediate values the slides
+        show, for one attention head.
+
+        Args:
+            tokens: Token ids of shape (seq,)
+            layer: Layer whose attention is returned
+            head: Query head whose attention is returned
+
+        Returns:
+            Dictionary with the token embeddings, positional encoding, the
+            head's Q, K, V, attention scores, weights and output (computed
+            with calculate_attention), and next-token probabilities
+        """
+        tokens = np.asarray(tokens).reshape(1, -1)
+        seq = tokens.shape[1]
+        cache = self.create_cache(1, seq)
+        queries = []
+        logits = self.forward(tokens, cache, queries)
+
+        Q = queries[layer]
+        K, V = cache.layer(layer)
+        kv_head = head // (self.num_heads // self.num_kv_heads)
+        scores, attention_weights, output = calculate_attention(Q[0, head], K[0, kv_head], V[0, kv_head])
+        # Causal model: mask future tokens as forward() does
+        causal_scores = np.where(np.tril(np.ones((seq, seq), dtype=bool)), scores, -np.inf)
+
+        return {
+            "embeddings": self.embedding[tokens[0]],
+            "positional_encoding": self.positional[:seq],
+            "Q": Q[0, head],
+            "K": K[0, kv_head],
+            "V": V[0, kv_head],
+            "attention_scores": scores,
+            "attention_weights": softmax(causal_scores),
+            "unmasked_attention_weights": attention_weights,
+            "unmasked_attention_output": output,
+            "next_token_probabilities": softmax(logits[0, -1].astype(np.float64)),
+        }
+
+    def generate(self, prompt, max_new_tokens, rng=None, temperature=0.0, top_k=None, top_p=None,
+                 processors=None):
+        """
+        Generates tokens with a KV cache: greedy at temperature 0, sampled otherwise.
+
+        Args:
+            prompt: Prompt token ids of shape (prompt_length,) or (batch, prompt_length)
+            max_new_tokens: Tokens generated
+            rng: np.random.Generator used for sampling (default: a new unseeded one)
+            temperature: Sampling temperature (0: greedy)
+            top_k: Number of most likely tokens kept
+            top_p: Cumulative probability kept
+            processors: Logit processors (see utils/logit_processors.py)
+
+        Returns:
+            Dictionary of greedy_decode() or sample_decode(), plus the
+            generated tokens per second (all rows, prefill included)
+        """
+        prompt = np.atleast_2d(prompt)
+        if temperature <= 0 and not processors:
+            result = greedy_decode(self, prompt, max_new_tokens)
+        else:
+            result = sample_decode(self, prompt, max_new_tokens, rng or np.random.default_rng(), temperature,
+                                   top_k, top_p, processors=processors)
+        seconds = sum(result["step_seconds"])
+        result["tokens_per_second"] = result["tokens"].size / seconds if seconds else 0.0
+        return result
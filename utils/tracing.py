@@ -0,0 +1,186 @@
+"""
+Tracing for LLM Explained presentation.
+Records begin/end events of scene phases in the Chrome trace event format.
+Every process writes its own file into the LLM_SLIDES_TRACE_DIR directory;
+merge_traces() combines them into one timeline for chrome://tracing or Perfetto.
+"""
+
+import functools
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.render_settings import get_setting
+
+TRACE_FILE_PATTERN = "trace-*.json"
+
+
+def trace_timestamp():
+    """Returns the current time in microseconds, comparable across processes."""
+    return time.time_ns() / 1000
+
+
+class Tracer:
+    """
+    Collects trace events of one process.
+    A tracer without a path is disabled and ignores every event.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.pid = os.getpid()
+        self.events = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def _add(self, phase, name, category, timestamp, args):
+        if not self.enabled:
+            return
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": phase,
+            "ts": trace_timestamp() if timestamp is None else timestamp,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def begin(self, name, category="scene", timestamp=None, **args):
+        """
+        Records the beginning of a span.
+
+        Args:
+            name: Span name
+            category: Event category
+            timestamp: Time in microseconds (default: now)
+            args: Values shown with the event
+        """
+        self._add("B", name, category, timestamp, args)
+
+    def end(self, name, category="scene", timestamp=None, **args):
+        """
+        Records the end of the span opened last on the current thread.
+
+        Args:
+            name: Span name
+            category: Event category
+            timestamp: Time in microseconds (default: now)
+            args: Values merged into the span arguments
+        """
+        self._add("E", name, category, timestamp, args)
+
+    @contextmanager
+    def span(self, name, category="scene", **args):
+        """Records a span around a block of code."""
+        self.begin(name, category, **args)
+        try:
+            yield
+        finally:
+            self.end(name, category)
+
+    def name_process(self, name):
+        """Names the current process in the trace viewer."""
+        self._add("M", "process_name", "__metadata", 0, {"name": name})
+
+    def name_thread(self, name):
+        """Names the current thread in the trace viewer."""
+        self._add("M", "thread_name", "__metadata", 0, {"name": name})
+
+    def save(self):
+        """Writes every event recorded so far to the trace file of the process."""
+        if not self.enabled:
+            return
+        with self._lock:
+            events = list(self.events)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as trace_file:
+            json.dump(events, trace_file)
+        os.replace(temporary_path, self.path)
+
+
+_tracer = None
+
+
+def get_tracer():
+    """
+    Returns the tracer of the current process, enabled when the trace_dir
+    render setting is set.
+
+    Returns:
+        Tracer
+    """
+    global _tracer
+    if _tracer is None or _tracer.pid != os.getpid():
+        trace_dir = get_setting("trace_dir")
+        path = None
+        if trace_dir:
+            os.makedirs(trace_dir, exist_ok=True)
+            path = os.path.join(trace_dir, TRACE_FILE_PATTERN.replace("*", str(os.getpid())))
+        _tracer = Tracer(path)
+    return _tracer
+
+
+_constructor_state = threading.local()
+
+
+def trace_constructors(classes, category="construct"):
+    """
+    Records a span around every construction of the given classes, e.g. to
+    separate LaTeX compilation and text layout from the rest of construct().
+    Constructions nested in a traced one (Tex builds a MathTex) are part of
+    the outer span. Each class is wrapped once; the spans are recorded only
+    while the process tracer is enabled.
+
+    Args:
+        classes: Classes whose __init__ is wrapped
+        category: Event category of the spans
+    """
+    for cls in classes:
+        if "_traced_init" in cls.__dict__:
+            continue
+        original = cls.__init__
+
+        @functools.wraps(original)
+        def __init__(self, *args, _original=original, _name=cls.__name__, **kwargs):
+            if getattr(_constructor_state, "active", False):
+                return _original(self, *args, **kwargs)
+            _constructor_state.active = True
+            try:
+                with get_tracer().span(_name, category):
+                    return _original(self, *args, **kwargs)
+            finally:
+                _constructor_state.active = False
+
+        cls.__init__ = __init__
+        cls._traced_init = True
+
+
+def merge_traces(trace_dir, output_path):
+    """
+    Merges the trace files of every process into one Chrome trace.
+
+    Args:
+        trace_dir: Directory of per-process trace files
+        output_path: Merged trace JSON path
+
+    Returns:
+        Number of merged events
+    """
+    events = []
+    for path in sorted(glob.glob(os.path.join(trace_dir, TRACE_FILE_PATTERN))):
+        with open(path) as trace_file:
+            events.extend(json.load(trace_file))
+
+    with open(output_path, "w") as output_file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, output_file)
+    return len(events)